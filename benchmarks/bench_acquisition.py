@@ -0,0 +1,170 @@
+import time
+import numpy as np
+from benchmarks.harness import benchmark, measure, allocations
+from hardware.arduino import ArduinoNode
+from hardware.protocol import encode_sample
+from utils.filters import FilterChain
+
+DESCRIPTOR = b'{"proto":"bin","ver":1,"channels":["force"],"types":"f"}'
+
+# Spike removal, mains notch and low-pass on a 1 kHz force channel
+FILTERS = {'force': [{'type': 'median', 'n': 5}, {'type': 'notch', 'freq_hz': 50, 'rate_hz': 1000},
+                     {'type': 'lowpass', 'cutoff_hz': 20, 'rate_hz': 1000}]}
+
+
+def _node(binary: bool = False, filters: dict = None) -> ArduinoNode:
+    """
+    ArduinoNode that is never started, its parsing and storage methods are driven directly.
+    """
+    node = ArduinoNode(port="bench", queue_len=65536, binary=binary, filters=filters)
+
+    if binary:
+        node._parse_lines([DESCRIPTOR], time.monotonic())
+
+    return node
+
+
+@benchmark("parse_json_lines", "acquisition")
+def bench_parse_json(quick: bool) -> dict:
+    """
+    JSON line parsing and storage of one read() worth of lines (64 lines per call).
+    """
+    node = _node()
+    lines = [f'{{"force":{0.001 * i:.3f}}}\r'.encode() for i in range(64)]
+
+    def call():
+        node._parse_lines(lines, time.monotonic())
+
+    result = measure(call, number=500 if quick else 5000)
+    result.update(allocations(call, number=200))
+    result['samples_per_s'] = result['ops_per_s'] * len(lines)
+
+    return result
+
+
+def _binary_benchmark(quick: bool, filters: dict = None) -> dict:
+    node = _node(binary=True, filters=filters)
+    number = 300 if quick else 3000
+
+    # One continuous 1 kHz stream, so sequence numbers and device time never jump back
+    frame_len = len(encode_sample(0, 0, [0.0], 'f'))
+    per_chunk = node.read_size // frame_len
+    total = (number + 200) * per_chunk
+
+    stream = b''.join(encode_sample(seq, seq * 1000, [0.001 * (seq % 1000)], 'f') for seq in range(total))
+    chunks = [stream[i:i + node.read_size] for i in range(0, len(stream), node.read_size)]
+    host_start = time.monotonic()
+
+    state = {'idx': 0}
+
+    def call():
+        idx = state['idx']
+        state['idx'] = idx + 1
+        node._store_frames(node.decoder.feed(chunks[idx]), host_start + idx * per_chunk * 1e-3)
+
+    result = measure(call, number=number, warmup=100)
+    result['samples_per_s'] = result['ops_per_s'] * per_chunk
+    result['crc_errors'] = node.decoder.crc_errors
+    result['lost_frames'] = node.decoder.lost_frames
+
+    return result
+
+
+@benchmark("parse_binary_frames", "acquisition")
+def bench_parse_binary(quick: bool) -> dict:
+    """
+    Binary frame decoding, clock mapping and storage of one full read() (read_size bytes per call).
+    """
+    return _binary_benchmark(quick)
+
+
+@benchmark("parse_binary_frames_filtered", "acquisition")
+def bench_parse_binary_filtered(quick: bool) -> dict:
+    """
+    Same with a median, notch and low-pass pipeline on the force channel.
+    """
+    return _binary_benchmark(quick, FILTERS)
+
+
+@benchmark("filter_chain_small_batches", "acquisition")
+def bench_filter_chain(quick: bool) -> dict:
+    """
+    The same pipeline on batches of 4 samples, as arriving from a 1 kHz sensor polled every few ms.
+    """
+    chain = FilterChain(FILTERS['force'])
+    batch = np.random.default_rng(0).normal(1.0, 0.01, 4)
+
+    def call():
+        chain.apply(batch)
+
+    result = measure(call, number=2000 if quick else 20000)
+    result['samples_per_s'] = result['ops_per_s'] * len(batch)
+
+    return result
+
+
+def _filled_node(capacity: int, rate: float = 1000.0) -> ArduinoNode:
+    """
+    Node with a full ring buffer of 1 kHz samples ending one second in the future,
+    so a one second window stays populated for the duration of the measurement.
+    """
+    node = ArduinoNode(port="bench", queue_len=capacity)
+    end = time.monotonic() + 1.0
+
+    timestamps = end - np.arange(capacity)[::-1] / rate
+    node.samples.extend(timestamps, {'force': np.sin(timestamps)})
+
+    return node
+
+
+def _window_benchmark(capacity: int, quick: bool) -> dict:
+    node = _filled_node(capacity)
+
+    def call():
+        node.get_mean_value_time('force', 1.0)
+
+    result = measure(call, number=500 if quick else 5000)
+    result.update(allocations(call, number=200))
+    result['queue_len'] = capacity
+
+    return result
+
+
+@benchmark("mean_value_time_4k", "acquisition")
+def bench_mean_time_small(quick: bool) -> dict:
+    """
+    get_mean_value_time over a one second window (1000 samples) with a 4096 sample queue.
+    """
+    return _window_benchmark(4096, quick)
+
+
+@benchmark("mean_value_time_64k", "acquisition")
+def bench_mean_time_default(quick: bool) -> dict:
+    """
+    Same with the default queue length of 65536 samples.
+    """
+    return _window_benchmark(65536, quick)
+
+
+@benchmark("mean_value_time_1m", "acquisition")
+def bench_mean_time_large(quick: bool) -> dict:
+    """
+    Same with a 1M sample queue (about 17 minutes at 1 kHz).
+    """
+    return _window_benchmark(1 << 20, quick)
+
+
+@benchmark("latest_value", "acquisition")
+def bench_latest_value(quick: bool) -> dict:
+    """
+    get_latest_value on a full default sized queue.
+    """
+    node = _filled_node(65536)
+
+    def call():
+        node.get_latest_value('force')
+
+    result = measure(call, number=2000 if quick else 20000, inner=10)
+    result.update(allocations(call, number=1000))
+
+    return result
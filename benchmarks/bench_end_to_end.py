@@ -0,0 +1,334 @@
+import csv
+import glob
+import os
+import time
+import multiprocessing as mp
+import numpy as np
+from benchmarks.harness import benchmark
+from hardware.arduino import ArduinoNode
+from hardware.node_process import ProcessNode
+from hardware.simulation import SimulatedRobotInterface, SimulatedUR, MaterialModel, VirtualArduino
+from hardware.watchdog import SafetyWatchdog
+from routines.indent_continuous import ContinuousIndent
+from routines.indent_force import ForceIndent
+from utils.columnar import ColumnarReader
+from utils.math_tools import get_target_pose_along_tool_z
+
+
+@benchmark("continuous_indent", "end_to_end")
+def bench_continuous_indent(quick: bool) -> dict:
+    """
+    Full continuous indent against the simulated robot and a virtual 1 kHz force sensor on a
+    pseudo terminal (binary protocol): acquisition thread, fusion, async logging and plotting.
+    """
+    distance_mm, velocity = (4.0, 0.01) if quick else (10.0, 0.01)
+
+    robot = SimulatedRobotInterface()
+    material = MaterialModel(robot.model, surface_offset_mm=1.0)
+    robot.model.force_fn = material.force
+
+    device = VirtualArduino(material, rate=1000.0)
+    device.start()
+
+    node = ArduinoNode(port=device.port, binary=True)
+    node.start()
+
+    try:
+        deadline = time.monotonic() + 10.0
+
+        while node.decoder is None or node.get_latest_value('force') is None:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Virtual Arduino did not switch to the binary protocol.")
+            time.sleep(0.05)
+
+        received = node.samples.count
+        dropped = device.dropped
+        start = time.monotonic()
+
+        ContinuousIndent(robot, {'force': node}).execute('force', 'force', distance_mm, 0.5, velocity)
+
+        duration = time.monotonic() - start
+        received = node.samples.count - received
+        dropped = device.dropped - dropped
+    finally:
+        node.stop()
+        node.join()
+        robot.disconnect()
+        device.stop()
+
+    # Evaluate the logged session
+    session = sorted(glob.glob(os.path.join("logs", "*_Indent_Continuous")))[-1]
+
+    with open(os.path.join(session, "data.csv"), newline='') as handle:
+        rows = list(csv.DictReader(handle))
+
+    sensor_gap = np.array([float(row["Sensor_Gap"]) for row in rows]) * 1000.0
+    robot_gap = np.array([float(row["Robot_Gap"]) for row in rows]) * 1000.0
+
+    return {
+        'duration_s': duration,
+        'motion_s': distance_mm / 1000.0 / velocity,
+        'rows': len(rows),
+        'rows_per_s': len(rows) / duration,
+        'sensor_samples': received,
+        'sensor_gap_p50_ms': float(np.percentile(sensor_gap, 50)) if len(rows) else None,
+        'sensor_gap_p99_ms': float(np.percentile(sensor_gap, 99)) if len(rows) else None,
+        'robot_gap_p99_ms': float(np.percentile(robot_gap, 99)) if len(rows) else None,
+        'crc_errors': node.decoder.crc_errors,
+        'lost_frames': node.decoder.lost_frames,
+        'device_dropped_samples': dropped,
+    }
+
+
+def _device_main(connection):
+    """
+    Runs a virtual 1 kHz sensor in its own process, so its timing does not depend on the load
+    of the benchmark process. Sends the port, then the dropped sample count on every request.
+    """
+    device = VirtualArduino(MaterialModel(SimulatedUR()), rate=1000.0)
+    device.start()
+    connection.send(device.port)
+
+    while connection.recv() != 'stop':
+        connection.send(device.dropped)
+
+    connection.send(device.dropped)
+    device.stop()
+
+
+def _arrival_gaps(node_factory, quick: bool) -> dict:
+    """
+    Runs CPU bound Python work (string formatting, as in CSV logging and plot updates) in the main
+    process while the virtual sensor streams into the node, and measures the gaps between
+    consecutive arrivals of sensor data at the host.
+    """
+    duration = 2.0 if quick else 10.0
+    dropped = 0
+
+    context = mp.get_context('spawn')
+    connection, child = context.Pipe()
+    device = context.Process(target=_device_main, args=(child,), daemon=True)
+    device.start()
+
+    node = node_factory(connection.recv())
+    node.start()
+
+    try:
+        deadline = time.monotonic() + 10.0
+
+        # Binary samples carry their arrival time
+        while node.samples.latest('host_time') is None:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Virtual Arduino did not switch to the binary protocol.")
+            time.sleep(0.05)
+
+        connection.send('dropped')
+        dropped = connection.recv()
+
+        index = node.samples.count
+        end = time.monotonic() + duration
+        rows = 0
+
+        while time.monotonic() < end:
+            ",".join(f"{value:.6f}" for value in range(200))
+            rows += 1
+
+        samples, _, lost = node.samples.read_from(index)
+    finally:
+        node.stop()
+
+        if isinstance(node, ArduinoNode):
+            node.join()
+
+        connection.send('stop')
+        dropped = connection.recv() - dropped
+        device.join()
+
+    gaps = np.diff(np.unique(samples['host_time'])) * 1000.0
+
+    return {
+        'samples_per_s': len(samples) / duration,
+        'lost': lost,
+        'load_rows_per_s': rows / duration,
+        'sensor_gap_p50_ms': float(np.percentile(gaps, 50)) if len(gaps) else None,
+        'sensor_gap_p99_ms': float(np.percentile(gaps, 99)) if len(gaps) else None,
+        'sensor_gap_max_ms': float(gaps.max()) if len(gaps) else None,
+        'device_dropped_samples': dropped,
+    }
+
+
+@benchmark("arrival_gap_thread_under_load", "end_to_end")
+def bench_gap_thread(quick: bool) -> dict:
+    """
+    Sensor arrival gaps of an in-process reader thread while the main process is busy.
+    """
+    return _arrival_gaps(lambda port: ArduinoNode(port=port, binary=True), quick)
+
+
+@benchmark("arrival_gap_process_under_load", "end_to_end")
+def bench_gap_process(quick: bool) -> dict:
+    """
+    Sensor arrival gaps of a node process (shared memory ring) while the main process is busy.
+    """
+    return _arrival_gaps(lambda port: ProcessNode(port=port, channels=['force'], binary=True), quick)
+
+
+@benchmark("force_indent_loop", "end_to_end")
+def bench_force_indent(quick: bool) -> dict:
+    """
+    Force ramp and hold closed at 500 Hz against the simulated robot and a virtual 1 kHz
+    force sensor: deadline misses, release jitter and force tracking in the hold phase.
+    """
+    target, hold_time, settle = 0.5, (3.0 if quick else 10.0), 2.0
+
+    robot = SimulatedRobotInterface()
+    material = MaterialModel(robot.model, surface_offset_mm=0.5)
+    robot.model.force_fn = material.force
+
+    device = VirtualArduino(material, rate=1000.0)
+    device.start()
+
+    node = ArduinoNode(port=device.port, binary=True)
+    node.start()
+
+    try:
+        deadline = time.monotonic() + 10.0
+
+        while node.decoder is None or node.get_latest_value('force') is None:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Virtual Arduino did not switch to the binary protocol.")
+            time.sleep(0.05)
+
+        routine = ForceIndent(robot, {'force': node})
+        # Contact approach, 1 s ramp and hold with the default gains
+        completed = routine.execute('force', 'force', target, 'ramp', 1.0, hold_time, 0.005, 0.02, 0.005,
+                                    5.0, 0.0, 'speed', 0.05)
+    finally:
+        node.stop()
+        node.join()
+        robot.disconnect()
+        device.stop()
+
+    session = sorted(glob.glob(os.path.join("logs", "*_Indent_Force")))[-1]
+
+    with ColumnarReader(os.path.join(session, "data.col")) as reader:
+        data = reader.read(["Time", "Error", "Lateness"])
+
+    hold = data["Time"] >= settle
+    error = data["Error"][hold]
+    stats = routine.loop_stats
+
+    return {
+        'completed': completed,
+        'cycles': stats['iterations'],
+        'deadline_misses': stats['misses'],
+        'miss_rate': stats['miss_rate'],
+        'lateness_p50_ms': stats['lateness_p50_ms'],
+        'lateness_p99_ms': stats['lateness_p99_ms'],
+        'lateness_max_ms': stats['lateness_max_ms'],
+        'busy_p99_ms': stats['busy_p99_ms'],
+        'hold_error_rms': float(np.sqrt(np.mean(error ** 2))) if len(error) else None,
+        'hold_error_mean': float(np.mean(error)) if len(error) else None,
+    }
+
+
+def _watchdog_trips(quick: bool, load: bool) -> dict:
+    """
+    Drives the simulated robot into the specimen until the watchdog trips on its force limit, either
+    with a blocking moveL (the main thread waits, as in the zero routine) or with an asynchronous
+    move while the main thread runs CPU bound Python work. Measures the time from the arrival of
+    the crossing sample to the stop command, and what the robot and force did after it.
+    """
+    trials, limit = (3 if quick else 10), 0.3
+
+    robot = SimulatedRobotInterface()
+    material = MaterialModel(robot.model, surface_offset_mm=0.5, relax_time=0.2)
+    robot.model.force_fn = material.force
+
+    device = VirtualArduino(material, rate=1000.0)
+    device.start()
+
+    node = ArduinoNode(port=device.port, binary=True)
+    node.start()
+
+    watchdog = SafetyWatchdog(robot, {'force': node}, [{'node': 'force', 'channel': 'force', 'max': limit}],
+                              trip_log=os.devnull)
+    results = []
+
+    try:
+        deadline = time.monotonic() + 10.0
+
+        while node.decoder is None or node.get_latest_value('force') is None:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Virtual Arduino did not switch to the binary protocol.")
+            time.sleep(0.05)
+
+        watchdog.start()
+        start_pose = robot.get_tcp_pose()
+        target = get_target_pose_along_tool_z(start_pose, 5.0)
+
+        for _ in range(trials):
+            if load:
+                robot.control.moveL(target, 0.01, 0.5, True)
+
+                while not watchdog.tripped.is_set() and robot.control.getAsyncOperationProgress() >= 0:
+                    ",".join(f"{value:.6f}" for value in range(200))
+            else:
+                robot.control.moveL(target, 0.01, 0.5)
+
+            trip_pose = robot.get_tcp_pose()
+            time.sleep(0.1)
+
+            if not watchdog.trips or len(watchdog.trips) == len(results):
+                raise RuntimeError("Watchdog did not trip.")
+
+            trip = watchdog.trips[-1]
+            after = node.samples.since(time.monotonic() - 0.3)
+            rejected = not robot.control.moveL(target, 0.01, 0.5)
+
+            results.append((trip['detect_ms'], trip['stop_ms'], float(after['force'].max()) - limit,
+                            float(np.linalg.norm(np.subtract(robot.get_tcp_pose()[:3], trip_pose[:3]))) * 1000.0,
+                            rejected))
+
+            # Retracting from the loaded specimen is allowed after the reset
+            watchdog.reset()
+
+            if not robot.control.moveL(start_pose, 0.1, 0.5) or watchdog.tripped.is_set():
+                raise RuntimeError("Retract after the watchdog reset failed.")
+
+            time.sleep(0.5)
+    finally:
+        watchdog.stop()
+        node.stop()
+        node.join()
+        robot.disconnect()
+        device.stop()
+
+    detect, stop, overshoot, travel, rejected = np.array(results).T
+
+    return {
+        'trips': len(results),
+        'detect_p50_ms': float(np.percentile(detect, 50)),
+        'detect_max_ms': float(detect.max()),
+        'stop_p50_ms': float(np.percentile(stop, 50)),
+        'stop_max_ms': float(stop.max()),
+        'force_overshoot_max': float(overshoot.max()),
+        'travel_after_return_max_mm': float(travel.max()),
+        'motion_rejected_after_trip': int(rejected.sum()),
+    }
+
+
+@benchmark("watchdog_trip_blocking_move", "end_to_end")
+def bench_watchdog_blocking(quick: bool) -> dict:
+    """
+    Watchdog reaction while the main thread waits in a blocking moveL.
+    """
+    return _watchdog_trips(quick, load=False)
+
+
+@benchmark("watchdog_trip_under_load", "end_to_end")
+def bench_watchdog_load(quick: bool) -> dict:
+    """
+    Watchdog reaction while the main thread runs CPU bound Python work.
+    """
+    return _watchdog_trips(quick, load=True)
@@ -0,0 +1,69 @@
+import math
+import numpy as np
+from benchmarks.harness import benchmark, measure, allocations
+from utils.math_tools import (get_target_pose_along_tool_z, _axis_angle_to_matrix, offset_poses_along_tool,
+                              axis_angles_to_matrices)
+
+POSE = [0.3, -0.2, 0.3, 0.1, math.pi - 0.1, 0.05]
+
+
+@benchmark("target_pose_along_tool_z", "math")
+def bench_target_pose(quick: bool) -> dict:
+    """
+    One tool Z step target, as computed per step by the indentation routines.
+    """
+    def call():
+        get_target_pose_along_tool_z(POSE, 0.5)
+
+    result = measure(call, number=2000 if quick else 20000, inner=10)
+    result.update(allocations(call, number=1000))
+
+    return result
+
+
+@benchmark("axis_angle_to_matrix", "math")
+def bench_rotation(quick: bool) -> dict:
+    """
+    Rodrigues rotation matrix from an axis-angle vector.
+    """
+    def call():
+        _axis_angle_to_matrix(*POSE[3:])
+
+    result = measure(call, number=2000 if quick else 20000, inner=10)
+    result.update(allocations(call, number=1000))
+
+    return result
+
+
+@benchmark("offset_poses_batch_1k", "math")
+def bench_offset_batch(quick: bool) -> dict:
+    """
+    Tool Z offsets of 1000 poses with a shared orientation (one planned indentation).
+    """
+    poses = np.tile(POSE, (1000, 1))
+    offsets = np.zeros((1000, 3))
+    offsets[:, 2] = np.arange(1000) * 0.01
+
+    def call():
+        offset_poses_along_tool(poses, offsets)
+
+    result = measure(call, number=500 if quick else 5000)
+    result.update(allocations(call, number=100))
+
+    return result
+
+
+@benchmark("axis_angles_to_matrices_1k", "math")
+def bench_rotation_batch(quick: bool) -> dict:
+    """
+    Batch Rodrigues conversion of 1000 different orientations.
+    """
+    rotvecs = np.tile(POSE[3:], (1000, 1)) + np.linspace(0.0, 0.5, 1000)[:, None]
+
+    def call():
+        axis_angles_to_matrices(rotvecs)
+
+    result = measure(call, number=500 if quick else 5000)
+    result.update(allocations(call, number=100))
+
+    return result
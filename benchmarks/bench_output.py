@@ -0,0 +1,89 @@
+import numpy as np
+from benchmarks.harness import benchmark, measure, allocations
+from utils.live_plot import LivePlotter
+from utils.logger import ExperimentLogger
+
+HEADERS = ["Timestamp", "Time", "X", "Y", "Z", "Distance", "Value"]
+
+
+def _row(idx: int) -> list:
+    return [1.7e9 + idx * 0.01, idx * 0.01, 0.3, -0.2, 0.3 - idx * 1e-6, idx * 1e-3, 0.5]
+
+
+@benchmark("plotter_update_point", "output")
+def bench_plot_point(quick: bool) -> dict:
+    """
+    LivePlotter.update with one point per call, including the periodic redraws (Agg backend).
+    """
+    plotter = LivePlotter("Bench", "x", "y", "y", max_points=20000)
+    state = {'idx': 0}
+
+    def call():
+        state['idx'] += 1
+        plotter.update(state['idx'] * 1e-3, (state['idx'] % 100) * 0.01)
+
+    result = measure(call, number=5000 if quick else 50000)
+    plotter.close()
+
+    return result
+
+
+@benchmark("plotter_update_chunk", "output")
+def bench_plot_chunk(quick: bool) -> dict:
+    """
+    LivePlotter.update with 50 points per call, as fed by the continuous indent loop.
+    """
+    plotter = LivePlotter("Bench", "x", "y", "y", max_points=20000)
+    x = np.arange(50) * 1e-3
+    state = {'offset': 0.0}
+
+    def call():
+        state['offset'] += 0.05
+        plotter.update(x + state['offset'], np.sin(x + state['offset']))
+
+    result = measure(call, number=500 if quick else 5000)
+    plotter.close()
+
+    return result
+
+
+def _logger_benchmark(quick: bool, **kwargs) -> dict:
+    logger = ExperimentLogger("Bench", **kwargs)
+    logger.init_csv(HEADERS)
+    state = {'idx': 0}
+
+    def call():
+        state['idx'] += 1
+        logger.log_data(_row(state['idx']))
+
+    result = measure(call, number=5000 if quick else 50000)
+    result.update(allocations(call, number=1000))
+
+    logger.close()
+    result['dropped_rows'] = logger.dropped_rows
+
+    return result
+
+
+@benchmark("log_data_sync_csv", "output")
+def bench_log_sync(quick: bool) -> dict:
+    """
+    ExperimentLogger.log_data writing CSV rows in the calling thread.
+    """
+    return _logger_benchmark(quick)
+
+
+@benchmark("log_data_async_csv", "output")
+def bench_log_async(quick: bool) -> dict:
+    """
+    ExperimentLogger.log_data with the background batched CSV writer.
+    """
+    return _logger_benchmark(quick, async_write=True)
+
+
+@benchmark("log_data_async_columnar", "output")
+def bench_log_columnar(quick: bool) -> dict:
+    """
+    ExperimentLogger.log_data with the background writer and columnar storage.
+    """
+    return _logger_benchmark(quick, async_write=True, storage='columnar')
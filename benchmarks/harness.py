@@ -0,0 +1,204 @@
+"""
+Minimal benchmark harness: a registry of benchmark functions, latency/throughput measurement,
+allocation counting and comparison of JSON result files against a baseline.
+"""
+
+import gc
+import json
+import math
+import time
+import platform
+import tracemalloc
+import subprocess
+from datetime import datetime
+import numpy as np
+
+BENCHMARKS = {}
+
+# Metrics checked against the baseline and whether a larger value is better
+COMPARED_METRICS = {
+    'p50_us': False,
+    'p99_us': False,
+    'ops_per_s': True,
+    'alloc_bytes_per_call': False,
+    'sensor_gap_p99_ms': False,
+}
+
+
+def benchmark(name: str, group: str):
+    """
+    Registers a benchmark function. The function receives the quick flag and returns a result dict.
+    """
+    def register(fn):
+        BENCHMARKS[name] = (group, fn)
+        return fn
+
+    return register
+
+
+def measure(fn, number: int = 10000, inner: int = 1, warmup: int = 100) -> dict:
+    """
+    Measures the latency distribution and throughput of fn().
+
+    Calls are timed in blocks of inner calls, so very short calls are not dominated by the
+    timer overhead. Percentiles are given per call.
+
+    Arguments:
+        fn (callable): Function without arguments.
+        number (int): Number of timed blocks.
+        inner (int): Calls per timed block.
+        warmup (int): Untimed calls before measuring.
+
+    Returns:
+        dict: p50_us, p90_us, p99_us, max_us, mean_us, ops_per_s and calls.
+    """
+    for _ in range(warmup):
+        fn()
+
+    timings = np.empty(number)
+    clock = time.perf_counter_ns
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        for idx in range(number):
+            start = clock()
+
+            for _ in range(inner):
+                fn()
+
+            timings[idx] = clock() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    per_call = timings / inner / 1000.0
+    total = timings.sum() / 1e9
+
+    return {
+        'p50_us': float(np.percentile(per_call, 50)),
+        'p90_us': float(np.percentile(per_call, 90)),
+        'p99_us': float(np.percentile(per_call, 99)),
+        'max_us': float(per_call.max()),
+        'mean_us': float(per_call.mean()),
+        'ops_per_s': number * inner / total if total > 0 else math.inf,
+        'calls': number * inner,
+    }
+
+
+def allocations(fn, number: int = 1000) -> dict:
+    """
+    Measures the memory allocated by fn() with tracemalloc (run separately, it slows calls down).
+
+    Returns:
+        dict: alloc_bytes_per_call (mean peak of memory allocated during one call),
+              alloc_retained_bytes (memory still held after all calls, e.g. growing buffers).
+    """
+    fn()
+
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    peaks = 0
+
+    for _ in range(number):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        fn()
+
+        _, peak = tracemalloc.get_traced_memory()
+        peaks += peak - before
+
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'alloc_bytes_per_call': peaks / number,
+        'alloc_retained_bytes': max(0, current - start),
+    }
+
+
+def metadata() -> dict:
+    """
+    Environment information stored with every result file.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'system': platform.platform(),
+    }
+
+
+def save(path: str, results: dict):
+    with open(path, 'w') as handle:
+        json.dump({'meta': metadata(), 'results': results}, handle, indent=2)
+
+
+def load(path: str) -> dict:
+    with open(path) as handle:
+        return json.load(handle)['results']
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    """
+    Compares results against a baseline.
+
+    Arguments:
+        results (dict): Current results by benchmark name.
+        baseline (dict): Baseline results by benchmark name.
+        tolerance (float): Allowed relative change in the bad direction.
+
+    Returns:
+        list: (name, metric, baseline value, current value, relative change) for every regression.
+    """
+    regressions = []
+
+    for name, result in results.items():
+        reference = baseline.get(name)
+
+        if not reference:
+            continue
+
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = reference.get(metric), result.get(metric)
+
+            if old is None or new is None or old <= 0:
+                continue
+
+            change = (new - old) / old
+
+            # Allocation growth of a few bytes per call is noise
+            if metric == 'alloc_bytes_per_call' and new - old < 64:
+                continue
+
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append((name, metric, old, new, change))
+
+    return regressions
+
+
+def missing(results: dict, baseline: dict, groups: list = None) -> list:
+    """
+    Baseline benchmarks without a result in this run (failed or no longer registered).
+
+    Arguments:
+        results (dict): Current results by benchmark name.
+        baseline (dict): Baseline results by benchmark name.
+        groups (list): Groups that were run, all groups when None.
+
+    Returns:
+        list: Names of the missing benchmarks.
+    """
+    return [name for name, reference in baseline.items()
+            if (not groups or reference.get('group') in groups) and 'error' not in reference
+            and 'error' in results.get(name, {'error': None})]
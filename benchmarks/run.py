@@ -0,0 +1,114 @@
+"""
+Benchmark runner.
+
+Usage (from the project root):
+    python -m benchmarks.run [--quick] [--group acquisition] [--output results.json]
+                             [--baseline baseline.json] [--tolerance 0.25]
+
+Results are written as JSON. With --baseline the run is compared against an earlier result file
+and the exit code is 1 if any benchmark regressed by more than the tolerance.
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import matplotlib
+
+# Plotting benchmarks measure the data path, not a GUI backend
+matplotlib.use('Agg')
+
+from benchmarks import harness
+from benchmarks import bench_acquisition, bench_math, bench_output, bench_end_to_end  # noqa: F401 (registration)
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "latest.json")
+
+
+def _format(result: dict) -> str:
+    if 'error' in result:
+        return f"FAILED  {result['error']}"
+
+    if 'p50_us' in result:
+        text = f"p50 {result['p50_us']:9.2f} us  p99 {result['p99_us']:9.2f} us  {result['ops_per_s']:12.0f} ops/s"
+
+        if 'samples_per_s' in result:
+            text += f"  {result['samples_per_s']:12.0f} samples/s"
+        if 'alloc_bytes_per_call' in result:
+            text += f"  {result['alloc_bytes_per_call']:8.0f} B/call"
+
+        return text
+
+    return "  ".join(f"{key} {value:.3g}" if isinstance(value, float) else f"{key} {value}"
+                     for key, value in result.items())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the acquisition, math, output and end-to-end benchmarks.")
+    parser.add_argument('--quick', action='store_true', help="Fewer iterations and a shorter indent.")
+    parser.add_argument('--group', action='append', help="Only run this group (repeatable).")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Result file (JSON).")
+    parser.add_argument('--baseline', help="Result file to compare against.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed relative regression.")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    baseline = harness.load(args.baseline) if args.baseline else None
+
+    # Loggers write into ./logs, keep benchmark sessions out of the project tree
+    workdir = tempfile.mkdtemp(prefix="bench_")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+
+    results = {}
+
+    try:
+        for name, (group, fn) in harness.BENCHMARKS.items():
+            if args.group and group not in args.group:
+                continue
+
+            print(f"Running {group}/{name}...")
+
+            try:
+                results[name] = dict(group=group, **fn(args.quick))
+            except Exception as e:
+                # Kept in the results, a crashing benchmark must not look like a skipped one
+                results[name] = {'group': group, 'error': f"{type(e).__name__}: {e}"}
+                print(f"Benchmark {name} failed: {results[name]['error']}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\nResults:")
+    for name, result in results.items():
+        print(f"  {name:28s} {_format({k: v for k, v in result.items() if k != 'group'})}")
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    harness.save(output, results)
+    print(f"\nResults saved to: {output}")
+
+    failed = [name for name, result in results.items() if 'error' in result]
+
+    if failed:
+        print(f"\nFAILED: {', '.join(failed)}")
+
+    if baseline is None:
+        return 1 if failed else 0
+
+    regressions = harness.compare(results, baseline, args.tolerance)
+    missing = harness.missing(results, baseline, args.group)
+
+    for name, metric, old, new, change in regressions:
+        print(f"REGRESSION {name} {metric}: {old:.4g} -> {new:.4g} ({change:+.0%})")
+
+    for name in missing:
+        print(f"MISSING {name}: in the baseline but no result in this run")
+
+    if not regressions and not missing:
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+
+    return 1 if failed or regressions or missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,227 @@
+import os
+import json
+import time
+import selectors
+import threading
+from hardware.arduino import ArduinoNode
+from hardware.node_process import ProcessNode
+from utils.filters import FilterChain
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sensors.json")
+
+
+def load_node_config(path: str = DEFAULT_CONFIG) -> dict:
+    """
+    Reads the sensor node definitions.
+
+    File format (JSON):
+        {"nodes": {"force": {"port": "/dev/ttyACM0", "baudrate": 115200, "binary": true}, ...}}
+    Every entry holds ArduinoNode keyword arguments; only "port" is required.
+    Nodes with "process": true run in their own process (ProcessNode) and must list their "channels".
+    "filters" maps channels to filter pipelines, see utils/filters.py.
+
+    Returns:
+        dict: Node name to ArduinoNode keyword arguments.
+    """
+    with open(path) as handle:
+        config = json.load(handle)
+
+    nodes = config.get('nodes', {})
+
+    for name, options in nodes.items():
+        if 'port' not in options:
+            raise ValueError(f"Sensor node '{name}' in {path} has no port.")
+
+        if options.get('process') and not options.get('channels'):
+            raise ValueError(f"Sensor node '{name}' in {path} runs in a process but lists no channels.")
+
+        for channel, specs in options.get('filters', {}).items():
+            try:
+                FilterChain(specs)
+            except ValueError as e:
+                raise ValueError(f"Sensor node '{name}' in {path}, filters of '{channel}': {e}")
+
+    return nodes
+
+
+class AcquisitionManager(threading.Thread):
+    """
+    Serves all Arduino nodes from a single I/O thread.
+
+    All ports are opened non-blocking and registered with one selector; the thread sleeps until
+    any port has data and feeds it to the node that owns the port. Each node keeps its own framing
+    state and sample buffer, so routines use the nodes exactly as before (get_latest_value, ...).
+    A port that fails is closed and reopened periodically without affecting the others.
+
+    On platforms where serial ports cannot be selected (Windows) the nodes fall back to one
+    reader thread each.
+
+    Nodes configured with "process": true are served by their own process instead (ProcessNode);
+    this thread then also supervises them and restarts processes that died or hang.
+
+    Arguments:
+        config (dict): Node name to ArduinoNode keyword arguments, see load_node_config().
+        reopen_interval (float): Seconds before the first attempt to reopen a failed port, doubled per failure.
+
+    Attributes:
+        nodes (dict): Node name to ArduinoNode or ProcessNode.
+
+    Methods:
+        run(): Main threaded loop.
+        stop(): Stop the loop and close all ports.
+    """
+
+    def __init__(self, config: dict, reopen_interval: float = 2.0):
+        super().__init__(daemon=True)
+
+        self.nodes = {}
+
+        for name, options in config.items():
+            options = dict(options)
+            self.nodes[name] = ProcessNode(**options) if options.pop('process', False) else ArduinoNode(**options)
+
+        self.reopen_interval = reopen_interval
+
+        self.running = True
+        self.threaded = os.name == 'nt'
+
+        self._selector = selectors.DefaultSelector()
+        self._failed = {}
+        self._attempts = {}
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_CONFIG, **kwargs):
+        return cls(load_node_config(path), **kwargs)
+
+    def _open(self, name: str, node: ArduinoNode) -> bool:
+        try:
+            node.open(timeout=0)
+            self._selector.register(node.ser.fileno(), selectors.EVENT_READ, (name, node))
+        except Exception as e:
+            print(f"Connection error on {node.port}: {e}")
+            self._failed[name] = time.monotonic()
+            self._attempts[name] = self._attempts.get(name, 0) + 1
+            return False
+
+        self._failed.pop(name, None)
+        self._attempts.pop(name, None)
+        return True
+
+    def _close(self, name: str, node: ArduinoNode):
+        try:
+            self._selector.unregister(node.ser.fileno())
+        except (KeyError, ValueError, OSError):
+            pass
+
+        try:
+            node.ser.close()
+        except Exception:
+            pass
+
+        self._failed[name] = time.monotonic()
+
+    def _reopen_failed(self):
+        """
+        Retries failed ports; a reopened device resets, so its protocol is negotiated again.
+        """
+        now = time.monotonic()
+
+        for name, failed_at in list(self._failed.items()):
+            # Back off for devices that stay unavailable
+            if now - failed_at < min(self.reopen_interval * 2 ** (self._attempts.get(name, 1) - 1), 30.0):
+                continue
+
+            node = self.nodes[name]
+            node.reset_protocol()
+
+            if self._open(name, node):
+                threading.Timer(2.0, node.start_protocol).start()
+
+    def run(self):
+        """
+        Main loop: waits on all ports at once and dispatches received bytes to their nodes.
+        Note: Runs at separate thread!
+        """
+        processes = [node for node in self.nodes.values() if isinstance(node, ProcessNode)]
+        local = {name: node for name, node in self.nodes.items() if not isinstance(node, ProcessNode)}
+
+        for node in processes:
+            node.start()
+
+        if self.threaded:
+            for node in local.values():
+                node.start()
+
+            while self.running:
+                for node in processes:
+                    node.supervise()
+                time.sleep(0.2)
+            return
+
+        for name, node in local.items():
+            self._open(name, node)
+
+        # Allow time for the Arduinos to reset
+        time.sleep(2)
+
+        for name, node in local.items():
+            if name not in self._failed:
+                node.start_protocol()
+
+        while self.running:
+            if not self._selector.get_map():
+                time.sleep(0.2 if processes else 0.1)
+                events = []
+            else:
+                events = self._selector.select(timeout=0.2)
+
+            now = time.monotonic()
+
+            for key, _ in events:
+                name, node = key.data
+
+                try:
+                    chunk = node.ser.read(max(1, node.ser.in_waiting))
+                except Exception as e:
+                    if self.running:
+                        print(f"Connection error on {node.port}: {e}")
+                        self._close(name, node)
+                    continue
+
+                if chunk:
+                    node.feed(chunk, now)
+
+            if self._failed:
+                self._reopen_failed()
+
+            for node in processes:
+                node.supervise()
+
+    def stop(self):
+        """
+        Stops the loop (or the fallback threads) and closes all ports.
+        """
+        print("Stopping acquisition...")
+
+        self.running = False
+
+        if self.is_alive():
+            self.join()
+
+        for node in self.nodes.values():
+            if isinstance(node, ProcessNode):
+                node.stop()
+                continue
+
+            if self.threaded:
+                node.stop()
+                if node.is_alive():
+                    node.join()
+                continue
+
+            node.running = False
+
+            if node.ser:
+                node.ser.close()
+
+        self._selector.close()
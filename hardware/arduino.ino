@@ -10,11 +10,30 @@
 // EEPROM Address
 const int EEPROM_ADDR_SCALE = 0;
 
+// Binary protocol (see hardware/protocol.py)
+#define FRAME_SAMPLE 0x01
+
+struct __attribute__((packed)) SampleFrame {
+  uint8_t  type;
+  uint16_t seq;
+  uint32_t device_us;
+  float    force;
+  uint8_t  crc[2];   // CRC-16/CCITT-FALSE, big-endian
+};
+
 HX711 loadcell;
 
+// Output mode, JSON lines until the host requests binary frames
+bool binaryMode = false;
+uint16_t sequence = 0;
+
 // Define functions
 void tare(byte samples);
 void calibrate(double units);
+void setProtocol(byte mode);
+void sendBinary(uint32_t timestamp, double reaction);
+uint16_t crc16(const uint8_t *data, size_t len);
+size_t cobsEncode(const uint8_t *data, size_t len, uint8_t *out);
 
 void setup() {
   Serial.begin(115200);
@@ -58,20 +77,30 @@ void loop() {
       else if (action.equalsIgnoreCase("cal")) {
         calibrate(argument);
       }
+      else if (action.equalsIgnoreCase("proto")) {
+        setProtocol((byte)argument);
+      }
     }
   }
 
   // Read load cell ONLY when new data is ready
   if (loadcell.is_ready()) {
 
+    // Timestamp at acquisition, before the (slow) HX711 readout
+    uint32_t timestamp = micros();
+
     // Retrieve one sample from HX711
     double reaction = loadcell.get_units(1);
 
-    // JSON output
-    Serial.print("{");
-      Serial.print("\"force\":");
-      Serial.print(reaction, 3);
-    Serial.println("}");
+    if (binaryMode) {
+      sendBinary(timestamp, reaction);
+    } else {
+      // JSON output
+      Serial.print("{");
+        Serial.print("\"force\":");
+        Serial.print(reaction, 3);
+      Serial.println("}");
+    }
   }
 }
 
@@ -95,4 +124,84 @@ void calibrate(double units) {
 
   // Save scale factor to EEPROM
   EEPROM.put(EEPROM_ADDR_SCALE, (float)new_scale);
+}
+
+/*
+ * Switch output protocol, 1 = binary frames, 0 = JSON lines.
+ * The binary switch is acknowledged with a JSON descriptor on its own line followed by a sync byte.
+*/
+void setProtocol(byte mode) {
+  if (mode == 1) {
+    // Terminate a partially sent frame so the descriptor starts on its own line
+    Serial.println();
+    Serial.println("{\"proto\":\"bin\",\"ver\":1,\"channels\":[\"force\"],\"types\":\"f\"}");
+    Serial.write((uint8_t)0x00);
+    sequence = 0;
+    binaryMode = true;
+  } else {
+    binaryMode = false;
+  }
+}
+
+/*
+ * Send one sample as a COBS encoded frame terminated by 0x00
+*/
+void sendBinary(uint32_t timestamp, double reaction) {
+  SampleFrame frame;
+  frame.type = FRAME_SAMPLE;
+  frame.seq = sequence++;
+  frame.device_us = timestamp;
+  frame.force = (float)reaction;
+
+  uint16_t crc = crc16((const uint8_t *)&frame, sizeof(frame) - 2);
+  frame.crc[0] = crc >> 8;
+  frame.crc[1] = crc & 0xFF;
+
+  uint8_t encoded[sizeof(SampleFrame) + 2];
+  size_t len = cobsEncode((const uint8_t *)&frame, sizeof(frame), encoded);
+  encoded[len++] = 0x00;
+
+  Serial.write(encoded, len);
+}
+
+/*
+ * CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF), matches binascii.crc_hqx on the host
+*/
+uint16_t crc16(const uint8_t *data, size_t len) {
+  uint16_t crc = 0xFFFF;
+
+  for (size_t i = 0; i < len; i++) {
+    crc ^= (uint16_t)data[i] << 8;
+
+    for (uint8_t bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+
+  return crc;
+}
+
+/*
+ * Consistent Overhead Byte Stuffing, frames shorter than 254 bytes only
+*/
+size_t cobsEncode(const uint8_t *data, size_t len, uint8_t *out) {
+  size_t read = 0;
+  size_t write = 1;
+  size_t code_idx = 0;
+  uint8_t code = 1;
+
+  while (read < len) {
+    if (data[read] == 0) {
+      out[code_idx] = code;
+      code = 1;
+      code_idx = write++;
+    } else {
+      out[write++] = data[read];
+      code++;
+    }
+    read++;
+  }
+
+  out[code_idx] = code;
+  return write;
 }
\ No newline at end of file
@@ -1,8 +1,12 @@
 import threading
 import serial
+import numpy as np
 import json
 import time
-from collections import deque
+from hardware.protocol import FrameDecoder, parse_handshake, HANDSHAKE_COMMAND
+from hardware.clock_sync import ClockSync
+from utils.sample_buffer import SampleBuffer
+from utils.filters import FilterChain, filtered_name
 
 
 class ArduinoNode(threading.Thread):
@@ -12,81 +16,267 @@ class ArduinoNode(threading.Thread):
     Arguments:
         port (str): Physical USB port address.
         baudrate (int): Communication boud rate.
-        queue_len (int): Size of parsed JSON queue sample points.
+        queue_len (int): Number of samples kept in the ring buffer (minutes of history at full rate).
         timeout (float): Timeout between communication send/receive and ACK
+        read_size (int): Maximum number of bytes fetched per blocking read.
+        max_line_len (int): Buffered bytes without newline before the buffer is discarded.
+        binary (bool): Request the binary framed protocol at startup, JSON lines remain the fallback.
+        filters (dict): Channel name to filter specifications, see utils/filters.py. The filtered
+                        values are stored as the additional channel "<channel>_filtered".
+
+    Attributes:
+        samples (SampleBuffer): Ring buffer of all received samples, timestamped with time.monotonic().
+        pipelines (dict): Channel name to its FilterChain.
+        clock (ClockSync | None): Device to host clock mapping, active in binary mode.
 
     Methods:
         run(): Main threaded loop.
-        get_latest_value(key: str): Retrieve the latest value for a given key.
+        open(timeout): Open the serial port.
+        start_protocol(): Request the binary protocol if enabled.
+        reset_protocol(): Forget the protocol, clock and filter state of the previous connection.
+        feed(chunk, timestamp): Frame, parse and store received bytes (used by AcquisitionManager).
+        get_latest_value(key: str, filtered: bool): Retrieve the latest raw or filtered value for a given key.
+        get_mean_value_samples(key: str, n: int): Mean over the last n samples.
+        get_mean_value_time(key: str, t: float): Mean over the last t seconds.
+        get_mean_value_next(key: str, n: int, timeout: float): Mean over the next n new samples.
+        get_stats_samples(key: str, n: int): Mean/std/min/max over the last n samples.
+        get_stats_time(key: str, t: float): Mean/std/min/max over the last t seconds.
+        get_sync_quality(): Clock synchronisation statistics.
     """
 
-    def __init__(self, port: str, baudrate: int = 115200, queue_len: int = 50, timeout: float = 0.2):
+    def __init__(self, port: str, baudrate: int = 115200, queue_len: int = 65536, timeout: float = 0.2,
+                 read_size: int = 4096, max_line_len: int = 1024, binary: bool = False, filters: dict = None):
         super().__init__()
 
         self.port = port
         self.baudrate = baudrate
-        self.data_queue = deque(maxlen=queue_len)
+        self.samples = SampleBuffer(capacity=queue_len)
         self.timeout = timeout
 
+        # Upper bound on bytes fetched per read() call and on a single unterminated line
+        self.read_size = read_size
+        self.max_line_len = max_line_len
+
+        # Protocol state, switched to a FrameDecoder once the firmware acknowledges binary mode
+        self.binary = binary
+        self.protocol = "json"
+        self.decoder = None
+        self.clock = None
+
+        # Signal conditioning, run once per batch in the acquisition path
+        self.pipelines = {channel: FilterChain(specs) for channel, specs in (filters or {}).items()}
+
         self.running = True
         self.ser = None
 
+        # Bytes of the current unterminated line
+        self._line_buffer = bytearray()
+
     def run(self):
         """
         Main loop: transfers data to and from Arduino.
         Note: Runs at separate thread!
+
+        The loop blocks inside read() until at least one byte arrives (or the timeout expires),
+        then takes everything that is waiting in a single call. Lines are framed from a reusable
+        buffer, so every complete line received during one wakeup is parsed at once.
         """
 
         try:
-            print(f"Setting up Arduino connection on {self.port}...")
-
-            self.ser = serial.Serial(port=self.port, baudrate=self.baudrate, timeout=self.timeout)
-
-            print(f"Connected to Arduino on {self.port}")
+            self.open()
 
             # Allow time for Arduino to reset
             time.sleep(2)
 
-            # Read, parse and store in the queue
+            self.start_protocol()
+
+            # Read, frame, parse and store in the queue
             while self.running:
 
-                # If data is available
-                if self.ser.in_waiting > 0:
-                    try:
-                        line = self.ser.readline().decode('utf-8').strip()
+                # Blocks until data is available, then drains whatever is waiting
+                chunk = self.ser.read(min(max(1, self.ser.in_waiting), self.read_size))
 
-                        # Expecting JSON formatted data
-                        if line.startswith('{') and line.endswith('}'):
-                            # Parse data to JSON
-                            data = json.loads(line)
+                if chunk:
+                    self.feed(chunk, time.monotonic())
 
-                            # Add timestamp
-                            data['timestamp'] = time.time()
+        except Exception as e:
+            if self.running:
+                print(f"Connection error on {self.port}: {e}")
 
-                            # Append to queue
-                            self.data_queue.append(data)
+    def open(self, timeout: float | None = None):
+        """
+        Opens the serial port.
 
-                    except (json.JSONDecodeError, UnicodeDecodeError):
-                        pass  # Ignore malformed packets
+        Argument
+            timeout (float | None): Read timeout, the node timeout when None (0 = non-blocking).
+        """
 
-        except Exception as e:
-            print(f"Connection error on {self.port}: {e}")
+        print(f"Setting up Arduino connection on {self.port}...")
 
-    def get_latest_value(self, key: str) -> float | None:
+        self.ser = serial.Serial(port=self.port, baudrate=self.baudrate,
+                                 timeout=self.timeout if timeout is None else timeout)
+
+        # Enlarge the driver receive buffer where supported (Windows) to absorb bursts
+        if hasattr(self.ser, 'set_buffer_size'):
+            self.ser.set_buffer_size(rx_size=max(self.read_size * 4, 16384))
+
+        print(f"Connected to Arduino on {self.port}")
+
+    def start_protocol(self):
+        """
+        Asks for binary frames, firmware without support keeps sending JSON.
+        """
+
+        if self.binary:
+            self.send_command(HANDSHAKE_COMMAND)
+
+    def reset_protocol(self):
+        """
+        Returns to the startup state after the device reset (e.g. a reopened port): JSON lines,
+        no clock mapping until the next handshake and filters without history.
+        """
+
+        self.decoder = None
+        self.clock = None
+        self.protocol = "json"
+        self._line_buffer.clear()
+
+        for pipeline in self.pipelines.values():
+            pipeline.reset()
+
+    def feed(self, chunk: bytes, timestamp: float):
+        """
+        Frames, parses and stores a chunk of received bytes.
+        Partial lines or frames are kept until the next chunk completes them.
+
+        Argument
+            chunk (bytes): Bytes read from the port.
+            timestamp (float): Host time at which the chunk was received.
+        """
+
+        if self.decoder:
+            self._store_frames(self.decoder.feed(chunk), timestamp)
+            return
+
+        buffer = self._line_buffer
+        buffer += chunk
+
+        # Only handle complete lines, keep the trailing partial line in the buffer
+        end = buffer.rfind(b'\n')
+
+        if end < 0:
+            # Drop garbage that never terminates
+            if len(buffer) > self.max_line_len:
+                buffer.clear()
+            return
+
+        lines = buffer[:end].split(b'\n')
+        del buffer[:end + 1]
+
+        remainder = self._parse_lines(lines, timestamp)
+
+        # Handshake received: everything after the descriptor line is binary
+        if self.decoder:
+            self._store_frames(self.decoder.feed(remainder + bytes(buffer)), timestamp)
+            buffer.clear()
+
+    def _parse_lines(self, lines: list, timestamp: float) -> bytes:
+        """
+        Parse a batch of complete lines and append the valid samples to the buffer.
+
+        Argument
+            lines (list): Raw lines without the newline terminator.
+            timestamp (float): Host time at which the batch was received.
+
+        Returns
+            bytes: Unparsed bytes following a binary handshake, empty otherwise.
+        """
+
+        for idx, raw in enumerate(lines):
+            line = raw.strip()
+
+            # Expecting JSON formatted data
+            if not (line.startswith(b'{') and line.endswith(b'}')):
+                continue
+
+            try:
+                # Parse data to JSON
+                data = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue  # Ignore malformed packets
+
+            # Binary mode acknowledged by the firmware
+            if 'proto' in data:
+                descriptor = parse_handshake(line)
+
+                if self.binary and descriptor:
+                    self.decoder = FrameDecoder(*descriptor)
+
+                    # Constant delay: transmission time of one frame (10 bits per byte incl. overhead)
+                    frame_bytes = self.decoder.dtype.itemsize + 2
+                    self.clock = ClockSync(latency=frame_bytes * 10 / self.baudrate)
+                    self.protocol = "binary"
+                    print(f"Binary protocol active on {self.port}: {', '.join(descriptor[0])}")
+
+                    # Restore the bytes after the descriptor, including the consumed final newline
+                    rest = lines[idx + 1:]
+                    return b'\n'.join(rest) + b'\n' if rest else b''
+
+                continue
+
+            # Append to buffer, only numeric channels are stored
+            values = {key: value for key, value in data.items() if isinstance(value, (int, float))}
+
+            for channel, pipeline in self.pipelines.items():
+                if channel in values:
+                    values[filtered_name(channel)] = float(pipeline.apply(np.array([values[channel]]))[0])
+
+            self.samples.append(timestamp, values)
+
+        return b''
+
+    def _store_frames(self, frames, timestamp: float):
+        """
+        Append a batch of decoded binary frames to the buffer in one vectorized write.
+        Samples are timestamped with their device acquisition time mapped onto the host clock.
+
+        Argument
+            frames (np.ndarray): Structured array returned by the FrameDecoder.
+            timestamp (float): Host time at which the batch was received.
+        """
+
+        if len(frames) == 0:
+            return
+
+        # The newest frame of a batch arrived with the least buffering delay
+        device_time = self.clock.unwrap(frames['device_us'])
+        self.clock.update(device_time[-1], timestamp)
+
+        columns = {name: frames[name] for name in self.decoder.channels}
+
+        for channel, pipeline in self.pipelines.items():
+            if channel in columns:
+                columns[filtered_name(channel)] = pipeline.apply(columns[channel])
+
+        columns['seq'] = frames['seq']
+        columns['device_time'] = device_time
+        columns['host_time'] = np.full(len(frames), timestamp)
+
+        self.samples.extend(self.clock.to_host(device_time), columns)
+
+    def get_latest_value(self, key: str, filtered: bool = False) -> float | None:
         """
         Retrieve the latest value for a given key.
 
         Argument
             key (str): Key to retrieve value for.
+            filtered (bool): Return the output of the channel's filter pipeline instead of the raw value.
 
         Returns
             float | None: Value for the given key, or None if not found.
         """
 
-        if len(self.data_queue) > 0:
-            return self.data_queue[-1].get(key, None)
-
-        return None
+        return self.samples.latest(filtered_name(key) if filtered else key)
 
     def get_mean_value_samples(self, key: str, n: int = 10) -> float | None:
         """
@@ -100,12 +290,9 @@ class ArduinoNode(threading.Thread):
             float | None: Mean value, or None if not enough samples are available.
         """
 
-        values = [entry.get(key, 0) for entry in list(self.data_queue)[-n:]]
-
-        if values:
-            return sum(values) / len(values)
+        stats = self.samples.stats(key, n=n)
 
-        return None
+        return stats['mean'] if stats else None
 
     def get_mean_value_time(self, key: str, t: float = 1.0) -> float | None:
         """
@@ -119,13 +306,81 @@ class ArduinoNode(threading.Thread):
             float | None: Mean value, or None if not enough samples are available.
         """
 
-        current_time = time.time()
-        values = [entry.get(key, 0) for entry in self.data_queue if (current_time - entry['timestamp']) <= t]
+        stats = self.samples.stats(key, t0=time.monotonic() - t)
+
+        return stats['mean'] if stats else None
+
+    def get_mean_value_next(self, key: str, n: int = 10, timeout: float = 1.0) -> float | None:
+        """
+        Wait for n new samples of a given key and return their mean.
+        Unlike repeated get_latest_value calls, every sample contributes exactly once.
+
+        Argument
+            key (str): Key to retrieve values for.
+            n (int): Number of new samples to average.
+            timeout (float): Maximum waiting time in seconds, the mean of the samples received so far is used.
+
+        Returns
+            float | None: Mean value, or None if no new sample arrived.
+        """
+
+        index = self.samples.count
+        deadline = time.monotonic() + timeout
+        values = []
+        received = 0
+
+        while received < n:
+            new, index, _ = self.samples.read_from(index)
+
+            if len(new) and key in new.dtype.names:
+                column = new[key][~np.isnan(new[key])][:n - received]
+                values.append(column)
+                received += len(column)
+
+            if received >= n or time.monotonic() >= deadline:
+                break
+
+            time.sleep(0.001)
+
+        return float(np.concatenate(values).mean()) if received else None
+
+    def get_stats_samples(self, key: str, n: int = 10) -> dict | None:
+        """
+        Calculate mean, std, min and max of the last n values for a given key.
+
+        Argument
+            key (str): Key to retrieve values for.
+            n (int): Number of samples in the window.
 
-        if values:
-            return sum(values) / len(values)
+        Returns
+            dict | None: Statistics with keys mean, std, min, max and count, or None without samples.
+        """
+
+        return self.samples.stats(key, n=n)
+
+    def get_stats_time(self, key: str, t: float = 1.0) -> dict | None:
+        """
+        Calculate mean, std, min and max of the values for a given key over the last t seconds.
+
+        Argument
+            key (str): Key to retrieve values for.
+            t (float): Time window in seconds.
+
+        Returns
+            dict | None: Statistics with keys mean, std, min, max and count, or None without samples.
+        """
+
+        return self.samples.stats(key, t0=time.monotonic() - t)
+
+    def get_sync_quality(self) -> dict | None:
+        """
+        Retrieve the current host/device clock synchronisation quality.
+
+        Returns
+            dict | None: Offset, drift (ppm), residual jitter (s) and fit size, or None in JSON mode.
+        """
 
-        return None
+        return self.clock.quality() if self.clock else None
 
     def send_command(self, command: str):
         """
@@ -0,0 +1,166 @@
+import math
+import numpy as np
+
+
+class ClockSync:
+    """
+    Estimates the mapping from the device micros() clock to host time.monotonic().
+
+    Every received batch contributes one (device time, host arrival time) pair. Arrival times
+    only ever lag the acquisition (USB buffering, scheduling), so a linear regression over a
+    sliding window estimates the drift, and the intercept is shifted down to the lower
+    envelope of the residuals, i.e. the batches that arrived with the least delay.
+
+    Arguments:
+        window (int): Number of (device, host) pairs kept for the running regression.
+        min_span (float): Device time span in seconds required before drift is estimated.
+        max_drift (float): Bound on the relative clock rate error (0.01 = 1%).
+        envelope (float): Residual quantile taken as the minimum transport delay.
+        latency (float): Known constant delay between acquisition and arrival (e.g. frame transmit time).
+
+    Attributes:
+        offset (float | None): Host time at device time 0, None until the first update.
+        rate (float): Host seconds per device second.
+        jitter (float): Standard deviation of the regression residuals in seconds.
+
+    Methods:
+        unwrap(device_us): Convert wrapping 32-bit micros() values to continuous seconds.
+        update(device_s, host_s): Add a synchronisation point and refit.
+        to_host(device_s): Corrected host acquisition time for device timestamps.
+        quality(): Current synchronisation statistics.
+    """
+
+    def __init__(self, window: int = 512, min_span: float = 1.0, max_drift: float = 0.01,
+                 envelope: float = 0.05, latency: float = 0.0):
+        self.window = window
+        self.min_span = min_span
+        self.max_drift = max_drift
+        self.envelope = envelope
+        self.latency = latency
+
+        self.offset = None
+        self.rate = 1.0
+        self.jitter = math.nan
+        self.resets = 0
+
+        self._device = np.zeros(window)
+        self._host = np.zeros(window)
+        self._count = 0
+
+        self._last_raw = None
+        self._last_unwrapped = 0.0
+
+    def reset(self):
+        """
+        Discard the regression state, e.g. after the device restarted.
+        """
+        self.offset = None
+        self.rate = 1.0
+        self.jitter = math.nan
+        self._count = 0
+
+    def unwrap(self, device_us: np.ndarray) -> np.ndarray:
+        """
+        Converts wrapping 32-bit micros() values to continuous device time in seconds.
+        A backwards jump (device reset) restarts the regression.
+
+        Arguments:
+            device_us (np.ndarray): Raw device timestamps in microseconds.
+
+        Returns:
+            np.ndarray: Continuous device time in seconds.
+        """
+        raw = np.asarray(device_us, dtype=np.int64)
+
+        if len(raw) == 0:
+            return np.empty(0)
+
+        previous = raw[0] if self._last_raw is None else self._last_raw
+        deltas = np.diff(raw, prepend=previous) % (1 << 32)
+
+        # Steps of more than half the range are a restarted clock, not a wrap
+        backwards = deltas >= (1 << 31)
+
+        if backwards.any():
+            deltas[backwards] = 0
+            self.resets += 1
+            self.reset()
+
+        unwrapped = self._last_unwrapped + np.cumsum(deltas) * 1e-6
+
+        self._last_raw = int(raw[-1])
+        self._last_unwrapped = float(unwrapped[-1])
+
+        return unwrapped
+
+    def update(self, device_s: float, host_s: float):
+        """
+        Adds a synchronisation point and refits offset and drift.
+
+        Arguments:
+            device_s (float): Unwrapped device time of the newest sample in a batch.
+            host_s (float): Host monotonic time at which that batch was received.
+        """
+        idx = self._count % self.window
+        self._device[idx] = device_s
+        self._host[idx] = host_s
+        self._count += 1
+
+        size = min(self._count, self.window)
+        device = self._device[:size]
+        host = self._host[:size]
+
+        # Center for numerical stability, absolute times are large
+        d_mean = device.mean()
+        h_mean = host.mean()
+        d = device - d_mean
+        h = host - h_mean
+
+        rate = 1.0
+        span = device.max() - device.min()
+
+        if span >= self.min_span:
+            rate = float(np.dot(d, h) / np.dot(d, d))
+            rate = min(max(rate, 1.0 - self.max_drift), 1.0 + self.max_drift)
+
+        residuals = h - rate * d
+
+        # Shift onto the lower envelope: the least delayed arrivals define the offset
+        floor = float(np.quantile(residuals, self.envelope)) if size > 1 else float(residuals[0])
+
+        self.rate = rate
+        self.offset = float(h_mean + floor - rate * d_mean - self.latency)
+        self.jitter = float(residuals.std()) if size > 1 else math.nan
+
+    def to_host(self, device_s):
+        """
+        Maps device time to corrected host monotonic acquisition time.
+
+        Arguments:
+            device_s (float | np.ndarray): Unwrapped device time in seconds.
+
+        Returns:
+            float | np.ndarray: Host monotonic time in seconds.
+        """
+        if self.offset is None:
+            raise RuntimeError("Clock not synchronised yet.")
+
+        return self.offset + self.rate * np.asarray(device_s)
+
+    def quality(self) -> dict:
+        """
+        Current synchronisation statistics.
+
+        Returns:
+            dict: offset (s), drift_ppm, jitter (s), points, span (s) and resets.
+        """
+        size = min(self._count, self.window)
+
+        return {
+            'offset': self.offset,
+            'drift_ppm': (self.rate - 1.0) * 1e6,
+            'jitter': self.jitter,
+            'points': size,
+            'span': float(np.ptp(self._device[:size])) if size else 0.0,
+            'resets': self.resets,
+        }
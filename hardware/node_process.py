@@ -0,0 +1,215 @@
+import time
+import queue
+import multiprocessing as mp
+from hardware.arduino import ArduinoNode
+from utils.sample_buffer import SharedSampleBuffer
+from utils.filters import filtered_name
+
+# Extra columns stored per sample in binary mode, see ArduinoNode._store_frames()
+BINARY_COLUMNS = ['seq', 'device_time', 'host_time']
+
+
+def _node_main(options: dict, buffer_name: str, capacity: int, channels: list, stop_event, commands, status,
+               status_interval: float):
+    """
+    Entry point of a node process: runs the ArduinoNode read loop and writes into the shared ring.
+
+    Arguments:
+        options (dict): ArduinoNode keyword arguments.
+        buffer_name (str): Shared memory block created by the parent.
+        capacity (int): Ring capacity.
+        channels (list): Channels of the ring.
+        stop_event (multiprocessing.Event): Set by the parent to stop the process.
+        commands (multiprocessing.Queue): Commands to forward to the device.
+        status (multiprocessing.Queue): Protocol and clock sync reports to the parent.
+        status_interval (float): Seconds between status reports.
+    """
+    node = ArduinoNode(**options)
+    node.samples = SharedSampleBuffer(capacity, channels, name=buffer_name)
+    node.samples.heartbeat = time.monotonic()
+
+    try:
+        node.open()
+
+        # Allow time for Arduino to reset
+        time.sleep(2)
+
+        node.start_protocol()
+        next_status = 0.0
+
+        while not stop_event.is_set():
+            chunk = node.ser.read(min(max(1, node.ser.in_waiting), node.read_size))
+            now = time.monotonic()
+
+            if chunk:
+                node.feed(chunk, now)
+
+            node.samples.heartbeat = now
+
+            while True:
+                try:
+                    node.send_command(commands.get_nowait())
+                except queue.Empty:
+                    break
+
+            if now >= next_status:
+                status.put({'protocol': node.protocol, 'sync': node.get_sync_quality()})
+                next_status = now + status_interval
+
+    except KeyboardInterrupt:
+        pass
+
+    except Exception as e:
+        print(f"Connection error on {node.port}: {e}")
+        raise SystemExit(1)
+
+    finally:
+        if node.ser:
+            node.ser.close()
+
+        node.samples.close()
+
+
+class ProcessNode:
+    """
+    Arduino node served by its own process, readable from the parent without copying through pipes.
+
+    The child process owns the serial port, parsing and clock sync (a stall of the parent, e.g. a GC
+    pause or a busy routine, cannot delay the port), and writes samples into a SharedSampleBuffer
+    created here. The reader API is the one of ArduinoNode and works on the mapped ring directly.
+
+    The ring stays owned by the parent, so a dead or hung process (no heartbeat) is restarted
+    without losing history: readers keep their indices and see the new samples continue.
+
+    Arguments:
+        port (str): Physical USB port address.
+        channels (list): Sample channels sent by the device (the ring layout is fixed).
+        queue_len (int): Number of samples kept in the ring buffer.
+        restart_delay (float): Seconds before the first restart of a failed process, doubled per failure.
+        heartbeat_timeout (float): Seconds without heartbeat after which the process is considered hung.
+        **options: Remaining ArduinoNode keyword arguments (baudrate, timeout, binary, filters, ...).
+                   Filtered channels are added to the ring automatically.
+
+    Attributes:
+        samples (SharedSampleBuffer): Ring written by the node process.
+        protocol (str): Active protocol as last reported by the process.
+        restarts (int): Number of process restarts.
+
+    Methods:
+        start(): Start the node process.
+        supervise(): Collect status reports and restart a dead or hung process.
+        send_command(command): Forward a command to the device.
+        stop(): Stop the process and free the ring.
+    """
+
+    def __init__(self, port: str, channels: list, queue_len: int = 65536, restart_delay: float = 2.0,
+                 heartbeat_timeout: float = 5.0, **options):
+        self.port = port
+        self.options = dict(options, port=port, queue_len=1)
+        self.restart_delay = restart_delay
+        self.heartbeat_timeout = heartbeat_timeout
+
+        columns = list(channels) + [filtered_name(channel) for channel in options.get('filters', {})]
+        columns += BINARY_COLUMNS if options.get('binary') else []
+        self.samples = SharedSampleBuffer(queue_len, columns)
+
+        self.protocol = "json"
+        self.restarts = 0
+        self.process = None
+
+        self._context = mp.get_context('spawn')
+        self._stop_event = self._context.Event()
+        self._commands = self._context.Queue()
+        self._status = self._context.Queue()
+        self._sync = None
+        self._failures = 0
+        self._failed_at = None
+        self._started_at = None
+
+    def start(self):
+        self._stop_event.clear()
+        self.samples.heartbeat = self._started_at = time.monotonic()
+
+        self.process = self._context.Process(
+            target=_node_main, name=f"node {self.port}", daemon=True,
+            args=(self.options, self.samples.name, self.samples.capacity, self.samples.channels,
+                  self._stop_event, self._commands, self._status, 1.0))
+        self.process.start()
+
+    def supervise(self):
+        """
+        Called periodically by the AcquisitionManager.
+        """
+        while True:
+            try:
+                report = self._status.get_nowait()
+            except queue.Empty:
+                break
+
+            self.protocol = report['protocol']
+            self._sync = report['sync']
+
+        if self.process is None or self._stop_event.is_set():
+            return
+
+        now = time.monotonic()
+
+        if self.process.is_alive():
+            if now - self.samples.heartbeat < self.heartbeat_timeout:
+                # A process that has been up for a while starts a new backoff sequence
+                if now - self._started_at > 30.0:
+                    self._failures = 0
+                return
+
+            print(f"Node process on {self.port} is not responding, terminating.")
+            self.process.terminate()
+            self.process.join(timeout=1.0)
+
+        if self._failed_at is None:
+            self._failed_at = now
+            self._failures += 1
+
+        # Back off for devices that stay unavailable
+        if now - self._failed_at < min(self.restart_delay * 2 ** (self._failures - 1), 30.0):
+            return
+
+        print(f"Restarting node process on {self.port}...")
+        self._failed_at = None
+        self.restarts += 1
+        self.protocol = "json"
+        self._sync = None
+        self.start()
+
+    def send_command(self, command: str):
+        if self.process is not None and self.process.is_alive():
+            self._commands.put(command)
+        else:
+            print(f"Cannot send command. Node process on {self.port} is not running.")
+
+    def get_sync_quality(self) -> dict | None:
+        return self._sync
+
+    # Reader API, identical to ArduinoNode (these methods only use self.samples)
+    get_latest_value = ArduinoNode.get_latest_value
+    get_mean_value_samples = ArduinoNode.get_mean_value_samples
+    get_mean_value_time = ArduinoNode.get_mean_value_time
+    get_mean_value_next = ArduinoNode.get_mean_value_next
+    get_stats_samples = ArduinoNode.get_stats_samples
+    get_stats_time = ArduinoNode.get_stats_time
+
+    def stop(self):
+        """
+        Stop the process and free the shared ring.
+        """
+        print(f"Stopping node process on {self.port}...")
+
+        self._stop_event.set()
+
+        if self.process is not None:
+            self.process.join(timeout=2.0)
+
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+
+        self.samples.close(unlink=True)
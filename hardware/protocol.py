@@ -0,0 +1,268 @@
+"""
+Binary framed sample protocol shared by ArduinoNode and the Arduino firmware.
+
+Frame layout before encoding (little-endian):
+    uint8   type        FRAME_SAMPLE
+    uint16  seq         Sample counter, wraps at 65536
+    uint32  device_us   Device micros() at acquisition, wraps after ~71 minutes
+    ...     channels    One value per channel, typed as announced in the handshake
+    uint16  crc         CRC-16/CCITT-FALSE over all preceding bytes (big-endian)
+
+Every frame is COBS encoded and terminated by a single 0x00 sync byte, so a receiver can always
+resynchronise on the next delimiter after a corrupted or truncated frame.
+
+Handshake:
+    The host sends "proto:1". Firmware with binary support answers with one JSON descriptor line
+    such as {"proto":"bin","ver":1,"channels":["force"],"types":"f"} followed by a 0x00 byte and
+    binary frames. Firmware without support ignores the command and keeps sending JSON lines.
+"""
+
+
+import json
+import struct
+import binascii
+import numpy as np
+
+SYNC = b'\x00'
+FRAME_SAMPLE = 0x01
+PROTOCOL_VERSION = 1
+HANDSHAKE_COMMAND = "proto:1"
+
+# Supported channel type codes and their little-endian NumPy equivalents
+CHANNEL_TYPES = {
+    'f': '<f4',
+    'd': '<f8',
+    'i': '<i4',
+    'I': '<u4',
+    'h': '<i2',
+    'H': '<u2',
+}
+
+
+def cobs_encode(data: bytes) -> bytes:
+    """
+    Consistent Overhead Byte Stuffing encoder.
+
+    Arguments:
+        data (bytes): Raw payload, may contain zero bytes.
+
+    Returns:
+        bytes: Encoded payload without zero bytes (delimiter not included).
+    """
+    out = bytearray()
+    block = bytearray()
+
+    for byte in data:
+        if byte == 0:
+            out.append(len(block) + 1)
+            out += block
+            block.clear()
+        else:
+            block.append(byte)
+
+            if len(block) == 254:
+                out.append(255)
+                out += block
+                block.clear()
+
+    out.append(len(block) + 1)
+    out += block
+
+    return bytes(out)
+
+
+def cobs_decode(data: bytes) -> bytes:
+    """
+    Consistent Overhead Byte Stuffing decoder.
+
+    Arguments:
+        data (bytes): Encoded payload without the trailing delimiter.
+
+    Returns:
+        bytes: Decoded payload.
+
+    Raises:
+        ValueError: If the encoding is invalid.
+    """
+    # Fast path: payload without zero bytes is a single block
+    if data and data[0] == len(data) and data[0] != 255:
+        return bytes(data[1:])
+
+    out = bytearray()
+    idx = 0
+    length = len(data)
+
+    while idx < length:
+        code = data[idx]
+
+        if code == 0 or idx + code > length:
+            raise ValueError("Invalid COBS block")
+
+        out += data[idx + 1:idx + code]
+        idx += code
+
+        # Implicit zero between blocks, except after a full block or at the end
+        if code != 255 and idx < length:
+            out.append(0)
+
+    return bytes(out)
+
+
+def build_frame_dtype(channels: list, types: str) -> np.dtype:
+    """
+    Builds the structured dtype of one decoded sample frame.
+
+    Arguments:
+        channels (list): Channel names in frame order.
+        types (str): One type code from CHANNEL_TYPES per channel.
+
+    Returns:
+        np.dtype: Packed structured dtype including header and CRC fields.
+    """
+    if len(channels) != len(types):
+        raise ValueError("Every channel requires exactly one type code.")
+
+    fields = [('type', 'u1'), ('seq', '<u2'), ('device_us', '<u4')]
+    fields += [(name, CHANNEL_TYPES[code]) for name, code in zip(channels, types)]
+    fields += [('crc', '>u2')]
+
+    return np.dtype(fields)
+
+
+def encode_sample(seq: int, device_us: int, values: list, types: str) -> bytes:
+    """
+    Encodes a single sample into a delimited wire frame, mirroring the firmware.
+
+    Arguments:
+        seq (int): Sample counter (wrapped to 16 bits).
+        device_us (int): Device timestamp in microseconds (wrapped to 32 bits).
+        values (list): Channel values in frame order.
+        types (str): Channel type codes.
+
+    Returns:
+        bytes: COBS encoded frame including the trailing sync byte.
+    """
+    payload = struct.pack('<BHI' + types, FRAME_SAMPLE, seq & 0xFFFF, device_us & 0xFFFFFFFF, *values)
+    payload += struct.pack('>H', binascii.crc_hqx(payload, 0xFFFF))
+
+    return cobs_encode(payload) + SYNC
+
+
+def parse_handshake(line: bytes) -> tuple | None:
+    """
+    Parses a handshake descriptor line sent by the firmware.
+
+    Arguments:
+        line (bytes): A complete text line.
+
+    Returns:
+        tuple | None: (channels, types) if the line is a valid descriptor, otherwise None.
+    """
+    try:
+        descriptor = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+    if not isinstance(descriptor, dict) or descriptor.get('proto') != 'bin':
+        return None
+
+    channels = list(descriptor.get('channels', []))
+    types = str(descriptor.get('types', ''))
+
+    if not channels or len(channels) != len(types) or any(t not in CHANNEL_TYPES for t in types):
+        return None
+
+    return channels, types
+
+
+class FrameDecoder:
+    """
+    Incremental decoder turning a raw byte stream into structured sample arrays.
+
+    Arguments:
+        channels (list): Channel names in frame order.
+        types (str): Channel type codes.
+
+    Attributes:
+        dtype (np.dtype): Structured dtype of decoded frames.
+        crc_errors (int): Number of frames rejected by length or CRC check.
+        lost_frames (int): Number of frames missing according to the sequence counter.
+
+    Methods:
+        feed(data): Decode all complete frames contained in data.
+    """
+
+    def __init__(self, channels: list, types: str):
+        self.channels = channels
+        self.types = types
+        self.dtype = build_frame_dtype(channels, types)
+
+        self.crc_errors = 0
+        self.lost_frames = 0
+
+        self._buffer = bytearray()
+        self._last_seq = None
+
+    def feed(self, data: bytes) -> np.ndarray:
+        """
+        Appends data to the internal buffer and decodes every complete frame in bulk.
+
+        Arguments:
+            data (bytes): Newly received bytes.
+
+        Returns:
+            np.ndarray: Structured array of valid frames (may be empty).
+        """
+        self._buffer += data
+
+        end = self._buffer.rfind(SYNC)
+
+        if end < 0:
+            # Never seen a delimiter in a long stretch: discard, the next sync byte resynchronises
+            if len(self._buffer) > 4096:
+                self._buffer.clear()
+
+            return np.empty(0, dtype=self.dtype)
+
+        encoded = self._buffer[:end].split(SYNC)
+        del self._buffer[:end + 1]
+
+        size = self.dtype.itemsize
+        payload = bytearray()
+
+        for chunk in encoded:
+            if not chunk:
+                continue
+
+            try:
+                frame = cobs_decode(chunk)
+            except ValueError:
+                self.crc_errors += 1
+                continue
+
+            # A valid frame with its CRC appended always yields a zero remainder
+            if len(frame) != size or frame[0] != FRAME_SAMPLE or binascii.crc_hqx(frame, 0xFFFF) != 0:
+                self.crc_errors += 1
+                continue
+
+            payload += frame
+
+        frames = np.frombuffer(bytes(payload), dtype=self.dtype)
+
+        if len(frames):
+            self._count_lost(frames['seq'])
+
+        return frames
+
+    def _count_lost(self, seq: np.ndarray):
+        """
+        Updates the lost frame counter from gaps in the 16-bit sequence numbers.
+        """
+        seq = seq.astype(np.int64)
+
+        if self._last_seq is not None:
+            seq = np.concatenate(([self._last_seq], seq))
+
+        gaps = (np.diff(seq) - 1) % 65536
+        self.lost_frames += int(gaps.sum())
+        self._last_seq = int(seq[-1])
@@ -3,6 +3,8 @@ import rtde_control
 import rtde_receive
 import rtde_io
 import socket
+import numpy as np
+from hardware.robot_state import RobotStateSampler, DEFAULT_VARIABLES
 
 
 class RobotInterface:
@@ -11,33 +13,46 @@ class RobotInterface:
 
     Arguments:
         robot_ip (str): IP address of the robot.
+        frequency (float): RTDE sampling frequency in Hz (500 on e-Series, 125 on CB-Series).
+        variables (list): RTDE receive variables sampled by the background sampler.
 
     Attributes:
         ip (str): IP address of the robot.
         control (RTDEControlInterface): RTDE control interface.
         receive (RTDEReceiveInterface): RTDE receive interface.
         io (RTDEIOInterface): RTDE IO interface.
+        sampler (RobotStateSampler): Background sampler publishing the latest state.
 
     Methods:
         connect(): Establishes connection to RTDE and Dashboard.
         reconnect(): Attempts to reconnect if connection is lost.
         is_ready(): Checks if robot is powered on and not in safety stop.
+        get_state(): Latest immutable state snapshot.
+        get_tcp_pose(): Latest TCP pose from the snapshot.
+        get_tcp_pose_at(t): TCP pose at a past time from the state history.
+        stop(acc, script): Stops the current motion, optionally also the control script.
+        restart_script(): Restarts the control script after stop(script=True).
         disconnect(): Closes RTDE connections.
     """
 
-    def __init__(self, robot_ip: str):
+    def __init__(self, robot_ip: str, frequency: float = 500.0, variables: list = None):
         """
         Initializes the RobotInterface with the given robot IP.
         Immediately attempts to connect upon initialization.
 
         Arguments:
             robot_ip (str): IP address of the robot.
+            frequency (float): RTDE sampling frequency in Hz.
+            variables (list): RTDE receive variables for the state sampler.
         """
         self.ip = robot_ip
+        self.frequency = frequency
+        self.variables = variables or DEFAULT_VARIABLES
 
         self.control = None
         self.receive = None
         self.io = None
+        self.sampler = None
 
         # Connect immediately
         self.connect()
@@ -51,9 +66,14 @@ class RobotInterface:
 
         try:
             self.control = rtde_control.RTDEControlInterface(self.ip)
-            self.receive = rtde_receive.RTDEReceiveInterface(self.ip)
+
+            # Only request the sampled variables plus what is_ready() needs
+            recipe = list(dict.fromkeys(self.variables + ['safety_status_bits']))
+            self.receive = rtde_receive.RTDEReceiveInterface(self.ip, self.frequency, recipe)
             self.io = rtde_io.RTDEIOInterface(self.ip)
 
+            self._start_sampler()
+
             print("Robot RTDE Connected.")
         except Exception as e:
             print(f"Connection Failed: {e}")
@@ -67,6 +87,8 @@ class RobotInterface:
 
         print("Re-initiating connection to robot.")
 
+        self._stop_sampler()
+
         # Disconnect existing connections
         try:
             if self.control:
@@ -117,7 +139,89 @@ class RobotInterface:
         except:
             return False
 
+    def _start_sampler(self):
+        """
+        Starts the background state sampler on the current receive interface.
+        """
+        self._stop_sampler()
+
+        self.sampler = RobotStateSampler(self.receive, self.variables, self.frequency)
+        self.sampler.start()
+
+    def _stop_sampler(self):
+        """
+        Stops the background state sampler if running.
+        """
+        if self.sampler:
+            self.sampler.stop()
+            self.sampler.join(timeout=1.0)
+            self.sampler = None
+
+    def get_state(self):
+        """
+        Returns the latest robot state snapshot without a round trip to the controller.
+
+        Returns:
+            RobotState | None: Latest immutable snapshot, None before the first sample.
+        """
+        return self.sampler.state if self.sampler else None
+
+    def get_tcp_pose(self) -> list:
+        """
+        Returns the latest TCP pose [x, y, z, rx, ry, rz] from the sampler,
+        falling back to a direct RTDE read when no snapshot is available.
+        """
+        state = self.get_state()
+
+        if state is None or state.tcp_pose is None:
+            return self.receive.getActualTCPPose()
+
+        return list(state.tcp_pose)
+
+    def get_tcp_pose_at(self, t: float) -> list | None:
+        """
+        Returns the TCP pose at a past time (monotonic seconds), interpolated from the sampler history.
+
+        Returns:
+            list | None: Pose [x, y, z, rx, ry, rz], or None if the history does not cover t.
+        """
+        if not self.sampler:
+            return None
+
+        history = self.sampler.history.since(t - 0.1)
+        columns = ['tcp_x', 'tcp_y', 'tcp_z', 'tcp_rx', 'tcp_ry', 'tcp_rz']
+
+        if len(history) < 2 or 'tcp_x' not in history.dtype.names or history['timestamp'][0] > t:
+            return None
+
+        return [float(np.interp(t, history['timestamp'], history[column])) for column in columns]
+
+    def stop(self, acc: float = 10.0, script: bool = False):
+        """
+        Decelerates the current linear motion to a stop.
+
+        Arguments:
+            acc (float): Deceleration in m/s^2.
+            script (bool): Also stop the control script, so every further motion command is
+                           rejected until restart_script().
+        """
+        self.control.stopL(acc)
+
+        if script:
+            self.control.stopScript()
+
+    def restart_script(self) -> bool:
+        """
+        Uploads and starts the control script again after stop(script=True).
+        """
+        if self.control.isProgramRunning():
+            return True
+
+        return self.control.reuploadScript()
+
     def disconnect(self):
+        self._stop_sampler()
+
         try:
             if self.control:
                 self.control.stopScript()
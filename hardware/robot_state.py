@@ -0,0 +1,126 @@
+import threading
+import time
+from typing import NamedTuple
+from utils.sample_buffer import SampleBuffer
+
+
+# RTDE receive variable -> (getter on RTDEReceiveInterface, state field, history column names)
+RTDE_VARIABLES = {
+    'timestamp': ('getTimestamp', 'robot_time', ['robot_time']),
+    'actual_TCP_pose': ('getActualTCPPose', 'tcp_pose', ['tcp_x', 'tcp_y', 'tcp_z', 'tcp_rx', 'tcp_ry', 'tcp_rz']),
+    'actual_TCP_speed': ('getActualTCPSpeed', 'tcp_speed', ['speed_x', 'speed_y', 'speed_z', 'speed_rx', 'speed_ry', 'speed_rz']),
+    'actual_TCP_force': ('getActualTCPForce', 'tcp_force', ['force_x', 'force_y', 'force_z', 'torque_x', 'torque_y', 'torque_z']),
+    'actual_q': ('getActualQ', 'joints', ['q0', 'q1', 'q2', 'q3', 'q4', 'q5']),
+}
+
+DEFAULT_VARIABLES = ['timestamp', 'actual_TCP_pose', 'actual_TCP_speed', 'actual_TCP_force']
+
+
+class RobotState(NamedTuple):
+    """
+    Immutable snapshot of the robot state at one RTDE cycle.
+    Fields of variables that are not sampled are None.
+    """
+    timestamp: float
+    robot_time: float | None = None
+    tcp_pose: tuple | None = None
+    tcp_speed: tuple | None = None
+    tcp_force: tuple | None = None
+    joints: tuple | None = None
+
+
+class RobotStateSampler(threading.Thread):
+    """
+    Threaded sampler reading a configured set of RTDE receive variables once per controller cycle.
+
+    The latest state is published as an immutable RobotState (a single reference swap, so readers
+    never see a partially updated state) and appended to a bounded history ring.
+
+    Arguments:
+        receive (RTDEReceiveInterface): Connected receive interface.
+        variables (list): RTDE variable names, see RTDE_VARIABLES.
+        frequency (float): Sampling frequency in Hz, 500 on e-Series and 125 on CB-Series.
+        history_len (int): Number of states kept in the history ring.
+
+    Attributes:
+        state (RobotState | None): Latest published snapshot.
+        history (SampleBuffer): Flattened state history, timestamped with time.monotonic().
+        missed_cycles (int): Cycles in which the sampler woke up too late.
+
+    Methods:
+        run(): Main threaded loop.
+        stop(): Stop the sampler.
+    """
+
+    def __init__(self, receive, variables: list = None, frequency: float = 500.0, history_len: int = 65536):
+        super().__init__(daemon=True)
+
+        self.receive = receive
+        self.variables = [v for v in (variables or DEFAULT_VARIABLES) if v in RTDE_VARIABLES]
+        self.period = 1.0 / frequency
+
+        columns = [name for v in self.variables for name in RTDE_VARIABLES[v][2]]
+        self.history = SampleBuffer(capacity=history_len, channels=columns)
+
+        self.state = None
+        self.missed_cycles = 0
+        self.running = True
+
+        # Resolve getters once instead of on every cycle
+        self._getters = [(getattr(receive, RTDE_VARIABLES[v][0]), RTDE_VARIABLES[v][1], RTDE_VARIABLES[v][2])
+                         for v in self.variables]
+
+    def run(self):
+        """
+        Main loop: samples at a fixed period and publishes new controller states.
+        Note: Runs at separate thread!
+        """
+
+        next_cycle = time.monotonic()
+        last_robot_time = None
+
+        while self.running:
+            try:
+                now = time.monotonic()
+                fields = {'timestamp': now}
+                row = {}
+
+                for getter, field, columns in self._getters:
+                    value = getter()
+
+                    if field == 'robot_time':
+                        fields[field] = value
+                        row[columns[0]] = value
+                    else:
+                        fields[field] = tuple(value)
+                        row.update(zip(columns, value))
+
+                # Only publish when the controller produced a new packet
+                robot_time = fields.get('robot_time')
+
+                if robot_time is None or robot_time != last_robot_time:
+                    last_robot_time = robot_time
+                    self.state = RobotState(**fields)
+                    self.history.append(now, row)
+
+            except Exception as e:
+                if self.running:
+                    print(f"Robot state sampler error: {e}")
+                    time.sleep(0.1)
+
+            # Fixed rate schedule, skip cycles instead of bursting after a stall
+            next_cycle += self.period
+            delay = next_cycle - time.monotonic()
+
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                self.missed_cycles += 1
+                next_cycle = time.monotonic()
+
+    def stop(self):
+        """
+        Stop the sampler thread.
+        """
+
+        self.running = False
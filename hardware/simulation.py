@@ -0,0 +1,590 @@
+"""
+Hardware stand-ins for offline runs: a kinematic UR model exposing the subset of the ur_rtde
+control/receive/io API used by the routines, and a pty based virtual Arduino streaming the same
+JSON or binary frames as the firmware, generated from a simple viscoelastic material model.
+"""
+
+import os
+import json
+import math
+import time
+import select
+import threading
+import numpy as np
+from hardware.robot import RobotInterface
+from hardware.protocol import encode_sample
+from utils.math_tools import _axis_angle_to_matrix
+
+DEFAULT_START_POSE = [0.3, -0.2, 0.3, 0.0, math.pi, 0.0]
+
+
+class _Segment:
+    """
+    Straight-line motion with a trapezoidal velocity profile (optionally starting at speed v0).
+    Positions and orientations are interpolated linearly over the same path parameter.
+    """
+
+    def __init__(self, start, end, speed: float, acc: float, t0: float, v0: float = 0.0):
+        self.start = np.asarray(start, dtype=float)
+        self.end = np.asarray(end, dtype=float)
+        self.t0 = t0
+
+        delta = self.end - self.start
+        length = float(np.linalg.norm(delta[:3]))
+
+        # Pure rotations are parameterised by the rotation vector distance (rad, rad/s)
+        if length < 1e-9:
+            length = float(np.linalg.norm(delta[3:]))
+
+        self.length = length
+        self.direction = delta / length if length > 1e-12 else np.zeros(6)
+
+        acc = max(acc, 1e-6)
+        speed = max(speed, v0, 1e-6)
+
+        # Deceleration from v0 alone would overshoot: brake harder
+        if v0 * v0 / (2 * acc) > length:
+            acc = v0 * v0 / (2 * max(length, 1e-12))
+
+        peak = math.sqrt((2 * acc * length + v0 * v0) / 2)
+        self.peak = max(min(speed, peak), v0)
+        self.acc = acc
+        self.v0 = v0
+
+        self.t_acc = (self.peak - v0) / acc
+        self.t_dec = self.peak / acc
+        d_acc = (v0 + self.peak) / 2 * self.t_acc
+        d_dec = self.peak / 2 * self.t_dec
+        self.t_cruise = max(0.0, (length - d_acc - d_dec) / self.peak) if self.peak > 0 else 0.0
+
+        self.duration = self.t_acc + self.t_cruise + self.t_dec
+
+    def sample(self, t: float) -> tuple:
+        """
+        Returns (pose, velocity, done) at absolute time t.
+        """
+        tau = t - self.t0
+
+        if tau >= self.duration or self.length <= 1e-12:
+            return self.end.copy(), np.zeros(6), True
+
+        tau = max(tau, 0.0)
+        a, v0, vp = self.acc, self.v0, self.peak
+
+        if tau < self.t_acc:
+            s = v0 * tau + 0.5 * a * tau * tau
+            v = v0 + a * tau
+        elif tau < self.t_acc + self.t_cruise:
+            s = (v0 + vp) / 2 * self.t_acc + vp * (tau - self.t_acc)
+            v = vp
+        else:
+            td = tau - self.t_acc - self.t_cruise
+            s = (v0 + vp) / 2 * self.t_acc + vp * self.t_cruise + vp * td - 0.5 * a * td * td
+            v = vp - a * td
+
+        s = min(s, self.length)
+
+        return self.start + self.direction * s, self.direction * v, False
+
+
+class SimulatedUR:
+    """
+    Kinematic model of a UR arm driven by time: the state is evaluated lazily from the active
+    motion (queued linear segments, servo target or speed command) whenever it is read.
+
+    Arguments:
+        start_pose (list): Initial TCP pose [x, y, z, rx, ry, rz].
+        frequency (float): Controller frequency in Hz, used for the RTDE timestamp.
+    """
+
+    def __init__(self, start_pose: list = None, frequency: float = 500.0):
+        self.period = 1.0 / frequency
+        self.lock = threading.RLock()
+
+        self.t_start = time.monotonic()
+        self.pose = np.asarray(start_pose or DEFAULT_START_POSE, dtype=float)
+        self.velocity = np.zeros(6)
+
+        self.segments = []
+        self.speed_command = None
+        self.async_active = False
+        self.teach = False
+
+        # Optional external force along the tool axis (N), e.g. from a material model
+        self.force_fn = None
+
+    def update(self, t: float = None):
+        """
+        Advances the kinematic state to time t (default: now).
+        """
+        t = time.monotonic() if t is None else t
+
+        with self.lock:
+            if self.speed_command is not None:
+                velocity, t_ref, pose_ref, duration = self.speed_command
+                elapsed = t - t_ref
+
+                # Commands with a duration hold position once it has elapsed
+                if duration is not None and elapsed >= duration:
+                    self.pose = pose_ref + velocity * duration
+                    self.velocity = np.zeros(6)
+                else:
+                    self.pose = pose_ref + velocity * elapsed
+                    self.velocity = velocity
+                return
+
+            while self.segments:
+                pose, velocity, done = self.segments[0].sample(t)
+                self.pose, self.velocity = pose, velocity
+
+                if not done:
+                    return
+
+                self.segments.pop(0)
+
+            self.velocity = np.zeros(6)
+            self.async_active = False
+
+    def plan(self, waypoints: list, speed: float, acc: float, t0: float = None):
+        """
+        Replaces the current motion by a sequence of linear segments starting at the current pose.
+        """
+        with self.lock:
+            self.update(t0)
+            self.speed_command = None
+
+            t = time.monotonic() if t0 is None else t0
+            start = self.pose.copy()
+            self.segments = []
+
+            # Each waypoint starts when the previous one ends (blending is not modelled)
+            for waypoint in waypoints:
+                pose = waypoint[:6]
+                v = waypoint[6] if len(waypoint) > 6 else speed
+                a = waypoint[7] if len(waypoint) > 7 else acc
+                segment = _Segment(start, pose, v, a, t)
+                self.segments.append(segment)
+
+                start = segment.end
+                t += segment.duration
+
+            return sum(segment.duration for segment in self.segments)
+
+    def stop(self, acc: float):
+        """
+        Decelerates along the current direction of motion and stops.
+        """
+        with self.lock:
+            self.update()
+            speed = float(np.linalg.norm(self.velocity[:3])) or float(np.linalg.norm(self.velocity[3:]))
+            self.speed_command = None
+
+            if speed < 1e-9:
+                self.segments = []
+                self.async_active = False
+                return
+
+            direction = self.velocity / speed
+            distance = speed * speed / (2 * acc)
+            end = self.pose + direction * distance
+            self.segments = [_Segment(self.pose, end, speed, acc, time.monotonic(), v0=speed)]
+
+    def tool_axis(self) -> np.ndarray:
+        """
+        Tool Z axis in the base frame.
+        """
+        return _axis_angle_to_matrix(*self.pose[3:]).dot([0.0, 0.0, 1.0])
+
+    def robot_time(self) -> float:
+        # Quantised to controller cycles, like the RTDE timestamp
+        return math.floor((time.monotonic() - self.t_start) / self.period) * self.period
+
+
+class SimulatedControl:
+    """
+    Subset of RTDEControlInterface backed by a SimulatedUR.
+    """
+
+    def __init__(self, model: SimulatedUR):
+        self.model = model
+
+        # Motion commands are rejected after stopScript() until reuploadScript()
+        self.running = True
+
+    def moveL(self, pose, speed: float = 0.25, acceleration: float = 1.2, asynchronous: bool = False):
+        if not self.running:
+            return False
+
+        # Either a single pose or a path of [x, y, z, rx, ry, rz, speed, acc, blend] waypoints
+        path = pose if len(pose) and isinstance(pose[0], (list, tuple, np.ndarray)) else [list(pose)]
+        self.model.plan(path, speed, acceleration)
+
+        if asynchronous:
+            self.model.async_active = True
+        else:
+            # Returns early when the motion is stopped from another thread
+            while self.model.segments:
+                time.sleep(self.model.period)
+                self.model.update()
+
+        return True
+
+    def getAsyncOperationProgress(self) -> int:
+        self.model.update()
+
+        with self.model.lock:
+            if not self.model.async_active:
+                return -1
+
+            return max(0, len(self.model.segments) - 1)
+
+    def stopL(self, a: float = 10.0, asynchronous: bool = False):
+        self.model.stop(a)
+
+        if not asynchronous:
+            while self.model.segments:
+                time.sleep(self.model.period)
+                self.model.update()
+
+        return True
+
+    def servoL(self, pose, speed: float = 0.0, acceleration: float = 0.0, dt: float = 0.002,
+               lookahead_time: float = 0.1, gain: int = 300):
+        if not self.running:
+            return False
+
+        # Track the target linearly over one servo period
+        with self.model.lock:
+            self.model.update()
+            current = self.model.pose.copy()
+            velocity = (np.asarray(pose, dtype=float) - current) / max(dt, 1e-6)
+            self.model.segments = []
+            self.model.speed_command = (velocity, time.monotonic(), current, dt)
+
+        return True
+
+    def speedL(self, xd, acceleration: float = 0.25, time_: float = 0.0):
+        if not self.running:
+            return False
+
+        with self.model.lock:
+            self.model.update()
+            self.model.segments = []
+            self.model.speed_command = (np.asarray(xd, dtype=float), time.monotonic(), self.model.pose.copy(),
+                                        time_ if time_ > 0 else None)
+
+        return True
+
+    def servoStop(self, a: float = 10.0):
+        return self.stopL(a)
+
+    def speedStop(self, a: float = 10.0):
+        return self.stopL(a)
+
+    def initPeriod(self):
+        return time.perf_counter()
+
+    def waitPeriod(self, t_start):
+        remaining = self.model.period - (time.perf_counter() - t_start)
+
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def stopScript(self):
+        with self.model.lock:
+            self.model.update()
+            self.model.segments = []
+            self.model.speed_command = None
+            self.model.async_active = False
+
+        self.running = False
+
+    def reuploadScript(self):
+        self.running = True
+        return True
+
+    def isProgramRunning(self) -> bool:
+        return self.running
+
+    def teachMode(self):
+        self.model.teach = True
+        return True
+
+    def endTeachMode(self):
+        self.model.teach = False
+        return True
+
+    def isConnected(self) -> bool:
+        return True
+
+    def disconnect(self):
+        pass
+
+
+class SimulatedReceive:
+    """
+    Subset of RTDEReceiveInterface backed by a SimulatedUR.
+    """
+
+    def __init__(self, model: SimulatedUR):
+        self.model = model
+
+    def getTimestamp(self) -> float:
+        return self.model.robot_time()
+
+    def getActualTCPPose(self) -> list:
+        self.model.update()
+        return self.model.pose.tolist()
+
+    def getActualTCPSpeed(self) -> list:
+        self.model.update()
+        return self.model.velocity.tolist()
+
+    def getActualTCPForce(self) -> list:
+        force = self.model.force_fn() if self.model.force_fn else 0.0
+        axis = self.model.tool_axis()
+
+        # Reaction opposes the tool approach direction
+        return list(-axis * force) + [0.0, 0.0, 0.0]
+
+    def getActualQ(self) -> list:
+        return [0.0] * 6
+
+    def getSafetyStatusBits(self) -> int:
+        return 1
+
+    def isConnected(self) -> bool:
+        return True
+
+    def disconnect(self):
+        pass
+
+
+class SimulatedIO:
+    """
+    Placeholder for RTDEIOInterface.
+    """
+
+    def disconnect(self):
+        pass
+
+
+class SimulatedRobotInterface(RobotInterface):
+    """
+    RobotInterface running against a SimulatedUR instead of a physical controller.
+
+    Arguments:
+        start_pose (list): Initial TCP pose.
+        frequency (float): Simulated controller frequency in Hz.
+        variables (list): RTDE receive variables for the state sampler.
+    """
+
+    def __init__(self, start_pose: list = None, frequency: float = 500.0, variables: list = None):
+        self.model = SimulatedUR(start_pose, frequency)
+        super().__init__("simulated", frequency, variables)
+
+    def connect(self):
+        self.control = SimulatedControl(self.model)
+        self.receive = SimulatedReceive(self.model)
+        self.io = SimulatedIO()
+
+        self._start_sampler()
+
+        print("Simulated robot connected.")
+
+
+class MaterialModel:
+    """
+    Viscoelastic specimen: Hertz-like elastic response plus one relaxing (Maxwell) branch.
+    The surface is a plane through surface_point with its normal along the approach direction.
+
+    Arguments:
+        model (SimulatedUR): Robot model providing the TCP position.
+        surface_offset_mm (float): Distance from the start pose to the surface along the tool axis.
+        stiffness (float): Elastic coefficient in N / mm^exponent.
+        exponent (float): Depth exponent (1.5 for a spherical indenter).
+        relax_stiffness (float): Coefficient of the relaxing branch.
+        relax_time (float): Relaxation time constant in seconds.
+        noise (float): Standard deviation of the additive sensor noise in N.
+    """
+
+    def __init__(self, model: SimulatedUR, surface_offset_mm: float = 5.0, stiffness: float = 0.5,
+                 exponent: float = 1.5, relax_stiffness: float = 0.3, relax_time: float = 2.0,
+                 noise: float = 0.002):
+        self.model = model
+        self.stiffness = stiffness
+        self.exponent = exponent
+        self.relax_stiffness = relax_stiffness
+        self.relax_time = relax_time
+        self.noise = noise
+
+        model.update()
+        self.normal = model.tool_axis()
+        self.surface_point = model.pose[:3] + self.normal * surface_offset_mm / 1000.0
+
+        self._rng = np.random.default_rng()
+        self._strain = 0.0
+        self._branch = 0.0
+        self._last_time = None
+        self._force = 0.0
+
+    def depth_mm(self) -> float:
+        self.model.update()
+        return max(0.0, float(np.dot(self.model.pose[:3] - self.surface_point, self.normal)) * 1000.0)
+
+    def sample(self) -> float:
+        """
+        Advances the material state to now and returns a noisy force reading.
+        """
+        now = time.monotonic()
+        strain = self.depth_mm() ** self.exponent
+
+        dt = 0.0 if self._last_time is None else now - self._last_time
+        self._last_time = now
+
+        # Maxwell branch: decays with the relaxation time, driven by strain increments
+        self._branch = self._branch * math.exp(-dt / self.relax_time) + self.relax_stiffness * (strain - self._strain)
+        self._strain = strain
+
+        self._force = max(0.0, self.stiffness * strain + self._branch)
+
+        return self._force + float(self._rng.normal(0.0, self.noise))
+
+    def force(self) -> float:
+        # Noise free force for the robot force/torque reading
+        return self._force
+
+
+class VirtualArduino(threading.Thread):
+    """
+    Virtual serial device on a pseudo terminal behaving like the force sensing firmware.
+    Supports the tare, cal and proto commands; ArduinoNode connects to it through port.
+
+    Arguments:
+        material (MaterialModel): Source of the force signal.
+        rate (float): Sample rate in Hz.
+        channel (str): Name of the streamed channel.
+    """
+
+    def __init__(self, material: MaterialModel, rate: float = 80.0, channel: str = 'force'):
+        super().__init__(daemon=True)
+
+        import pty
+        import tty
+
+        self.material = material
+        self.period = 1.0 / rate
+        self.channel = channel
+
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)
+        os.set_blocking(self.master, False)
+
+        self.port = os.ttyname(self.slave)
+
+        self.binary = False
+        self.offset = 0.0
+        self.scale = 1.0
+        self.sequence = 0
+        self.dropped = 0
+        self.running = True
+
+        self.tx_buffer = 4096
+
+        self._commands = bytearray()
+        self._pending = bytearray()
+        self._t0 = time.monotonic()
+
+    def _write(self, data: bytes, reliable: bool = False):
+        """
+        Queues data in a bounded transmit buffer, like the firmware's serial TX buffer.
+        Samples are dropped whole while the host is not reading, command replies never are.
+        """
+        if not reliable and len(self._pending) > self.tx_buffer:
+            self.dropped += 1
+        else:
+            self._pending += data
+
+        self._flush()
+
+    def _flush(self):
+        while self._pending:
+            try:
+                written = os.write(self.master, self._pending)
+            except BlockingIOError:
+                return
+
+            del self._pending[:written]
+
+    def _handle_commands(self):
+        readable, _, _ = select.select([self.master], [], [], 0)
+
+        if not readable:
+            return
+
+        try:
+            self._commands += os.read(self.master, 1024)
+        except (BlockingIOError, OSError):
+            return
+
+        while b'\n' in self._commands:
+            line, _, rest = bytes(self._commands).partition(b'\n')
+            self._commands = bytearray(rest)
+
+            action, _, value = line.decode('utf-8', errors='ignore').strip().partition(':')
+            action = action.lower()
+
+            try:
+                argument = float(value)
+            except ValueError:
+                continue
+
+            if action == 'tare':
+                self.offset = self.material.sample()
+            elif action == 'cal' and argument:
+                self.scale = 1.0
+            elif action == 'proto':
+                if int(argument) == 1:
+                    descriptor = {'proto': 'bin', 'ver': 1, 'channels': [self.channel], 'types': 'f'}
+                    self._write(b'\r\n' + json.dumps(descriptor, separators=(',', ':')).encode() + b'\r\n\x00',
+                                reliable=True)
+                    self.sequence = 0
+                    self.binary = True
+                else:
+                    self.binary = False
+
+    def run(self):
+        """
+        Main loop: streams samples at a fixed rate.
+        Note: Runs at separate thread!
+        """
+        next_sample = time.monotonic()
+
+        while self.running:
+            self._handle_commands()
+
+            timestamp = int((time.monotonic() - self._t0) * 1e6)
+            value = (self.material.sample() - self.offset) * self.scale
+
+            if self.binary:
+                self._write(encode_sample(self.sequence, timestamp, [value], 'f'))
+                self.sequence += 1
+            else:
+                self._write(f'{{"{self.channel}":{value:.3f}}}\r\n'.encode())
+
+            next_sample += self.period
+            delay = next_sample - time.monotonic()
+
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_sample = time.monotonic()
+
+    def stop(self):
+        self.running = False
+
+        if self.is_alive():
+            self.join()
+
+        os.close(self.master)
+        os.close(self.slave)
@@ -0,0 +1,351 @@
+"""
+Force-limit safety watchdog, independent of the running routine.
+
+Routines only look at the sensor when their own loop gets to it; during a blocking moveL nothing
+checks the force at all. The watchdog thread watches every new sample of the configured channels
+and stops the robot as soon as a limit is exceeded, whatever the routine is doing.
+
+Configured in the "watchdog" section of the sensor configuration file:
+
+    "watchdog": {
+      "action": "stopScript",
+      "deceleration": 5.0,
+      "limits": [
+        {"node": "force", "channel": "force", "max": 20.0, "min": -20.0, "max_rate": 200.0,
+         "rate_window": 0.01, "timeout": 0.5}
+      ]
+    }
+
+Limit entries:
+    node, channel (str): Sensor node and channel to watch.
+    max, min (float): Value limits (optional).
+    max_rate (float): Limit on the magnitude of the rate of change in units per second (optional),
+                      measured over rate_window seconds (default 0.01) to stay clear of sample noise.
+    timeout (float): Trip when the channel delivers no sample for this many seconds (optional).
+    rearm (float): After a reset, max/min are restored once the channel is this far back within
+                   them, so sensor noise at the limit does not trip again (optional, default 5% of the limit).
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime
+import numpy as np
+
+DEFAULT_TRIP_LOG = os.path.join("logs", "watchdog_trips.jsonl")
+
+# Default rearm margin as a fraction of the limit magnitude
+REARM_FRACTION = 0.05
+
+
+def load_watchdog_config(path: str) -> dict | None:
+    """
+    Reads the watchdog section of a sensor configuration file.
+
+    Returns:
+        dict | None: SafetyWatchdog keyword arguments, None if the file has no watchdog section.
+    """
+    with open(path) as handle:
+        config = json.load(handle).get('watchdog')
+
+    if not config:
+        return None
+
+    for limit in config.get('limits', []):
+        if 'node' not in limit or 'channel' not in limit:
+            raise ValueError(f"Watchdog limit in {path} needs a node and a channel.")
+
+        if not any(key in limit for key in ('max', 'min', 'max_rate', 'timeout')):
+            raise ValueError(f"Watchdog limit on '{limit['node']}.{limit['channel']}' in {path} sets no limit.")
+
+    if config.get('action', 'stopScript') not in ('stopL', 'stopScript'):
+        raise ValueError(f"Watchdog action in {path} must be 'stopL' or 'stopScript'.")
+
+    return config
+
+
+class SafetyWatchdog(threading.Thread):
+    """
+    Watches sensor channels at full rate and stops the robot when a limit is exceeded.
+
+    Every new sample is checked against the value limits and the rate-of-change limit, so short
+    peaks between polls are not missed. On a trip the robot is stopped with stopL from this thread,
+    with action 'stopScript' the control script is stopped as well, so the routine cannot command
+    any further motion. The watchdog then stays tripped (routines refuse to start) until reset().
+    Every trip is printed and appended as one JSON line to the trip log.
+
+    After a reset the robot is usually still loaded beyond the limit. Value limits are therefore
+    widened to the extreme reached since the trip, so the tool can be retracted but not pushed in
+    further, and restored once the channel is back within its configured limit by the rearm margin.
+
+    Arguments:
+        robot (RobotInterface): Robot to stop.
+        nodes (dict): Sensor nodes by name.
+        limits (list): Limit entries, see the module documentation.
+        action (str): 'stopL' or 'stopScript'. Default is 'stopScript'.
+        deceleration (float): stopL deceleration in m/s^2. Default is 5.
+        poll_interval (float): Time in seconds between buffer checks. Default is 0.0005.
+        trip_log (str): JSON lines file the trips are appended to.
+
+    Attributes:
+        tripped (threading.Event): Set from a trip until reset().
+        trips (list): Trip records of this session.
+        errors (int): Checks that failed with an exception.
+
+    Methods:
+        run(): Main threaded loop.
+        stop(): Stop watching.
+        reset(): Clear a trip and restart the control script.
+        status(): Short description of the state.
+    """
+
+    def __init__(self, robot, nodes: dict, limits: list, action: str = 'stopScript', deceleration: float = 5.0,
+                 poll_interval: float = 0.0005, trip_log: str = DEFAULT_TRIP_LOG):
+        super().__init__(daemon=True)
+
+        self.robot = robot
+        self.nodes = nodes
+        self.action = action
+        self.deceleration = deceleration
+        self.poll_interval = poll_interval
+        self.trip_log = trip_log
+
+        self.tripped = threading.Event()
+        self.trips = []
+        self.errors = 0
+
+        self._stop_event = threading.Event()
+        self._watches = []
+        self._trip_time = None
+        self._last_error = None
+
+        # Serialises checks with reset(), which rewrites the watch state
+        self._lock = threading.Lock()
+
+        for limit in limits:
+            if limit['node'] not in nodes:
+                raise ValueError(f"Watchdog: Arduino '{limit['node']}' not found.")
+
+            self._watches.append({
+                'limit': limit,
+                'index': nodes[limit['node']].samples.count,
+                'last_time': time.monotonic(),
+                # Value limits in effect, widened after a reset while still beyond the limit
+                'max': limit.get('max'),
+                'min': limit.get('min'),
+                # Samples of the last rate window, the reference of the rate of change
+                'tail': (np.empty(0), np.empty(0)),
+            })
+
+    def run(self):
+        """
+        Main loop: checks all new samples of every watched channel.
+        Note: Runs at separate thread!
+        """
+        while not self._stop_event.is_set():
+            try:
+                with self._lock:
+                    for watch in self._watches:
+                        violation = self._check(watch)
+
+                        if violation and not self.tripped.is_set():
+                            self._trip(watch['limit'], *violation)
+
+            except Exception as e:
+                # Keep watching, a dead thread would leave the robot unguarded
+                self.errors += 1
+
+                if str(e) != self._last_error:
+                    print(f"\nWatchdog error: {e}")
+                    self._last_error = str(e)
+
+            time.sleep(self.poll_interval)
+
+    def _check(self, watch: dict) -> tuple | None:
+        """
+        Returns:
+            tuple | None: (kind, value, limit, sample_time) of the first violation among the new samples.
+        """
+        limit = watch['limit']
+        buffer = self.nodes[limit['node']].samples
+        channel = limit['channel']
+
+        # A replaced buffer starts counting from zero again
+        if watch['index'] > buffer.count:
+            watch['index'] = buffer.count
+
+        new, watch['index'], _ = buffer.read_from(watch['index'])
+
+        if len(new) and channel in new.dtype.names:
+            valid = ~np.isnan(new[channel])
+            times, values = new['timestamp'][valid], new[channel][valid]
+        else:
+            times = values = np.empty(0)
+
+        if len(times) == 0:
+            silence = time.monotonic() - watch['last_time']
+
+            if 'timeout' in limit and silence > limit['timeout']:
+                return 'timeout', silence, limit['timeout'], watch['last_time']
+
+            return None
+
+        watch['last_time'] = float(times[-1])
+        violations = []
+
+        # A widened limit equals a value already seen since the trip and is compared strictly
+        if watch['max'] is not None:
+            widened = watch['max'] != limit['max']
+            hits = np.flatnonzero(values > watch['max'] if widened else values >= watch['max'])
+
+            if len(hits):
+                violations.append(('max', float(values[hits[0]]), watch['max'], float(times[hits[0]])))
+            elif widened and values[-1] < limit['max'] - self._rearm(limit, 'max'):
+                watch['max'] = limit['max']
+
+        if watch['min'] is not None:
+            widened = watch['min'] != limit['min']
+            hits = np.flatnonzero(values < watch['min'] if widened else values <= watch['min'])
+
+            if len(hits):
+                violations.append(('min', float(values[hits[0]]), watch['min'], float(times[hits[0]])))
+            elif widened and values[-1] > limit['min'] + self._rearm(limit, 'min'):
+                watch['min'] = limit['min']
+
+        if 'max_rate' in limit:
+            window = limit.get('rate_window', 0.01)
+            all_times = np.concatenate((watch['tail'][0], times))
+            all_values = np.concatenate((watch['tail'][1], values))
+            offset = len(all_times) - len(times)
+
+            # Rate of every new sample against the latest sample at least one window older
+            reference = np.searchsorted(all_times, times - window, side='right') - 1
+            usable = np.flatnonzero(reference >= 0)
+
+            if len(usable):
+                ref = reference[usable]
+                rate = ((all_values[offset + usable] - all_values[ref]) /
+                        (all_times[offset + usable] - all_times[ref]))
+                hits = np.flatnonzero(np.abs(rate) >= limit['max_rate'])
+
+                if len(hits):
+                    violations.append(('rate', float(rate[hits[0]]), limit['max_rate'],
+                                       float(times[usable[hits[0]]])))
+
+            keep = all_times >= all_times[-1] - 2 * window
+            watch['tail'] = (all_times[keep], all_values[keep])
+
+        return min(violations, key=lambda violation: violation[3]) if violations else None
+
+    @staticmethod
+    def _rearm(limit: dict, key: str) -> float:
+        return limit.get('rearm', REARM_FRACTION * abs(limit[key]))
+
+    def _trip(self, limit: dict, kind: str, value: float, threshold: float, sample_time: float):
+        """
+        Stops the robot and records the trip.
+        """
+        detected_time = time.monotonic()
+        error = None
+
+        try:
+            self.robot.stop(self.deceleration, script=self.action == 'stopScript')
+        except Exception as e:
+            error = str(e)
+
+        stopped_time = time.monotonic()
+        self._trip_time = sample_time
+        self.tripped.set()
+
+        try:
+            tcp_pose = self.robot.get_tcp_pose()
+        except Exception as e:
+            tcp_pose = None
+            error = error or str(e)
+
+        record = {
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'node': limit['node'],
+            'channel': limit['channel'],
+            'kind': kind,
+            'value': value,
+            'limit': threshold,
+            'action': self.action,
+            'detect_ms': (detected_time - sample_time) * 1000.0,
+            'stop_ms': (stopped_time - detected_time) * 1000.0,
+            'tcp_pose': tcp_pose,
+            'error': error,
+        }
+        self.trips.append(record)
+
+        print(f"\nSAFETY WATCHDOG TRIPPED: {limit['node']}.{limit['channel']} {kind} {value:.4f} "
+              f"(limit {threshold}), robot stopped {record['detect_ms']:.1f}ms after the sample "
+              f"({self.action}). Run 'watchdog reset' to continue.")
+
+        if error:
+            print(f"Watchdog stop error: {error}")
+
+        try:
+            os.makedirs(os.path.dirname(self.trip_log) or ".", exist_ok=True)
+
+            with open(self.trip_log, 'a') as handle:
+                handle.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Watchdog could not write {self.trip_log}: {e}")
+
+    def reset(self) -> bool:
+        """
+        Clears a trip. Samples that arrived while tripped are skipped, not checked again.
+
+        Returns:
+            bool: True if the control script is running again.
+        """
+        with self._lock:
+            self._reset_watches()
+            self.tripped.clear()
+
+        return bool(self.robot.restart_script())
+
+    def _reset_watches(self):
+        for watch in self._watches:
+            limit = watch['limit']
+            buffer = self.nodes[limit['node']].samples
+
+            # One snapshot for both the widened limits and the resume index, so no sample is
+            # included in the limits and then checked against them again
+            samples, watch['index'], _ = buffer.read_from(0)
+            watch['last_time'] = time.monotonic()
+            watch['tail'] = (np.empty(0), np.empty(0))
+
+            if self._trip_time is None or len(samples) == 0 or limit['channel'] not in samples.dtype.names:
+                continue
+
+            since = samples[samples['timestamp'] >= self._trip_time]
+            values = since[limit['channel']][~np.isnan(since[limit['channel']])]
+
+            if len(values) and watch['max'] is not None:
+                watch['max'] = max(limit['max'], float(values.max()))
+
+            if len(values) and watch['min'] is not None:
+                watch['min'] = min(limit['min'], float(values.min()))
+
+    def status(self) -> str:
+        limits = ", ".join(f"{limit['node']}.{limit['channel']} " +
+                           " ".join(f"{key}={limit[key]}" for key in ('max', 'min', 'max_rate', 'timeout')
+                                    if key in limit)
+                           for limit in (watch['limit'] for watch in self._watches))
+        if not self.is_alive():
+            state = "NOT RUNNING"
+        else:
+            state = "TRIPPED" if self.tripped.is_set() else "armed"
+
+        errors = f", {self.errors} errors" if self.errors else ""
+
+        return f"Watchdog {state} ({self.action}, {len(self.trips)} trips{errors}): {limits}"
+
+    def stop(self):
+        self._stop_event.set()
+
+        if self.is_alive():
+            self.join()
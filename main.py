@@ -1,26 +1,49 @@
+import sys
 import time
-from hardware.arduino import ArduinoNode
+from hardware.acquisition import AcquisitionManager, load_node_config, DEFAULT_CONFIG
 from hardware.robot import RobotInterface
+from hardware.watchdog import SafetyWatchdog, load_watchdog_config
 from routines.teach import TeachRoutine
 from routines.orient import OrientRoutine
 from routines.indent_continuous import ContinuousIndent
 from routines.zero import ZeroRoutine
 from routines.indent_discrete import DiscreteIndent
+from routines.surface_map import SurfaceMap
+from routines.indent_cyclic import CyclicIndent
+from routines.indent_force import ForceIndent
+from utils.recipe import RecipeRunner
 
 
 def main():
-    arduinos = {
-        "force": ArduinoNode(port="/dev/ttyACM0", baudrate=115200, queue_len=10, timeout=0.2)
-    }
+    # Offline mode: simulated robot and virtual Arduino (python main.py --sim)
+    simulate = "--sim" in sys.argv
+    virtual_devices = []
+
+    # Sensor nodes are defined in hardware/sensors.json (python main.py --config <file>)
+    config_path = sys.argv[sys.argv.index("--config") + 1] if "--config" in sys.argv[:-1] else DEFAULT_CONFIG
+    config = load_node_config(config_path)
+
+    if simulate:
+        from hardware.simulation import SimulatedRobotInterface, MaterialModel, VirtualArduino
+
+        robot = SimulatedRobotInterface()
+        material = MaterialModel(robot.model)
+        robot.model.force_fn = material.force
+
+        virtual_devices.append(VirtualArduino(material))
+        virtual_devices[0].start()
+        config["force"] = dict(config.get("force", {}), port=virtual_devices[0].port)
 
-    # Start Arduino Threads
-    for node in arduinos.values():
-        node.start()
+    # All Arduino nodes are served by one acquisition thread
+    acquisition = AcquisitionManager(config)
+    arduinos = acquisition.nodes
+    acquisition.start()
 
     # Setup Robot
     # Check the network controller mask -> Should be equal to the one on the UR controller!
     # Check utils/network_manager.py
-    robot = RobotInterface("192.168.100.1")
+    if not simulate:
+        robot = RobotInterface("192.168.100.1")
 
     # Instantiate routines with hardware references
     routines = {
@@ -28,9 +51,27 @@ def main():
         'orient': OrientRoutine(robot, arduinos),
         'indd': DiscreteIndent(robot, arduinos),
         'indc': ContinuousIndent(robot, arduinos),
-        'zero': ZeroRoutine(robot, arduinos)
+        'zero': ZeroRoutine(robot, arduinos),
+        'map': SurfaceMap(robot, arduinos),
+        'cyc': CyclicIndent(robot, arduinos),
+        'indf': ForceIndent(robot, arduinos)
     }
 
+    # Force limits are watched independently of the routines (watchdog section of the sensor configuration)
+    watchdog = None
+    watchdog_config = load_watchdog_config(config_path)
+
+    if watchdog_config:
+        watchdog = SafetyWatchdog(robot, arduinos, **watchdog_config)
+        watchdog.start()
+        print(watchdog.status())
+
+        for routine in routines.values():
+            routine.watchdog = watchdog
+
+    # Unattended experiment sequences built from the routines above
+    recipes = RecipeRunner(routines, arduinos)
+
     # Main logic loop
     try:
         while True:
@@ -39,13 +80,19 @@ def main():
             print("     tare <ard> <samples>")
             print("     cal  <ard> <known_weight>")
             print("     loop <ard> <var>")
+            print("     raw  <on|off>")
+            print("     recipe <file> [estimate|fresh]")
+            print("     watchdog [reset]")
             print(" ")
             print("     exit")
             print("     move")
             print("     orient <Rx> <Ry> <Rz> [acc] [vel]")
-            print("     zero <ard> <var> <thres> <step> <dist> [acc] [vel]")
-            print("     indd <ard> <var> <step> <dist> <settle>")
-            print("     indc <ard> <var> <dist> [acc] [vel]")
+            print("     zero <ard> <var> <thres> <step> <dist> [acc] [vel] [step|single] [refine_vel]")
+            print("     indd <ard> <var> <step> <dist> <settle> [fixed|auto] [slope] [std] [window] [n] [servo|moveL] [vel] [acc]")
+            print("     indc <ard> <var> <dist> [acc] [vel] [rate]")
+            print("     cyc  <ard> <var> [cycles] [max_mm] [min_mm] [force_limit] [vel] [acc] [rate] [dwell] [window]")
+            print("     indf <ard> <var> <target> [constant|ramp|trapezoid|profile.csv] [ramp_time] [hold_time] [kp] [ki] [max_vel] [max_mm] [force_max] [speed|servo] [thres] [approach_mm] [acc]")
+            print("     map  <ard> <var> <corners.json> [rows] [cols] [thres] [depth] [clearance] [approach_vel] [indent_vel] [travel_vel] [acc] [points.csv]")
 
             user_input = input("\nCommand > ").strip().split()
 
@@ -106,6 +153,42 @@ def main():
                     print("Usage: debug <arduino_name> <var_name>")
 
 
+            # Toggle full-rate raw recording for all routines
+            elif cmd == 'raw':
+                try:
+                    enabled = user_input[1].lower() == 'on'
+
+                    for routine in routines.values():
+                        routine.record_raw = enabled
+
+                    print(f"Raw recording {'enabled' if enabled else 'disabled'}.")
+                except IndexError:
+                    print("Usage: raw <on|off>")
+
+            # Run an experiment recipe, resuming from its checkpoint
+            elif cmd == 'recipe':
+                try:
+                    option = user_input[2].lower() if len(user_input) > 2 else ''
+                    recipes.run(user_input[1], fresh=option == 'fresh', estimate_only=option == 'estimate')
+                except IndexError:
+                    print("Usage: recipe <file> [estimate|fresh]")
+
+            # Safety watchdog state, reset after a trip
+            elif cmd == 'watchdog':
+                if not watchdog:
+                    print("No watchdog configured.")
+                elif len(user_input) > 1 and user_input[1].lower() == 'reset':
+                    if watchdog.reset():
+                        print("Watchdog reset, control script running.")
+                    else:
+                        print("Watchdog reset, but the control script could not be restarted.")
+                else:
+                    print(watchdog.status())
+
+                    for trip in watchdog.trips[-5:]:
+                        print(f"   {trip['time']}: {trip['node']}.{trip['channel']} {trip['kind']} "
+                              f"{trip['value']:.4f} (limit {trip['limit']}), {trip['detect_ms']:.1f}ms")
+
             # Execute a routine if registered
             elif cmd in routines:
                 try:
@@ -134,14 +217,18 @@ def main():
         print("\nClosing program.")
 
     finally:
-        # Stop Arduino Threads
-        for node in arduinos.values():
-            node.stop()
-            node.join()
+        if watchdog:
+            watchdog.stop()
+
+        # Stop Arduino acquisition
+        acquisition.stop()
 
         # Disconnect Robot
         robot.disconnect()
 
+        for device in virtual_devices:
+            device.stop()
+
         print("Program closed.")
 
 if __name__ == "__main__":
@@ -1,14 +1,16 @@
 import time
+import numpy as np
 from routines.routine_base import BaseRoutine
-from utils.math_tools import get_target_pose_along_tool_z
-from utils.logger import ExperimentLogger
+from utils.math_tools import get_target_pose_along_tool_z, distances_from_start
 from utils.live_plot import LivePlotter
+from utils.fusion import StreamFusion
+from utils.trajectory import move_duration
 
 
 class ContinuousIndent(BaseRoutine):
 
     def run_logic(self, arduino_name: str, var_name: str, total_dist_mm: float = 10, acc: float = 0.1,
-                  vel: float = 0.01):
+                  vel: float = 0.01, rate: float = 100.0):
         """
         Moves smoothly without stopping while measuring high-speed data.
 
@@ -18,18 +20,28 @@ class ContinuousIndent(BaseRoutine):
             total_dist_mm (float): Total distance to indent in mm. Default is 10mm.
             acc (float): Acceleration of movement in m/s^2. Default is 0.1
             vel (float): Speed of movement in m/s. Default is 0.01
+            rate (float): Rate in Hz of the time-aligned output records. Default is 100
         """
 
         arduino = self.arduinos.get(arduino_name)
 
         if not arduino:
             print(f"Error: Arduino '{arduino_name}' not found.")
-            return
+            return False
+
+        if var_name not in arduino.samples.channels:
+            print(f"Error: No '{var_name}' data from Arduino '{arduino_name}'.")
+            return False
+
+        if self.robot.sampler is None:
+            print("Error: Robot state sampler is not running.")
+            return False
 
         print(f"Starting Continuous Scan: {total_dist_mm}mm @ {vel}m/s")
 
-        logger = ExperimentLogger("Indent_Continuous")
-        logger.init_csv(["Timestamp", "Time_Delta", "TCP_X", "TCP_Y", "TCP_Z", "Distance", var_name])
+        logger = self.create_logger("Indent_Continuous", async_write=True)
+        logger.init_csv(["Timestamp", "Time_Delta", "TCP_X", "TCP_Y", "TCP_Z", "Distance", var_name,
+                         "Sensor_Gap", "Robot_Gap"])
 
         plotter = LivePlotter(
             title=f"Continuous Scan ({vel}m/s)",
@@ -38,47 +50,67 @@ class ContinuousIndent(BaseRoutine):
             legend_name="Sensor Data"
         )
 
-        start_pose = self.robot.receive.getActualTCPPose()
+        start_pose = self.robot.get_tcp_pose()
         target_pose = get_target_pose_along_tool_z(start_pose, total_dist_mm)
 
+        # Sensor and pose streams resampled onto one uniform time base
+        fusion = StreamFusion(arduino.samples, var_name, self.robot.sampler.history, rate=rate)
+
+        # Records carry monotonic time, logged as wall clock time
+        wall_offset = time.time() - time.monotonic()
+
         # 3. Async Move
         self.robot.control.moveL(target_pose, vel, 1.2, True)  # True = Async
 
-        start_time = time.time()
+        start_time = time.monotonic()
 
         try:
-            while self.robot.control.getAsyncOperationProgress() >= 0:
-                now = time.time()
-                elapsed = now - start_time
+            moving = True
+
+            while moving:
+                moving = self.robot.control.getAsyncOperationProgress() >= 0
 
-                # Get Data
-                tcp = self.robot.receive.getActualTCPPose()
+                # Wait for new samples, the output rate does not depend on this loop
+                time.sleep(0.02)
 
-                val = arduino.get_latest_value(var_name)
-                if val is None:
-                    val = 0.0
+                records = fusion.poll()
 
-                tcp = self.robot.receive.getActualTCPPose()
+                if len(records) == 0:
+                    continue
 
-                distance = ((tcp[0] - start_pose[0]) ** 2 +
-                            (tcp[1] - start_pose[1]) ** 2 +
-                            (tcp[2] - start_pose[2]) ** 2) ** 0.5
+                # Distance moved from start, vectorized over the chunk and transformed to mm
+                distance = distances_from_start(np.column_stack((records['tcp_x'], records['tcp_y'],
+                                                                 records['tcp_z'])), start_pose)
 
-                # Transform to mm
-                distance *= 1000.0
+                for record, dist in zip(records.tolist(), distance.tolist()):
+                    now, x, y, z, val, sensor_gap, robot_gap = record
 
-                # Log
-                logger.log_data([now, elapsed, tcp[0], tcp[1], tcp[2], distance, val])
+                    # Log
+                    logger.log_data([now + wall_offset, now - start_time, x, y, z, dist, val,
+                                     sensor_gap, robot_gap])
 
-                # Update Plot
-                plotter.update(distance, val)
+                # Update Plot, buffered per chunk and redrawn at the plotter frame rate
+                plotter.update(distance, records[var_name])
 
         except KeyboardInterrupt:
             print("Interrupted!")
+            self.interrupted = True
             self.robot.control.stopL()
 
+        if fusion.lost_samples:
+            print(f"Warning: {fusion.lost_samples} samples overwritten before fusion.")
+
         print("Returning to start...")
         self.robot.control.moveL(start_pose, 0.5, 0.5)
 
         plotter.save(logger.get_plot_path())
-        logger.close()
\ No newline at end of file
+        logger.close()
+
+    def estimate_duration(self, arduino_name: str, var_name: str, total_dist_mm: float = 10, acc: float = 0.1,
+                          vel: float = 0.01, rate: float = 100.0) -> float:
+        """
+        Indentation move and return to start.
+        """
+        distance = total_dist_mm / 1000.0
+
+        return move_duration(distance, vel, 1.2) + move_duration(distance, 0.5, 0.5)
@@ -0,0 +1,211 @@
+import os
+import csv
+import time
+from collections import deque
+import numpy as np
+from routines.routine_base import BaseRoutine
+from routines.zero import STOP_DECELERATION
+from utils.math_tools import get_target_pose_along_tool_z, rotation_matrix
+from utils.live_plot import LivePlotter
+from utils.fusion import StreamFusion
+from utils.contact import ContactMonitor
+from utils.cycles import CycleAccumulator, cycle_summary, SUMMARY_FIELDS
+from utils.trajectory import move_duration
+
+# Per cycle summaries, one row per finished cycle
+CYCLES_NAME = "cycles.csv"
+
+
+class CyclicIndent(BaseRoutine):
+
+    def run_logic(self, arduino_name: str, var_name: str, cycles: float = 100, max_mm: float = 1.0,
+                  min_mm: float = 0.0, force_limit: float = 0.0, vel: float = 0.005, acc: float = 0.5,
+                  rate: float = 100.0, dwell: float = 0.0, window: float = 100):
+        """
+        Loads and unloads repeatedly along Tool Z for fatigue and hysteresis tests.
+
+        Every cycle moves asynchronously from min_mm to max_mm below the start pose and back. With a
+        force_limit the loading move is stopped as soon as the sensor reaches it (max_mm remains the
+        travel limit). The time-aligned sensor/pose records are streamed to a compressed columnar
+        data file in chunks; in memory only the running cycle and the summaries of the last `window`
+        cycles are kept, so memory stays flat over any number of cycles. Every finished cycle is
+        appended to cycles.csv (peak force, hysteresis, stiffness, ...).
+
+        Arguments:
+            arduino_name (str): Name of the Arduino node to read sensor data from.
+            var_name (str): Name of the variable/sensor to monitor.
+            cycles (int): Number of load/unload cycles. Default is 100.
+            max_mm (float): Upper depth limit in mm below the start pose. Default is 1.
+            min_mm (float): Lower depth limit in mm below the start pose. Default is 0.
+            force_limit (float): Upper force limit, 0 to cycle between the depth limits only. Default is 0.
+            vel (float): Speed in m/s. Default is 0.005.
+            acc (float): Acceleration in m/s^2. Default is 0.5.
+            rate (float): Rate in Hz of the logged records. Default is 100.
+            dwell (float): Hold time in seconds at the upper limit. Default is 0.
+            window (int): Number of recent cycle summaries kept in memory for the rolling statistics. Default is 100.
+        """
+        arduino = self.arduinos.get(arduino_name)
+
+        if not arduino:
+            print(f"Error: Arduino '{arduino_name}' not found.")
+            return False
+
+        if var_name not in arduino.samples.channels:
+            print(f"Error: No '{var_name}' data from Arduino '{arduino_name}'.")
+            return False
+
+        if self.robot.sampler is None:
+            print("Error: Robot state sampler is not running.")
+            return False
+
+        cycles = int(cycles)
+        limit = f"{force_limit} {var_name}" if force_limit > 0 else f"{max_mm}mm"
+        print(f"Starting Cyclic Indent: {cycles} cycles between {min_mm}mm and {limit} @ {vel}m/s")
+
+        logger = self.create_logger("Indent_Cyclic", async_write=True, storage='columnar')
+        logger.init_csv(["Timestamp", "Cycle", "TCP_X", "TCP_Y", "TCP_Z", "Depth", var_name])
+
+        summary_file = open(os.path.join(logger.base_dir, CYCLES_NAME), 'w', newline='')
+        summary_writer = csv.writer(summary_file)
+        summary_writer.writerow(SUMMARY_FIELDS)
+
+        plotter = LivePlotter(
+            title=f"Cyclic Indent ({limit})",
+            x_label="Cycle",
+            y_label=f"Peak {var_name}",
+            legend_name="Peak Value",
+            marker='r.-',
+            process=True
+        )
+
+        start_pose = self.robot.get_tcp_pose()
+        axis = rotation_matrix(*start_pose[3:])[:, 2]
+        lower = get_target_pose_along_tool_z(start_pose, min_mm)
+        upper = get_target_pose_along_tool_z(start_pose, max_mm)
+
+        fusion = StreamFusion(arduino.samples, var_name, self.robot.sampler.history, rate=rate)
+        accumulator = CycleAccumulator(int(4 * rate * self.estimate_cycle(max_mm - min_mm, vel, acc, dwell)) + 64)
+        recent = deque(maxlen=int(window))
+
+        wall_offset = time.time() - time.monotonic()
+        state = {'cycle': 0, 'last_time': float('-inf')}
+
+        def consume():
+            """
+            Logs the new records and adds them to the running cycle.
+            """
+            records = fusion.poll()
+
+            if len(records) == 0:
+                return
+
+            positions = np.column_stack((records['tcp_x'], records['tcp_y'], records['tcp_z']))
+            depth = (positions - start_pose[:3]) @ axis * 1000.0
+
+            for (now, x, y, z, val, _, _), dist in zip(records.tolist(), depth.tolist()):
+                logger.log_data([now + wall_offset, state['cycle'], x, y, z, dist, val])
+
+            accumulator.add(records['timestamp'], depth, records[var_name])
+            state['last_time'] = float(records['timestamp'][-1])
+
+        def move(target: list, speed: float):
+            self.robot.control.moveL(target, speed, acc, True)  # True = Async
+
+            while self.robot.control.getAsyncOperationProgress() >= 0:
+                time.sleep(0.02)
+                consume()
+
+        monitor = None
+
+        try:
+            self.robot.control.moveL(lower, vel, acc)
+            accumulator.take(float('inf'))
+
+            for cycle in range(cycles):
+                state['cycle'] = cycle
+                t_start = time.monotonic()
+
+                # Loading, stopped by the monitor thread when a force limit is set
+                monitor = None
+
+                if force_limit > 0:
+                    monitor = ContactMonitor(arduino.samples, var_name, force_limit,
+                                             lambda: self.robot.control.stopL(STOP_DECELERATION))
+                    monitor.start()
+
+                move(upper, vel)
+
+                if monitor:
+                    monitor.stop()
+
+                hold_end = time.monotonic() + dwell
+
+                while time.monotonic() < hold_end:
+                    time.sleep(0.02)
+                    consume()
+
+                move(lower, vel)
+                t_end = time.monotonic()
+
+                # Records trail the robot by the fusion latency, wait until the cycle is covered
+                deadline = t_end + 0.5
+
+                while state['last_time'] < t_end and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                    consume()
+
+                timestamps, depth, force = accumulator.take(t_end)
+                summary = cycle_summary(depth, force)
+                summary.update(cycle=cycle, start_time=t_start + wall_offset, duration=t_end - t_start,
+                               samples=len(depth), limit_reached=int(bool(monitor and monitor.contact.is_set())))
+
+                summary_writer.writerow([summary[field] for field in SUMMARY_FIELDS])
+                summary_file.flush()
+
+                recent.append(summary)
+                plotter.update(cycle, summary['peak_force'])
+
+                peak = np.nanmean([item['peak_force'] for item in recent])
+                hysteresis = np.nanmean([item['hysteresis'] for item in recent])
+                stiffness = np.nanmean([item['stiffness'] for item in recent])
+
+                print(f"\r   Cycle {cycle + 1}/{cycles}: peak {summary['peak_force']:.3f}, "
+                      f"hysteresis {summary['hysteresis']:.4f}, stiffness {summary['stiffness']:.3f}/mm "
+                      f"(last {len(recent)}: {peak:.3f}, {hysteresis:.4f}, {stiffness:.3f})", end="", flush=True)
+
+        except KeyboardInterrupt:
+            print("\nInterrupted!")
+            self.interrupted = True
+            self.robot.control.stopL(STOP_DECELERATION)
+
+        finally:
+            # Overnight runs must not leak the files or the render process on any error
+            if monitor:
+                monitor.stop()
+
+            summary_file.close()
+            plotter.save(logger.get_plot_path())
+            plotter.close()
+            logger.close()
+
+        if fusion.lost_samples:
+            print(f"\nWarning: {fusion.lost_samples} samples overwritten before fusion.")
+
+        print("\nReturning to start...")
+        self.robot.control.moveL(start_pose, 0.5, 0.5)
+
+    @staticmethod
+    def estimate_cycle(range_mm: float, vel: float, acc: float, dwell: float) -> float:
+        """
+        Duration in seconds of one depth limited cycle.
+        """
+        return 2.0 * move_duration(range_mm / 1000.0, vel, acc) + dwell
+
+    def estimate_duration(self, arduino_name: str, var_name: str, cycles: float = 100, max_mm: float = 1.0,
+                          min_mm: float = 0.0, force_limit: float = 0.0, vel: float = 0.005, acc: float = 0.5,
+                          rate: float = 100.0, dwell: float = 0.0, window: float = 100) -> float:
+        """
+        Depth limited cycles (an upper bound with a force limit) and the moves to and from the range.
+        """
+        return (int(cycles) * self.estimate_cycle(max_mm - min_mm, vel, acc, dwell) +
+                move_duration(min_mm / 1000.0, vel, acc) + move_duration(min_mm / 1000.0, 0.5, 0.5))
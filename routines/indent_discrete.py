@@ -1,36 +1,72 @@
 import time
 from routines.routine_base import BaseRoutine
-from utils.math_tools import get_target_pose_along_tool_z
-from utils.logger import ExperimentLogger
+from utils.trajectory import plan_tool_z_steps, trapezoid_samples, stream_servo, move_duration
 from utils.live_plot import LivePlotter
+from utils.settle import SettleDetector
+from utils.relaxation import RelaxationStore, fit_sessions
 
 
 class DiscreteIndent(BaseRoutine):
 
     def run_logic(self, arduino_name: str, var_name: str, step_size_mm: float, total_dist_mm: float,
-                  settling_time: float):
+                  settling_time: float, settle_mode: str = 'fixed', slope_tol: float = 0.05,
+                  std_tol: float = 0.05, window: float = 0.3, avg_samples: float = 10, motion: str = 'servo',
+                  vel: float = 0.1, acc: float = 0.5):
         """
         Moves in steps, pauses, records data, and plots results.
 
+        In 'fixed' mode the routine waits settling_time after every step. In 'auto' mode it watches
+        the live sensor stream and continues as soon as the last window of samples is flat and
+        quiet; settling_time is then the timeout. The step value is the mean of avg_samples new
+        samples received after settling. The full hold phase waveform of every step is stored in
+        relaxation.col and fitted with a Prony series (relaxation_fit.csv) at the end.
+
+        The whole path is planned up front from the start pose. With motion 'servo' it runs as one
+        servo session: the profile of each step is streamed with servoL at the controller rate and
+        the robot servos on the step target while measuring, so no step pays a command round trip.
+        With 'moveL' every step is a separate blocking moveL.
+
         Arguments:
             arduino_name (str): Name of the Arduino node to read sensor data from.
             var_name (str): Name of the variable/sensor to monitor.
             step_size_mm (float): Step size in mm for each movement.
             total_dist_mm (float): Total distance to indent in mm.
-            settling_time (float): Time in seconds to wait after each movement before recording data.
+            settling_time (float): Time in seconds to wait after each movement (timeout in 'auto' mode).
+            settle_mode (str): 'fixed' or 'auto'. Default is 'fixed'.
+            slope_tol (float): Maximum slope in units/s of a settled signal ('auto' mode). Default is 0.05.
+            std_tol (float): Maximum residual std in units of a settled signal ('auto' mode). Default is 0.05.
+            window (float): Evaluated window in seconds ('auto' mode). Default is 0.3.
+            avg_samples (int): Number of new samples averaged per step. Default is 10.
+            motion (str): 'servo' or 'moveL'. Default is 'servo'.
+            vel (float): Speed of the steps in m/s. Default is 0.1.
+            acc (float): Acceleration of the steps in m/s^2. Default is 0.5.
         """
 
         arduino = self.arduinos.get(arduino_name)
 
         if not arduino:
             print(f"Error: Arduino '{arduino_name}' not found.")
-            return
+            return False
+
+        if settle_mode not in ('fixed', 'auto'):
+            print(f"Error: Unknown settle mode '{settle_mode}' (fixed or auto).")
+            return False
+
+        if motion not in ('moveL', 'servo'):
+            print(f"Error: Unknown motion '{motion}' (servo or moveL).")
+            return False
 
         steps = int(total_dist_mm / step_size_mm)
-        print(f"Starting Discrete Indent: {steps} steps of {step_size_mm}mm")
+        avg_samples = int(avg_samples)
+        print(f"Starting Discrete Indent: {steps} steps of {step_size_mm}mm ({settle_mode} settling)")
 
-        logger = ExperimentLogger("Indent_Discrete")
-        logger.init_csv(["Step", "Timestamp", "TCP_X", "TCP_Y", "TCP_Z", "Distance", var_name])
+        logger = self.create_logger("Indent_Discrete")
+        logger.init_csv(["Step", "Timestamp", "TCP_X", "TCP_Y", "TCP_Z", "Distance", var_name,
+                         "Settle_Time", "Settled"])
+
+        relaxation = RelaxationStore(logger.base_dir)
+        detector = SettleDetector(arduino.samples, var_name, window=window, slope_tol=slope_tol, std_tol=std_tol)
+        total_settle_time = 0.0
 
         plotter = LivePlotter(
             title=f"Discrete Indent ({total_dist_mm}mm)",
@@ -39,31 +75,50 @@ class DiscreteIndent(BaseRoutine):
             legend_name="Measured Value"
         )
 
-        start_pose = self.robot.receive.getActualTCPPose()
+        start_pose = self.robot.get_tcp_pose()
+
+        # Whole target sequence, and for servo motion the sampled path of every step
+        targets = plan_tool_z_steps(start_pose, step_size_mm, steps)
+        period = 1.0 / self.robot.frequency
+        profiles = []
+
+        if motion == 'servo':
+            previous = [start_pose] + targets[:-1].tolist()
+            profiles = [trapezoid_samples(previous[i], targets[i], vel, acc, period) for i in range(steps)]
 
         try:
             for i in range(steps):
-                current_pose = self.robot.receive.getActualTCPPose()
-                target = get_target_pose_along_tool_z(current_pose, step_size_mm)
-                self.robot.control.moveL(target, 0.1, 0.5)
+                if motion == 'servo':
+                    stream_servo(self.robot.control, profiles[i], period, stop=False)
+                else:
+                    self.robot.control.moveL(targets[i].tolist(), vel, acc)
+
+                # Hold phase starts when the move has finished
+                hold_index = arduino.samples.count
+                hold_start = time.monotonic()
 
-                time.sleep(settling_time)
+                if settle_mode == 'auto':
+                    settle = detector.wait(settling_time)
+                else:
+                    time.sleep(settling_time)
+                    settle = {'settled': True, 'settle_time': settling_time}
 
-                val = 0.0
+                total_settle_time += settle['settle_time']
 
-                for _ in range(10):  # Average over 10 samples
-                    received = arduino.get_latest_value(var_name)
+                # Average over distinct samples received after settling
+                val = arduino.get_mean_value_next(var_name, avg_samples)
 
-                    if received is not None:
-                        val += received
+                if val is None:
+                    print(f"   Step {i + 1}/{steps}: no new samples from '{arduino_name}'")
+                    val = float('nan')
 
-                    time.sleep(0.0001)
+                hold, _, _ = arduino.samples.read_from(hold_index)
 
-                    # Average
-                val /= 10.0
+                if len(hold) and var_name in hold.dtype.names:
+                    relaxation.add(i, hold['timestamp'], hold[var_name], hold_start)
 
                 # Get current TCP pose
-                tcp = self.robot.receive.getActualTCPPose()
+                tcp = self.robot.get_tcp_pose()
 
                 # Calculate distance moved from start
                 distance = ((tcp[0] - start_pose[0]) ** 2 +
@@ -73,17 +128,39 @@ class DiscreteIndent(BaseRoutine):
                 # Transform to mm
                 distance *= 1000.0
 
-                logger.log_data([i, time.time(), tcp[0], tcp[1], tcp[2], distance, val])
+                logger.log_data([i, time.time(), tcp[0], tcp[1], tcp[2], distance, val,
+                                 settle['settle_time'], int(settle['settled'])])
                 plotter.update(distance, val)  # Plot distance vs value
 
-                print(f"   Step {i + 1}/{steps}: {val}")
+                status = "" if settle['settled'] else " (timeout)"
+                print(f"   Step {i + 1}/{steps}: {val} [settled in {settle['settle_time']:.3f}s{status}]")
 
         except KeyboardInterrupt:
+            self.interrupted = True
             self.robot.stop()
             print("Interrupted!")
 
-        print("Discrete indentation complete. Returning...")
+        finally:
+            if motion == 'servo':
+                self.robot.control.servoStop()
+
+        print(f"Discrete indentation complete. Total settling time: {total_settle_time:.2f}s. Returning...")
         self.robot.control.moveL(start_pose, 0.5, 0.5)
 
         plotter.save(logger.get_plot_path())
-        logger.close()
\ No newline at end of file
+        logger.close()
+
+        relaxation.close()
+        fit_sessions([logger.base_dir])
+
+    def estimate_duration(self, arduino_name: str, var_name: str, step_size_mm: float, total_dist_mm: float,
+                          settling_time: float, settle_mode: str = 'fixed', slope_tol: float = 0.05,
+                          std_tol: float = 0.05, window: float = 0.3, avg_samples: float = 10, motion: str = 'servo',
+                          vel: float = 0.1, acc: float = 0.5) -> float:
+        """
+        Steps with their full settling time (the timeout in 'auto' mode, an upper bound) and return to start.
+        """
+        steps = int(total_dist_mm / step_size_mm)
+        step = move_duration(step_size_mm / 1000.0, vel, acc) + settling_time
+
+        return steps * step + move_duration(steps * step_size_mm / 1000.0, 0.5, 0.5)
@@ -0,0 +1,265 @@
+import gc
+import os
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+from routines.routine_base import BaseRoutine
+from routines.zero import approach_contact, STOP_DECELERATION
+from utils.math_tools import rotation_matrix
+from utils.force_control import PIController, force_profile, PROFILES
+from utils.scheduler import PeriodicScheduler
+from utils.trajectory import move_duration
+
+# Force control stops when the newest sensor sample is older than this (s)
+SENSOR_TIMEOUT = 0.1
+
+# servoL tracking, a short lookahead keeps the lag inside the force loop small
+SERVO_LOOKAHEAD = 0.03
+SERVO_GAIN = 300
+
+# Every n-th control cycle is kept for the plot
+PLOT_DECIMATION = 10
+
+# Garbage collection in the loop: the young generation is collected once this many objects are
+# pending and at least GC_SLACK seconds are left in the cycle
+GC_YOUNG = 700
+GC_SLACK = 0.001
+
+
+class ForceIndent(BaseRoutine):
+
+    def run_logic(self, arduino_name: str, var_name: str, target: float, profile: str = 'ramp',
+                  ramp_time: float = 1.0, hold_time: float = 10.0, kp: float = 0.005, ki: float = 0.02,
+                  max_vel: float = 0.005, max_mm: float = 5.0, force_max: float = 0.0, command: str = 'speed',
+                  threshold: float = 0.0, approach_mm: float = 10.0, acc: float = 0.5):
+        """
+        Force-controlled indentation along Tool Z (constant force, force ramps, creep tests).
+
+        A PI controller closes the loop from the sensor stream to streamed speedL (velocity) or
+        servoL (integrated position) commands at the RTDE rate. The loop runs on a fixed-period
+        scheduler with absolute deadlines; every cycle is logged with its release lateness and
+        busy time, and deadline misses are reported at the end. Force control stops early when
+        the sensor stalls, the force exceeds force_max or the travel exceeds max_mm.
+
+        Arguments:
+            arduino_name (str): Name of the Arduino node to read sensor data from.
+            var_name (str): Name of the variable/sensor to control.
+            target (float): Setpoint of the hold phase in sensor units.
+            profile (str): 'constant', 'ramp', 'trapezoid' or a CSV file of time, setpoint. Default is 'ramp'.
+            ramp_time (float): Ramp duration in seconds. Default is 1.
+            hold_time (float): Hold duration in seconds. Default is 10.
+            kp (float): Proportional gain in m/s per sensor unit. Default is 0.005.
+            ki (float): Integral gain in m/s per sensor unit and second. Default is 0.02.
+            max_vel (float): Velocity limit in m/s. Default is 0.005.
+            max_mm (float): Travel limit in mm from the start of force control. Default is 5.
+            force_max (float): Abort limit on the magnitude in sensor units, 0 for 1.5 times the largest
+                               setpoint magnitude. Default is 0.
+            command (str): 'speed' for speedL or 'servo' for servoL. Default is 'speed'.
+            threshold (float): Contact threshold of an approach before force control, 0 to start in place. Default is 0.
+            approach_mm (float): Maximum approach distance in mm. Default is 10.
+            acc (float): Acceleration in m/s^2. Default is 0.5.
+        """
+        arduino = self.arduinos.get(arduino_name)
+
+        if not arduino:
+            print(f"Error: Arduino '{arduino_name}' not found.")
+            return False
+
+        if command not in ('speed', 'servo'):
+            print(f"Error: Unknown command '{command}', use 'speed' or 'servo'.")
+            return False
+
+        try:
+            setpoints = force_profile(profile, target, ramp_time, hold_time)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            return False
+
+        if arduino.samples.latest(var_name) is None:
+            print(f"Error: No '{var_name}' data from Arduino '{arduino_name}'.")
+            return False
+
+        force_max = force_max if force_max != 0 else 1.5 * setpoints.peak
+
+        if force_max <= 0:
+            print(f"Error: Abort limit {force_max} is not positive, set force_max for this profile.")
+            return False
+        period = 1.0 / self.robot.frequency
+
+        print(f"Starting Force Indent: '{profile}' to {target} {var_name} over {setpoints.duration:.1f}s, "
+              f"{command}L @ {self.robot.frequency:.0f}Hz (kp {kp}, ki {ki}, max {max_vel}m/s)")
+
+        start_pose = self.robot.get_tcp_pose()
+
+        if threshold > 0:
+            try:
+                report = approach_contact(self.robot, arduino, var_name, threshold, approach_mm, acc, max_vel)
+            except KeyboardInterrupt:
+                print("Interrupted!")
+                self.interrupted = True
+                self.robot.control.moveL(start_pose, 0.5, 0.5)
+                return
+
+            if report is None:
+                print(f"No contact within {approach_mm}mm.")
+                self.robot.control.moveL(start_pose, 0.5, 0.5)
+                return False
+
+            print(f"   Contact at {report['value']:.3f} {var_name} after {report['travel_mm']:.2f}mm.")
+
+        logger = self.create_logger("Indent_Force", async_write=True, storage='columnar')
+        logger.init_csv(["Timestamp", "Time", "Setpoint", var_name, "Error", "Command_Vel", "Depth",
+                         "Sample_Age", "Lateness", "Busy"])
+
+        loop_pose = np.asarray(self.robot.get_tcp_pose())
+        axis = rotation_matrix(*loop_pose[3:])[:, 2]
+        servo_target = loop_pose.copy()
+
+        controller = PIController(kp, ki, max_vel)
+        scheduler = PeriodicScheduler(period)
+
+        index = arduino.samples.count
+        force = arduino.samples.latest(var_name)
+        sample_time = arduino.samples.latest('timestamp')
+
+        wall_offset = time.time() - time.monotonic()
+        curve = []
+        squared_error = 0.0
+        abort = None
+
+        # Automatic collections would show up as deadline misses: the existing heap is frozen and
+        # the loop collects the young generation in slack time only, older ones after the loop
+        gc.freeze()
+        gc.disable()
+
+        try:
+            release = scheduler.start()
+            t0 = previous = release
+
+            while True:
+                t = release - t0
+
+                if t > setpoints.duration:
+                    break
+
+                new, index, _ = arduino.samples.read_from(index)
+
+                if len(new) and var_name in new.dtype.names:
+                    valid = np.flatnonzero(~np.isnan(new[var_name]))
+
+                    if len(valid):
+                        force = float(new[var_name][valid[-1]])
+                        sample_time = float(new['timestamp'][valid[-1]])
+
+                pose = self.robot.get_tcp_pose()
+                depth = float(np.dot(np.subtract(pose[:3], loop_pose[:3]), axis)) * 1000.0
+                age = release - sample_time
+
+                if age > SENSOR_TIMEOUT:
+                    abort = f"no sensor data for {age * 1000.0:.0f}ms"
+                elif abs(force) > force_max:
+                    abort = f"{var_name} {force:.3f} beyond the limit ±{force_max:.3f}"
+                elif depth > max_mm:
+                    abort = f"travel {depth:.2f}mm beyond the limit {max_mm}mm"
+
+                if abort:
+                    break
+
+                setpoint = setpoints.value(t)
+                error = setpoint - force
+                dt = release - previous if release > previous else period
+                vel = controller.update(error, dt)
+
+                if command == 'servo':
+                    servo_target[:3] += axis * vel * dt
+                    self.robot.control.servoL(servo_target.tolist(), 0.0, 0.0, period, SERVO_LOOKAHEAD,
+                                              SERVO_GAIN)
+                else:
+                    self.robot.control.speedL([*(axis * vel), 0.0, 0.0, 0.0], acc, 0.0)
+
+                logger.log_data([release + wall_offset, t, setpoint, force, error, vel, depth, age,
+                                 scheduler.lateness, scheduler.busy])
+
+                squared_error += error * error
+
+                if scheduler.iterations % PLOT_DECIMATION == 0:
+                    curve.append((t, setpoint, force, depth))
+
+                if gc.get_count()[0] >= GC_YOUNG and scheduler.remaining() > GC_SLACK:
+                    gc.collect(0)
+
+                previous = release
+                release = scheduler.wait()
+
+        except KeyboardInterrupt:
+            print("\nInterrupted!")
+            self.interrupted = True
+
+        finally:
+            gc.unfreeze()
+            gc.enable()
+
+            if command == 'servo':
+                self.robot.control.servoStop(STOP_DECELERATION)
+            else:
+                self.robot.control.speedStop(STOP_DECELERATION)
+
+        if abort:
+            print(f"Force control stopped: {abort}.")
+
+        # Kept for benchmarks and callers comparing loop timing between runs
+        stats = self.loop_stats = scheduler.stats()
+        rms = (squared_error / max(stats['iterations'], 1)) ** 0.5
+
+        print(f"Loop: {stats['iterations']} cycles, {stats['misses']} deadline misses "
+              f"({100.0 * stats['miss_rate']:.2f}%, {stats['skipped']} periods skipped), "
+              f"lateness p99 {stats['lateness_p99_ms']:.3f}ms / max {stats['lateness_max_ms']:.3f}ms, "
+              f"busy p99 {stats['busy_p99_ms']:.3f}ms of {period * 1000.0:.1f}ms")
+        print(f"Tracking: RMS error {rms:.4f} {var_name}, final depth {curve[-1][3] if curve else 0.0:.3f}mm")
+
+        print("Returning to start...")
+        self.robot.control.moveL(start_pose, 0.5, 0.5)
+
+        logger.close()
+        self._save_plot(logger.get_plot_path(), np.asarray(curve).reshape(-1, 4), var_name)
+
+        if abort:
+            return False
+
+    @staticmethod
+    def _save_plot(path: str, curve: np.ndarray, var_name: str):
+        fig, (ax_force, ax_depth) = plt.subplots(2, 1, sharex=True)
+
+        ax_force.plot(curve[:, 0], curve[:, 1], 'k--', label="Setpoint")
+        ax_force.plot(curve[:, 0], curve[:, 2], 'b-', label=var_name)
+        ax_force.set_ylabel(var_name)
+        ax_force.legend()
+        ax_force.set_title("Force Indent")
+
+        ax_depth.plot(curve[:, 0], curve[:, 3], 'r-')
+        ax_depth.set_xlabel("Time (s)")
+        ax_depth.set_ylabel("Depth (mm)")
+
+        fig.savefig(path)
+        plt.close(fig)
+
+        print(f"Plot saved to: {path}")
+
+    def estimate_duration(self, arduino_name: str, var_name: str, target: float, profile: str = 'ramp',
+                          ramp_time: float = 1.0, hold_time: float = 10.0, kp: float = 0.005, ki: float = 0.02,
+                          max_vel: float = 0.005, max_mm: float = 5.0, force_max: float = 0.0,
+                          command: str = 'speed', threshold: float = 0.0, approach_mm: float = 10.0,
+                          acc: float = 0.5) -> float | None:
+        """
+        Profile duration plus an approach over the full distance and the return.
+        """
+        if profile not in PROFILES and not os.path.exists(profile):
+            return None
+
+        duration = force_profile(profile, target, ramp_time, hold_time).duration
+
+        if threshold > 0:
+            duration += move_duration(approach_mm / 1000.0, max_vel, acc)
+
+        return duration + move_duration((approach_mm if threshold > 0 else 0.0) / 1000.0 + max_mm / 1000.0,
+                                        0.5, 0.5)
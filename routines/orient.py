@@ -17,7 +17,7 @@ class OrientRoutine(BaseRoutine):
         print(f"Rotating TCP to: [{rx:.2f}, {ry:.2f}, {rz:.2f}]")
 
         # Get current pose [x, y, z, rx, ry, rz]
-        current_pose = self.robot.receive.getActualTCPPose()
+        current_pose = self.robot.get_tcp_pose()
 
         # Construct new pose
         target_pose = current_pose[:3] + [rx, ry, rz]
@@ -29,4 +29,5 @@ class OrientRoutine(BaseRoutine):
 
         except Exception as e:
             print("Target pose orientation may be unreachable.")
-            print(f"Error during orientation: {e}")
\ No newline at end of file
+            print(f"Error during orientation: {e}")
+            return False
\ No newline at end of file
@@ -1,3 +1,7 @@
+from utils.logger import ExperimentLogger
+from utils.raw_recorder import RawRecorder
+
+
 class BaseRoutine:
 
     def __init__(self, robot, arduinos):
@@ -9,22 +13,89 @@ class BaseRoutine:
         Attributes:
             robot: The robot interface for controlling the robot.
             arduinos: A dictionary of ArduinoNode instances for sensor data.
+            record_raw (bool): Record every sensor and robot state sample to the session directory.
+            interrupted (bool): Set by the routine when the last execution was interrupted by the user.
+            watchdog (SafetyWatchdog | None): Safety watchdog, routines do not start while it is tripped or not running.
         """
         self.robot = robot
         self.arduinos = arduinos
 
-    def execute(self, *args):
+        self.record_raw = False
+        self.recorder = None
+        self.interrupted = False
+        self.watchdog = None
+
+    def execute(self, *args) -> bool:
+        """
+        Runs the routine once the robot is ready.
+
+        Returns:
+            bool: True if the routine ran to completion (not failed, not interrupted).
+        """
         if not self.ready():
             # Robot is not ready, skip execution
-            return
+            return False
+
+        self.interrupted = False
 
         try:
-            self.run_logic(*args)
+            result = self.run_logic(*args)
         except Exception as e:
             print(f"Error during routine execution: {e}")
             self.robot.reconnect()
+            return False
+        finally:
+            self._stop_recorder()
+
+        # Routines return False when they could not complete
+        return result is not False and not self.interrupted
+
+    def estimate_duration(self, *args) -> float | None:
+        """
+        Expected duration in seconds of run_logic(*args), None if it cannot be estimated.
+        """
+        return None
+
+    def create_logger(self, routine_name: str, **kwargs) -> ExperimentLogger:
+        """
+        Creates the session logger and, if enabled, starts full-rate raw recording into its directory.
+
+        Arguments:
+            routine_name (str): Name of the experiment routine.
+            **kwargs: Passed on to ExperimentLogger.
+
+        Returns:
+            ExperimentLogger: The session logger.
+        """
+        logger = ExperimentLogger(routine_name, **kwargs)
+
+        if self.record_raw:
+            self._stop_recorder()
+
+            sources = {f"arduino_{name}": node.samples for name, node in self.arduinos.items()}
+
+            if self.robot.sampler:
+                sources['robot'] = self.robot.sampler.history
+
+            self.recorder = RawRecorder(logger.base_dir, sources)
+            self.recorder.start()
+
+        return logger
+
+    def _stop_recorder(self):
+        if self.recorder:
+            self.recorder.stop()
+            self.recorder = None
 
     def ready(self):
+        if self.watchdog and not self.watchdog.is_alive():
+            print("Safety watchdog is not running. Restart the program before running routines.")
+            return False
+
+        if self.watchdog and self.watchdog.tripped.is_set():
+            print("Safety watchdog is tripped. Check the specimen and run 'watchdog reset'.")
+            return False
+
         while not self.robot.is_ready():
             print("\nROBOT STATUS NOT READY")
             print("   1. Check the Teach Pendant.")
@@ -0,0 +1,271 @@
+import os
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+from routines.routine_base import BaseRoutine
+from routines.zero import approach_contact, STOP_DECELERATION
+from utils.math_tools import get_target_pose_along_tool_z
+from utils.columnar import ColumnarWriter
+from utils.surface import (load_corners, save_corners, plane_from_corners, grid_points, plane_poses, visit_order,
+                           path_length, SurfaceModel)
+from utils.trajectory import move_duration
+
+# Indentation curves of all points, columns point, depth (mm), value
+CURVES_NAME = "curves.col"
+
+CORNER_NAMES = ["origin", "end of the first row (u)", "end of the first column (v)"]
+
+
+class SurfaceMap(BaseRoutine):
+
+    def run_logic(self, arduino_name: str, var_name: str, corners_file: str, rows: float = 5, cols: float = 5,
+                  threshold: float = 0.05, depth_mm: float = 1.0, clearance_mm: float = 3.0,
+                  approach_vel: float = 0.01, indent_vel: float = 0.005, travel_vel: float = 0.1,
+                  acc: float = 0.5, points_file: str = ''):
+        """
+        Indents a grid (or list) of points in a plane defined by three taught corners.
+
+        At every point the robot travels at clearance_mm above the expected surface, approaches
+        until contact (monitored single move), indents depth_mm from the contact while the sensor
+        waveform is recorded, and retracts. Points are visited along a short path (serpentine on
+        grids), retract and travel are sent as one blended move, and the expected surface height of
+        each point is predicted from the contacts found so far, so the approach stays short on
+        tilted or curved samples.
+
+        Results go to one dataset in the session directory: data.csv with one row per point
+        (grid index, plane coordinates, contact position, surface offset, stiffness and the time
+        spent per phase) and curves.col with the indentation curve of every point.
+
+        Arguments:
+            arduino_name (str): Name of the Arduino node to read sensor data from.
+            var_name (str): Name of the variable/sensor to monitor.
+            corners_file (str): JSON file with the taught corners, taught interactively if it does not exist.
+            rows (int): Grid rows (along v). Default is 5.
+            cols (int): Grid columns (along u). Default is 5.
+            threshold (float): Contact threshold. Default is 0.05.
+            depth_mm (float): Indentation depth after contact in mm. Default is 1.
+            clearance_mm (float): Travel height above the expected surface in mm. Default is 3.
+            approach_vel (float): Approach speed in m/s. Default is 0.01.
+            indent_vel (float): Indentation speed in m/s. Default is 0.005.
+            travel_vel (float): Travel speed in m/s. Default is 0.1.
+            acc (float): Acceleration in m/s^2. Default is 0.5.
+            points_file (str): Optional CSV of u_mm, v_mm plane coordinates used instead of the grid.
+        """
+        arduino = self.arduinos.get(arduino_name)
+
+        if not arduino:
+            print(f"Error: Arduino '{arduino_name}' not found.")
+            return False
+
+        if not os.path.exists(corners_file) and not self._teach_corners(corners_file):
+            return False
+
+        plane = plane_from_corners(load_corners(corners_file))
+        axis = plane['axis']
+
+        if points_file:
+            uv = np.loadtxt(points_file, delimiter=',', ndmin=2)[:, :2]
+            points = np.column_stack((np.full(len(uv), -1), np.arange(len(uv)), uv))
+        else:
+            points = grid_points(plane['size_mm'], int(rows), int(cols))
+
+        uv = points[:, 2:]
+        surface = plane_poses(plane, uv)
+
+        # Start at the point closest to the robot and keep the travel short
+        start_pose = self.robot.get_tcp_pose()
+        start = int(np.argmin(np.linalg.norm(surface[:, :3] - start_pose[:3], axis=1)))
+        order = visit_order(uv, start)
+
+        print(f"Surface Map: {len(points)} points over {plane['size_mm'][0]:.1f} x {plane['size_mm'][1]:.1f}mm, "
+              f"travel {path_length(uv, order):.0f}mm (row by row {path_length(uv, np.arange(len(uv))):.0f}mm)")
+
+        logger = self.create_logger("Surface_Map")
+        logger.init_csv(["Point", "Row", "Col", "U_mm", "V_mm", "TCP_X", "TCP_Y", "TCP_Z", "Surface_Offset",
+                         "Contact_Value", "Max_Value", "Stiffness", "Travel_Time", "Approach_Time", "Indent_Time",
+                         "Point_Time"])
+        curves = ColumnarWriter(os.path.join(logger.base_dir, CURVES_NAME), ['point', 'depth', 'value'],
+                                dtypes=['i8', 'f8', 'f8'])
+
+        model = SurfaceModel()
+        results = np.full(len(points), np.nan)
+        timing = []
+
+        # Leave the surface before the first travel
+        retract = get_target_pose_along_tool_z(start_pose, -clearance_mm)
+        map_start = time.monotonic()
+
+        try:
+            for n, k in enumerate(order):
+                t_start = time.monotonic()
+                u, v = uv[k]
+                location = [int(k), int(points[k, 0]), int(points[k, 1]), float(u), float(v)]
+
+                hover = plane_poses(plane, uv[k], model.predict(u, v) - clearance_mm)[0].tolist()
+                self._travel(retract, hover, travel_vel, acc)
+                t_travel = time.monotonic()
+
+                report = approach_contact(self.robot, arduino, var_name, threshold, 2.0 * clearance_mm, acc,
+                                          approach_vel)
+                t_approach = time.monotonic()
+
+                if report is None:
+                    print(f"   Point {n + 1}/{len(points)}: no contact within {2.0 * clearance_mm}mm")
+                    logger.log_data(location + hover[:3] + [float('nan')] * 4 +
+                                    [t_travel - t_start, t_approach - t_travel, 0.0, t_approach - t_start])
+                    retract = hover
+                    continue
+
+                contact = report['contact_pose']
+                offset = float(np.dot(np.asarray(contact[:3]) - surface[k, :3], axis)) * 1000.0
+                model.add(u, v, offset)
+
+                # Indentation from the contact, sensor samples are mapped onto depth by the pose history
+                index = arduino.samples.count
+                self.robot.control.moveL(get_target_pose_along_tool_z(contact, depth_mm), indent_vel, acc)
+                t_indent = time.monotonic()
+
+                depth, values = self._indent_curve(arduino, var_name, index, contact, axis, t_approach)
+                stiffness = float('nan')
+
+                if len(values):
+                    curves.write_columns({'point': np.full(len(values), k), 'depth': depth, 'value': values})
+
+                    loaded = depth > 0.0
+
+                    if loaded.sum() > 2:
+                        stiffness = float(np.polyfit(depth[loaded], values[loaded], 1)[0])
+
+                results[k] = stiffness
+                retract = get_target_pose_along_tool_z(contact, -clearance_mm)
+                timing.append((t_travel - t_start, t_approach - t_travel, t_indent - t_approach))
+
+                logger.log_data(location + [*contact[:3], offset, report['value'],
+                                 float(values.max()) if len(values) else float('nan'), stiffness,
+                                 *timing[-1], t_indent - t_start])
+
+                print(f"   Point {n + 1}/{len(points)} (u {u:.1f}, v {v:.1f}mm): offset {offset:+.3f}mm, "
+                      f"stiffness {stiffness:.4f}/mm, {t_indent - t_start:.2f}s")
+
+        except KeyboardInterrupt:
+            print("Interrupted!")
+            self.interrupted = True
+            self.robot.control.stopL(STOP_DECELERATION)
+
+            # The tool may be in the sample, leave it along Tool Z before any sideways travel
+            self.robot.control.moveL(get_target_pose_along_tool_z(self.robot.get_tcp_pose(), -clearance_mm),
+                                     approach_vel, acc)
+
+        finally:
+            curves.close()
+            logger.close()
+
+        self.robot.control.moveL(retract, travel_vel, acc)
+
+        self._save_map(logger.get_plot_path(), uv, results, var_name)
+
+        if timing:
+            travel, approach, indent = np.mean(timing, axis=0)
+            per_point = (time.monotonic() - map_start) / len(timing)
+            print(f"Surface map complete: {len(timing)}/{len(points)} points, {per_point:.2f}s per point "
+                  f"(travel {travel:.2f}s, approach {approach:.2f}s, indent {indent:.2f}s, "
+                  f"overhead {per_point - indent:.2f}s). A 20x20 map takes ~{400 * per_point / 60:.0f} min.")
+
+    def _teach_corners(self, path: str) -> bool:
+        """
+        Teaches the three map corners in freedrive and stores them.
+        """
+        corners = []
+
+        print(f"Teaching map corners for {path}.")
+
+        for name in CORNER_NAMES:
+            try:
+                self.robot.control.teachMode()
+                answer = input(f"   Move the tool onto the {name} corner and press [ENTER] ('x' to cancel): ")
+            finally:
+                self.robot.control.endTeachMode()
+
+            if answer.lower() == 'x':
+                return False
+
+            corners.append(self.robot.get_tcp_pose())
+
+        save_corners(path, corners)
+        print(f"Corners saved to: {path}")
+
+        return True
+
+    def _travel(self, retract: list, hover: list, vel: float, acc: float):
+        """
+        Retract and travel to the next hover pose as one blended move.
+        """
+        current = self.robot.get_tcp_pose()
+        first = np.linalg.norm(np.subtract(retract[:3], current[:3]))
+        second = np.linalg.norm(np.subtract(hover[:3], retract[:3]))
+
+        # The blend radius must stay below half of both segments
+        blend = 0.45 * min(first, second)
+
+        self.robot.control.moveL([list(retract) + [vel, acc, blend], list(hover) + [vel, acc, 0.0]])
+
+    def _indent_curve(self, arduino, var_name: str, index: int, contact: list, axis: np.ndarray,
+                      t0: float) -> tuple:
+        """
+        Sensor samples since index with their indentation depth in mm, from the robot pose history.
+        """
+        samples, _, _ = arduino.samples.read_from(index)
+        history = self.robot.sampler.history.since(t0 - 0.05)
+
+        if len(samples) == 0 or var_name not in samples.dtype.names or len(history) < 2:
+            return np.empty(0), np.empty(0)
+
+        positions = np.column_stack((history['tcp_x'], history['tcp_y'], history['tcp_z']))
+        depth = (positions - np.asarray(contact[:3])) @ axis * 1000.0
+
+        valid = ~np.isnan(samples[var_name])
+
+        return (np.interp(samples['timestamp'][valid], history['timestamp'], depth),
+                samples[var_name][valid])
+
+    @staticmethod
+    def _save_map(path: str, uv: np.ndarray, values: np.ndarray, var_name: str):
+        fig, ax = plt.subplots()
+        scatter = ax.scatter(uv[:, 0], uv[:, 1], c=values, cmap='viridis', s=80, marker='s')
+        fig.colorbar(scatter, ax=ax, label=f"Stiffness ({var_name}/mm)")
+
+        ax.set_xlabel("u (mm)")
+        ax.set_ylabel("v (mm)")
+        ax.set_aspect('equal')
+        ax.set_title("Surface Map")
+
+        fig.savefig(path)
+        plt.close(fig)
+
+        print(f"Map saved to: {path}")
+
+    def estimate_duration(self, arduino_name: str, var_name: str, corners_file: str, rows: float = 5,
+                          cols: float = 5, threshold: float = 0.05, depth_mm: float = 1.0,
+                          clearance_mm: float = 3.0, approach_vel: float = 0.01, indent_vel: float = 0.005,
+                          travel_vel: float = 0.1, acc: float = 0.5, points_file: str = '') -> float | None:
+        """
+        Travel along the planned path plus approach over the clearance and indentation per point.
+        """
+        if not os.path.exists(corners_file):
+            return None
+
+        plane = plane_from_corners(load_corners(corners_file))
+
+        if points_file:
+            uv = np.loadtxt(points_file, delimiter=',', ndmin=2)[:, :2]
+        else:
+            uv = grid_points(plane['size_mm'], int(rows), int(cols))[:, 2:]
+
+        order = visit_order(uv)
+        hops = np.linalg.norm(np.diff(uv[order], axis=0), axis=1) / 1000.0
+
+        per_point = (move_duration(clearance_mm / 1000.0, approach_vel, acc) +
+                     move_duration(depth_mm / 1000.0, indent_vel, acc) +
+                     move_duration((clearance_mm + depth_mm) / 1000.0, travel_vel, acc))
+
+        return len(uv) * per_point + sum(move_duration(hop, travel_vel, acc) for hop in hops)
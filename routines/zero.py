@@ -1,15 +1,83 @@
+import math
 from routines.routine_base import BaseRoutine
 from utils.math_tools import get_target_pose_along_tool_z
+from utils.contact import ContactMonitor
+from utils.trajectory import move_duration
+
+# Deceleration in m/s^2 used to stop on contact
+STOP_DECELERATION = 5.0
+
+
+def approach_contact(robot, arduino, var_name: str, threshold: float, distance_mm: float, acc: float,
+                     vel: float) -> dict | None:
+    """
+    One asynchronous move along Tool Z+ that is stopped from the monitor thread on contact.
+
+    Arguments:
+        robot (RobotInterface): Robot to move.
+        arduino (ArduinoNode): Sensor node watched for contact.
+        var_name (str): Channel to watch.
+        threshold (float): Contact threshold.
+        distance_mm (float): Maximum approach distance in mm.
+        acc (float): Acceleration in m/s^2.
+        vel (float): Approach speed in m/s.
+
+    Returns:
+        dict | None: Contact report, or None if the threshold was not reached.
+    """
+    start_pose = robot.get_tcp_pose()
+    target = get_target_pose_along_tool_z(start_pose, distance_mm)
+
+    monitor = ContactMonitor(arduino.samples, var_name, threshold,
+                             lambda: robot.control.stopL(STOP_DECELERATION))
+    monitor.start()
+
+    robot.control.moveL(target, vel, acc, True)  # True = Async
+
+    # Full motion time plus margin
+    duration = distance_mm / 1000.0 / vel + vel / acc + 1.0
+
+    try:
+        hit = monitor.wait(duration)
+    except KeyboardInterrupt:
+        monitor.stop()
+        robot.control.stopL(STOP_DECELERATION)
+        raise
+
+    monitor.stop()
+
+    if not hit:
+        robot.control.stopL(STOP_DECELERATION)
+        return None
+
+    # Pose when the crossing sample was acquired, and where the robot came to rest
+    contact_pose = robot.get_tcp_pose_at(monitor.sample_time) or robot.get_tcp_pose()
+    stopped_pose = robot.get_tcp_pose()
+
+    return {
+        'contact_pose': contact_pose,
+        'stopped_pose': stopped_pose,
+        'travel_mm': math.dist(start_pose[:3], contact_pose[:3]) * 1000.0,
+        'overshoot_mm': math.dist(contact_pose[:3], stopped_pose[:3]) * 1000.0,
+        'latency_ms': monitor.latency() * 1000.0,
+        'stop_ms': (monitor.reacted_time - monitor.detected_time) * 1000.0,
+        'value': monitor.value,
+    }
 
 
 class ZeroRoutine(BaseRoutine):
 
     def run_logic(self, arduino_name: str, var_name: str, threshold: float, step_size_mm: float = 1,
-                  max_size_mm: float = 10.0, acc: float = 0.1, vel: float = 0.05):
+                  max_size_mm: float = 10.0, acc: float = 0.1, vel: float = 0.05, mode: str = 'step',
+                  refine_vel: float = 0.0):
         """
         Moves Tool Z+ in steps until sensor value > threshold.
         Then moves back one step to unload the applied force.
 
+        In 'single' mode the approach is one asynchronous move over max_size_mm while a monitor thread
+        checks every sensor sample and stops the robot on the first threshold crossing. With
+        refine_vel > 0 the robot backs off one step and repeats the approach at that lower speed.
+
         Arguments:
             arduino_name (str): Name of the Arduino node to read sensor data from.
             var_name (str): Name of the variable/sensor to monitor.
@@ -18,17 +86,25 @@ class ZeroRoutine(BaseRoutine):
             max_size_mm (float): Maximum distance in mm to move before stopping. Default is 10.
             acc (float): Acceleration for movements in m/s^2. Default is 0.1.
             vel (float): Speed for movements in m/s. Default is 0.05.
+            mode (str): 'step' for stepwise moves or 'single' for one monitored approach. Default is 'step'.
+            refine_vel (float): Speed in m/s of the refining second approach ('single' mode), 0 to skip.
         """
         # Validate Hardware
         arduino = self.arduinos.get(arduino_name)
 
         if not arduino:
             print(f"Error: Arduino '{arduino_name}' not found.")
-            return
+            return False
+
+        if mode == 'single':
+            found = self._zero_single(arduino, var_name, threshold, step_size_mm, max_size_mm, acc, vel, refine_vel)
+            print("Zero Action Complete.")
+            return found
 
         print(f"Zeroing: {var_name} > {threshold} (Step: {step_size_mm}mm / Max: {max_size_mm}mm)")
 
         total_steps_moved = 0.0
+        found = False
 
         try:
             while True:
@@ -45,11 +121,12 @@ class ZeroRoutine(BaseRoutine):
                     print(f"\nThreshold hit. Backing off {step_size_mm} mm.")
 
                     # Back off logic
-                    current_pose = self.robot.receive.getActualTCPPose()
+                    current_pose = self.robot.get_tcp_pose()
                     target = get_target_pose_along_tool_z(current_pose, -step_size_mm)
 
                     # Move back one step
                     self.robot.control.moveL(target, acc, vel)
+                    found = True
                     break
 
                 # Update and check max distance
@@ -60,7 +137,7 @@ class ZeroRoutine(BaseRoutine):
                     break
 
                 # Move Forward logic
-                current_pose = self.robot.receive.getActualTCPPose()
+                current_pose = self.robot.get_tcp_pose()
                 target = get_target_pose_along_tool_z(current_pose, step_size_mm)
 
                 # Move one step forward
@@ -68,6 +145,75 @@ class ZeroRoutine(BaseRoutine):
 
         except KeyboardInterrupt:
             print("Zeroing interrupted manually.")
+            self.interrupted = True
             self.robot.control.stopL()
 
-        print("Zero Action Complete.")
\ No newline at end of file
+        print("Zero Action Complete.")
+        return found
+
+    def _zero_single(self, arduino, var_name: str, threshold: float, backoff_mm: float, max_size_mm: float,
+                     acc: float, vel: float, refine_vel: float) -> bool:
+        """
+        Single monitored approach with optional slower refinement, then backs off to unload.
+
+        Returns:
+            bool: True if contact was found.
+        """
+        print(f"Zeroing: {var_name} > {threshold} (Single approach: {max_size_mm}mm @ {vel}m/s)")
+
+        start_pose = self.robot.get_tcp_pose()
+        passes = [(max_size_mm, vel)]
+
+        if refine_vel > 0:
+            passes.append((2.0 * backoff_mm, refine_vel))
+
+        report = None
+
+        try:
+            for idx, (distance_mm, speed) in enumerate(passes):
+                if idx > 0:
+                    # Back off before the refining approach
+                    self.robot.control.moveL(get_target_pose_along_tool_z(self.robot.get_tcp_pose(), -backoff_mm),
+                                             vel, acc)
+
+                report = approach_contact(self.robot, arduino, var_name, threshold, distance_mm, acc, speed)
+
+                if report is None:
+                    print("Max distance reached without hitting threshold.")
+                    return False
+
+                print(f"Contact ({speed}m/s): {var_name} = {report['value']:.3f}, "
+                      f"at {math.dist(start_pose[:3], report['contact_pose'][:3]) * 1000.0:.3f}mm from start, "
+                      f"detection latency {report['latency_ms']:.1f}ms, stop {report['stop_ms']:.1f}ms, "
+                      f"overshoot {report['overshoot_mm']:.3f}mm")
+
+        except KeyboardInterrupt:
+            print("Zeroing interrupted manually.")
+            self.interrupted = True
+            return False
+
+        contact = report['contact_pose']
+        print(f"Contact position: [{contact[0]:.5f}, {contact[1]:.5f}, {contact[2]:.5f}]")
+        print(f"Backing off {backoff_mm} mm.")
+
+        self.robot.control.moveL(get_target_pose_along_tool_z(self.robot.get_tcp_pose(), -backoff_mm), vel, acc)
+        return True
+
+    def estimate_duration(self, arduino_name: str, var_name: str, threshold: float, step_size_mm: float = 1,
+                          max_size_mm: float = 10.0, acc: float = 0.1, vel: float = 0.05, mode: str = 'step',
+                          refine_vel: float = 0.0) -> float:
+        """
+        Upper bound: contact at the maximum distance.
+        """
+        step = step_size_mm / 1000.0
+
+        if mode == 'single':
+            duration = move_duration(max_size_mm / 1000.0, vel, acc) + move_duration(step, vel, acc)
+
+            if refine_vel > 0:
+                duration += move_duration(step, vel, acc) + move_duration(2.0 * step, refine_vel, acc)
+
+            return duration
+
+        # Step mode moves with speed acc and acceleration vel, see run_logic()
+        return (int(max_size_mm / step_size_mm) + 2) * move_duration(step, acc, vel)
@@ -0,0 +1,328 @@
+"""
+Columnar binary session format.
+
+File layout:
+    MAGIC
+    column chunks       Each chunk holds the values of one column for up to chunk_rows rows,
+                        optionally byte-shuffled and compressed with zlib or lzma.
+    footer              UTF-8 JSON with the schema and per chunk the offset, length, min and max
+                        of every column.
+    uint64              Footer length in bytes (little-endian).
+    MAGIC
+
+Readers only parse the footer and then seek (memory-map) to the chunks of the requested columns,
+skipping chunks whose min/max range lies outside a requested time window.
+"""
+
+import os
+import sys
+import csv
+import json
+import lzma
+import mmap
+import zlib
+import struct
+import numpy as np
+
+MAGIC = b'CPCOL\x00\x01\x00'
+VERSION = 1
+
+CODECS = {
+    'none': (lambda data, level: data, lambda data: data),
+    'zlib': (lambda data, level: zlib.compress(data, level), zlib.decompress),
+    'lzma': (lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+
+
+def _shuffle(data: np.ndarray) -> bytes:
+    """
+    Byte transposition: groups the n-th byte of every value, which compresses far better for floats.
+    """
+    return data.view(np.uint8).reshape(-1, data.itemsize).T.tobytes()
+
+
+def _unshuffle(raw: bytes, dtype: np.dtype) -> np.ndarray:
+    return np.frombuffer(raw, dtype=np.uint8).reshape(dtype.itemsize, -1).T.copy().view(dtype).ravel()
+
+
+class ColumnarWriter:
+    """
+    Writes rows into a chunked, compressed columnar file.
+    Mirrors the csv.writer interface (writerow/writerows) so it can replace it in ExperimentLogger.
+
+    Arguments:
+        path (str): Output file path.
+        headers (list): Column names.
+        dtypes (list): Per column 'f8' or 'i8'. When None, rows are stored as 'f8' (an integer in the
+                       first row says nothing about later rows) and write_columns() uses the array types.
+        chunk_rows (int): Rows per chunk.
+        codec (str): 'zlib', 'lzma' or 'none'.
+        level (int): Compression level.
+        shuffle (bool): Byte-shuffle values before compression.
+    """
+
+    def __init__(self, path: str, headers: list, dtypes: list = None, chunk_rows: int = 8192,
+                 codec: str = 'zlib', level: int = 6, shuffle: bool = True):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec '{codec}'.")
+
+        self.path = path
+        self.headers = list(headers)
+        self.dtypes = dtypes
+        self.chunk_rows = chunk_rows
+        self.codec = codec
+        self.level = level
+        self.shuffle = shuffle and codec != 'none'
+
+        self.rows = 0
+        self.chunks = []
+        self.closed = False
+
+        self._pending = []
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+
+    def writerow(self, row: list):
+        self._pending.append(row)
+
+        if len(self._pending) >= self.chunk_rows:
+            self._write_chunk()
+
+    def writerows(self, rows: list):
+        for row in rows:
+            self.writerow(row)
+
+    def write_columns(self, columns: dict):
+        """
+        Appends a batch given as column arrays, written in chunk_rows slices without row conversion.
+
+        Arguments:
+            columns (dict): Column name to array mapping, all arrays of equal length.
+        """
+        self._write_chunk()
+
+        if self.dtypes is None:
+            self.dtypes = ['i8' if np.asarray(columns[n]).dtype.kind in 'iub' else 'f8' for n in self.headers]
+
+        arrays = [np.ascontiguousarray(columns[name], dtype=dtype)
+                  for name, dtype in zip(self.headers, self.dtypes)]
+        size = len(arrays[0]) if arrays else 0
+
+        for start in range(0, size, self.chunk_rows):
+            self._write_arrays([a[start:start + self.chunk_rows] for a in arrays])
+
+    def _write_chunk(self):
+        """
+        Compresses and writes the pending rows as one chunk per column.
+        """
+        if not self._pending:
+            return
+
+        if self.dtypes is None:
+            self.dtypes = ['f8'] * len(self.headers)
+
+        self._write_arrays([np.array([row[idx] for row in self._pending], dtype=dtype)
+                            for idx, dtype in enumerate(self.dtypes)])
+        self._pending = []
+
+    def _write_arrays(self, arrays: list):
+        """
+        Compresses and writes one chunk from per column arrays.
+        """
+        compress = CODECS[self.codec][0]
+        entry = {'rows': len(arrays[0]), 'columns': {}}
+
+        for name, values in zip(self.headers, arrays):
+            raw = _shuffle(values) if self.shuffle else values.tobytes()
+            data = compress(raw, self.level)
+
+            offset = self._file.tell()
+            self._file.write(data)
+
+            # Chunk statistics for range queries, NaN entries are ignored
+            valid = values[~np.isnan(values)] if values.dtype.kind == 'f' else values
+            low, high = (valid.min().item(), valid.max().item()) if len(valid) else (None, None)
+            entry['columns'][name] = [offset, len(data), low, high]
+
+        self.chunks.append(entry)
+        self.rows += entry['rows']
+
+    def flush(self):
+        """
+        Flushes the written chunks to the OS. Pending rows stay buffered until chunk_rows is
+        reached or close(): the file is only readable once the footer is written, so short chunks
+        would only grow the chunk index and compress worse.
+        """
+        self._file.flush()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def close(self):
+        """
+        Writes the remaining rows and the footer index, syncs the file to disk and closes it.
+        """
+        if self.closed:
+            return
+
+        self._write_chunk()
+
+        footer = json.dumps({
+            'version': VERSION,
+            'columns': [{'name': n, 'dtype': d} for n, d in zip(self.headers, self.dtypes or [])],
+            'codec': self.codec,
+            'shuffle': self.shuffle,
+            'rows': self.rows,
+            'chunks': self.chunks,
+        }).encode('utf-8')
+
+        self._file.write(footer)
+        self._file.write(struct.pack('<Q', len(footer)))
+        self._file.write(MAGIC)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+        self.closed = True
+
+
+class ColumnarReader:
+    """
+    Random access reader for columnar session files.
+
+    Arguments:
+        path (str): File path.
+
+    Attributes:
+        columns (list): Column names.
+        rows (int): Total number of rows.
+
+    Methods:
+        read(columns, t0, t1, time_column): Read columns, optionally limited to a time range.
+        to_csv(csv_path): Export the full file as CSV.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(MAGIC)] != MAGIC or self._map[-len(MAGIC):] != MAGIC:
+            raise ValueError(f"'{path}' is not a columnar session file (missing or incomplete footer).")
+
+        end = len(self._map) - len(MAGIC)
+        footer_len, = struct.unpack('<Q', self._map[end - 8:end])
+        footer = json.loads(self._map[end - 8 - footer_len:end - 8].decode('utf-8'))
+
+        self.columns = [c['name'] for c in footer['columns']]
+        self.dtypes = {c['name']: np.dtype(c['dtype']) for c in footer['columns']}
+        self.rows = footer['rows']
+        self.chunks = footer['chunks']
+        self.shuffle = footer['shuffle']
+        self._decompress = CODECS[footer['codec']][1]
+        self._codec = footer['codec']
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _chunk(self, entry: dict, name: str) -> np.ndarray:
+        offset, length = entry['columns'][name][:2]
+        dtype = self.dtypes[name]
+
+        # Uncompressed chunks are returned as views on the memory map
+        if self._codec == 'none':
+            return np.frombuffer(self._map, dtype=dtype, count=entry['rows'], offset=offset)
+
+        raw = self._decompress(self._map[offset:offset + length])
+
+        return _unshuffle(raw, dtype) if self.shuffle else np.frombuffer(raw, dtype=dtype)
+
+    def read(self, columns: list = None, t0: float = None, t1: float = None, time_column: str = None) -> dict:
+        """
+        Reads columns, decoding only the chunks that overlap [t0, t1] on the time column.
+
+        Arguments:
+            columns (list): Column names, all columns when None.
+            t0 (float): Start of the time range (inclusive).
+            t1 (float): End of the time range (inclusive).
+            time_column (str): Column used for the range, the first column when None.
+
+        Returns:
+            dict: Column name to np.ndarray.
+        """
+        columns = columns or self.columns
+        time_column = time_column or self.columns[0]
+        ranged = t0 is not None or t1 is not None
+
+        low = -np.inf if t0 is None else t0
+        high = np.inf if t1 is None else t1
+
+        parts = {name: [] for name in columns}
+
+        for entry in self.chunks:
+            _, _, cmin, cmax = entry['columns'][time_column]
+
+            if ranged and (cmin is None or cmax < low or cmin > high):
+                continue
+
+            mask = None
+
+            if ranged:
+                times = self._chunk(entry, time_column)
+                mask = (times >= low) & (times <= high)
+
+            for name in columns:
+                values = self._chunk(entry, name)
+                parts[name].append(values if mask is None else values[mask])
+
+        return {name: np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype=self.dtypes[name])
+                for name in columns}
+
+    def to_csv(self, csv_path: str):
+        """
+        Exports the file to CSV with the same header and row layout as ExperimentLogger.
+        """
+        with open(csv_path, 'w', newline='') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(self.columns)
+
+            # Chunk by chunk to keep memory bounded
+            for entry in self.chunks:
+                data = [self._chunk(entry, name).tolist() for name in self.columns]
+                writer.writerows(zip(*data))
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def export_csv(path: str, csv_path: str = None) -> str:
+    """
+    Converts a columnar session file to CSV.
+
+    Arguments:
+        path (str): Columnar file path.
+        csv_path (str): Output path, defaults to the input path with a .csv extension.
+
+    Returns:
+        str: Path of the written CSV file.
+    """
+    csv_path = csv_path or os.path.splitext(path)[0] + '.csv'
+
+    with ColumnarReader(path) as reader:
+        reader.to_csv(csv_path)
+
+    return csv_path
+
+
+if __name__ == '__main__':
+    # Usage: python -m utils.columnar <file.col> [output.csv]
+    if len(sys.argv) < 2:
+        print("Usage: python -m utils.columnar <file.col> [output.csv]")
+        sys.exit(1)
+
+    print(f"CSV saved to: {export_csv(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)}")
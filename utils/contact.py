@@ -0,0 +1,94 @@
+import time
+import threading
+import numpy as np
+
+
+class ContactMonitor(threading.Thread):
+    """
+    Watches a sensor stream at full rate and fires a callback on the first threshold crossing.
+
+    Every new sample is checked (not only the latest value), so short force peaks between polls
+    are not missed. The callback runs in this thread, typically a stopL on the robot, so the
+    reaction does not depend on the caller's loop.
+
+    Arguments:
+        buffer (SampleBuffer): Sample source (e.g. ArduinoNode.samples).
+        key (str): Channel to watch.
+        threshold (float): Contact is detected when a value reaches this threshold.
+        on_contact (callable): Called once without arguments when contact is detected.
+        poll_interval (float): Time in seconds between buffer checks.
+
+    Attributes:
+        contact (threading.Event): Set once contact has been detected and on_contact returned.
+        sample_time (float | None): Timestamp (monotonic) of the first sample above the threshold.
+        value (float | None): Value of that sample.
+        detected_time (float | None): Time at which the crossing was detected and on_contact was called.
+        reacted_time (float | None): Time at which on_contact returned.
+
+    Methods:
+        run(): Main threaded loop.
+        stop(): Stop watching without contact.
+        wait(timeout): Wait for contact.
+    """
+
+    def __init__(self, buffer, key: str, threshold: float, on_contact, poll_interval: float = 0.0005):
+        super().__init__(daemon=True)
+
+        self.buffer = buffer
+        self.key = key
+        self.threshold = threshold
+        self.on_contact = on_contact
+        self.poll_interval = poll_interval
+
+        self.contact = threading.Event()
+        self.sample_time = None
+        self.value = None
+        self.detected_time = None
+        self.reacted_time = None
+
+        self._stop_event = threading.Event()
+
+        # Only samples arriving after arming count
+        self._index = buffer.count
+
+    def run(self):
+        """
+        Main loop: checks all new samples against the threshold.
+        Note: Runs at separate thread!
+        """
+        while not self._stop_event.is_set():
+            new, self._index, _ = self.buffer.read_from(self._index)
+
+            if len(new) and self.key in new.dtype.names:
+                hits = np.flatnonzero(new[self.key] >= self.threshold)
+
+                if len(hits):
+                    self.detected_time = time.monotonic()
+                    self.sample_time = float(new['timestamp'][hits[0]])
+                    self.value = float(new[self.key][hits[0]])
+
+                    try:
+                        self.on_contact()
+                    except Exception as e:
+                        print(f"Contact reaction error: {e}")
+
+                    self.reacted_time = time.monotonic()
+                    self.contact.set()
+                    return
+
+            time.sleep(self.poll_interval)
+
+    def wait(self, timeout: float = None) -> bool:
+        return self.contact.wait(timeout)
+
+    def stop(self):
+        self._stop_event.set()
+
+        if self.is_alive():
+            self.join()
+
+    def latency(self) -> float | None:
+        """
+        Detection latency in seconds: from acquisition of the crossing sample to the reaction call.
+        """
+        return None if self.sample_time is None else self.detected_time - self.sample_time
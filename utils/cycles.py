@@ -0,0 +1,107 @@
+"""
+Load/unload cycle evaluation for cyclic indentation.
+
+Samples of the running cycle are collected in a CycleAccumulator (memory bounded by one cycle),
+each finished cycle is reduced to a few numbers by cycle_summary() and only those are kept.
+"""
+
+import numpy as np
+
+SUMMARY_FIELDS = ['cycle', 'start_time', 'duration', 'samples', 'max_depth', 'peak_force', 'loading_work',
+                  'hysteresis', 'loss_factor', 'stiffness', 'limit_reached']
+
+
+def _integral(y: np.ndarray, x: np.ndarray) -> float:
+    """
+    Trapezoidal integral of y over x, signed by the direction of x.
+    """
+    return float(np.sum(0.5 * (y[1:] + y[:-1]) * np.diff(x))) if len(x) > 1 else 0.0
+
+
+def cycle_summary(depth: np.ndarray, force: np.ndarray) -> dict:
+    """
+    Reduces one load/unload cycle to its characteristic values.
+
+    Arguments:
+        depth (np.ndarray): Indentation depth in mm, in time order.
+        force (np.ndarray): Sensor value at each depth.
+
+    Returns:
+        dict: max_depth, peak_force, loading_work (force * mm), hysteresis (dissipated work, the area
+              enclosed by the loop), loss_factor (hysteresis / loading_work) and stiffness (slope of
+              the upper half of the unloading branch, force per mm).
+    """
+    if len(depth) < 3:
+        return {'max_depth': float('nan'), 'peak_force': float('nan'), 'loading_work': float('nan'),
+                'hysteresis': float('nan'), 'loss_factor': float('nan'), 'stiffness': float('nan')}
+
+    turn = int(np.argmax(depth))
+
+    # Loading adds work, unloading (decreasing depth) returns part of it
+    loading_work = _integral(force[:turn + 1], depth[:turn + 1])
+    hysteresis = loading_work + _integral(force[turn:], depth[turn:])
+
+    peak_force = float(force.max())
+    unloading = slice(turn, None)
+    upper = force[unloading] >= 0.5 * peak_force
+    stiffness = float('nan')
+
+    if upper.sum() >= 3 and np.ptp(depth[unloading][upper]) > 0:
+        stiffness = float(np.polyfit(depth[unloading][upper], force[unloading][upper], 1)[0])
+
+    return {
+        'max_depth': float(depth[turn]),
+        'peak_force': peak_force,
+        'loading_work': loading_work,
+        'hysteresis': hysteresis,
+        'loss_factor': hysteresis / loading_work if loading_work > 0 else float('nan'),
+        'stiffness': stiffness,
+    }
+
+
+class CycleAccumulator:
+    """
+    Samples of the running cycle, handed out per cycle.
+
+    Arguments:
+        capacity (int): Initial capacity in samples, grown by doubling (bounded by the longest cycle).
+
+    Methods:
+        add(timestamps, depth, force): Append samples.
+        take(t_end): Remove and return all samples up to t_end, later samples stay for the next cycle.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self._data = np.empty((capacity, 3))
+        self._size = 0
+
+    def add(self, timestamps: np.ndarray, depth: np.ndarray, force: np.ndarray):
+        n = len(timestamps)
+
+        if self._size + n > len(self._data):
+            grown = np.empty((max(2 * len(self._data), self._size + n), 3))
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+
+        self._data[self._size:self._size + n] = np.column_stack((timestamps, depth, force))
+        self._size += n
+
+    def take(self, t_end: float) -> tuple:
+        """
+        Returns:
+            tuple: (timestamps, depth, force) copies of the samples up to t_end.
+        """
+        data = self._data[:self._size]
+        end = int(np.searchsorted(data[:, 0], t_end, side='right'))
+        cycle = data[:end].copy()
+
+        # Keep the samples of the next cycle at the start of the buffer
+        rest = self._size - end
+        self._data[:rest] = data[end:]
+        self._size = rest
+
+        return cycle[:, 0], cycle[:, 1], cycle[:, 2]
+
+    @property
+    def last_time(self) -> float:
+        return float(self._data[self._size - 1, 0]) if self._size else float('-inf')
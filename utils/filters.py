@@ -0,0 +1,279 @@
+"""
+Streaming signal conditioning for sensor channels.
+
+Filters process the batches of samples as they arrive in the acquisition path and carry their
+state from batch to batch, so the output equals filtering the whole stream at once. A channel's
+pipeline is configured per node as a list of filter specifications, applied in order:
+
+    "filters": {
+      "force": [{"type": "median", "n": 5}, {"type": "lowpass", "cutoff_hz": 20, "rate_hz": 1000}]
+    }
+
+The filtered values are stored next to the raw ones in the node's sample buffer as the channel
+"<channel>_filtered" (see filtered_name()).
+
+Filter types:
+    moving_average (n): Mean of the last n samples.
+    median (n): Median of the last n samples, removes isolated spikes.
+    lowpass (cutoff_hz, rate_hz, q=0.7071): Second order IIR low-pass (Butterworth for the default q).
+    notch (freq_hz, rate_hz, q=30): Second order IIR notch, e.g. 50/60 Hz mains pickup.
+    kalman (q, r): Kalman filter of a random walk level with process noise variance q per sample
+                   and measurement noise variance r.
+"""
+
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+FILTERED_SUFFIX = "_filtered"
+
+
+def filtered_name(channel: str) -> str:
+    """
+    Name of the filtered version of a channel.
+    """
+    return channel + FILTERED_SUFFIX
+
+
+class MovingAverage:
+    """
+    Mean over the last n samples (over the available ones while the window fills).
+    """
+
+    def __init__(self, n: int):
+        self.n = int(n)
+        self._tail = np.empty(0)
+
+        if self.n < 1:
+            raise ValueError("Moving average length must be at least 1.")
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        data = np.concatenate((self._tail, values))
+        sums = np.cumsum(np.concatenate(([0.0], data)))
+
+        end = np.arange(len(self._tail) + 1, len(data) + 1)
+        start = np.maximum(end - self.n, 0)
+        output = (sums[end] - sums[start]) / (end - start)
+
+        self._tail = data[-(self.n - 1):] if self.n > 1 else np.empty(0)
+
+        return output
+
+    def reset(self):
+        self._tail = np.empty(0)
+
+
+class MedianFilter:
+    """
+    Median over the last n samples (over the available ones while the window fills).
+    """
+
+    def __init__(self, n: int):
+        self.n = int(n)
+        self._tail = np.empty(0)
+
+        if self.n < 1:
+            raise ValueError("Median length must be at least 1.")
+
+    def _median(self, data: np.ndarray) -> np.ndarray:
+        """
+        Medians of all full windows; sorting the small windows is much cheaper than np.median().
+        """
+        if len(data) < self.n:
+            return np.empty(0)
+
+        ordered = np.sort(sliding_window_view(data, self.n), axis=1)
+        middle = self.n // 2
+
+        return ordered[:, middle] if self.n % 2 else 0.5 * (ordered[:, middle - 1] + ordered[:, middle])
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        data = np.concatenate((self._tail, values))
+
+        if len(self._tail) < self.n - 1:
+            # Start up: windows of the first samples are shorter than n
+            head = [np.median(data[:end]) for end in range(len(self._tail) + 1, min(self.n, len(data) + 1))]
+            output = np.concatenate((head, self._median(data)))
+        else:
+            output = self._median(data)
+
+        self._tail = data[-(self.n - 1):] if self.n > 1 else np.empty(0)
+
+        return output
+
+    def reset(self):
+        self._tail = np.empty(0)
+
+
+class Biquad:
+    """
+    Second order IIR section (transposed direct form II) with coefficients normalised to a0 = 1.
+    The state is initialised to the steady state of the first sample, so filtering starts without
+    a transient even on untared raw values.
+
+    Arguments:
+        b (tuple): Numerator coefficients b0, b1, b2.
+        a (tuple): Denominator coefficients a0, a1, a2.
+    """
+
+    def __init__(self, b: tuple, a: tuple):
+        self.b = [coefficient / a[0] for coefficient in b]
+        self.a = [1.0] + [coefficient / a[0] for coefficient in a[1:]]
+        self._state = None
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        b0, b1, b2 = self.b
+        _, a1, a2 = self.a
+
+        if self._state is None:
+            x = float(values[0])
+            y = x * sum(self.b) / sum(self.a)
+            self._state = (y - b0 * x, b2 * x - a2 * y)
+
+        z1, z2 = self._state
+        output = []
+
+        for x in values.tolist():
+            y = b0 * x + z1
+            z1 = b1 * x - a1 * y + z2
+            z2 = b2 * x - a2 * y
+            output.append(y)
+
+        self._state = (z1, z2)
+
+        return np.asarray(output)
+
+    def reset(self):
+        self._state = None
+
+
+class LowPass(Biquad):
+    """
+    Second order low-pass (RBJ cookbook), Butterworth response for q = 1/sqrt(2).
+    """
+
+    def __init__(self, cutoff_hz: float, rate_hz: float, q: float = 0.7071):
+        if not 0 < cutoff_hz < rate_hz / 2:
+            raise ValueError("Low-pass cutoff must be between 0 and half the sample rate.")
+
+        w = 2.0 * math.pi * cutoff_hz / rate_hz
+        alpha = math.sin(w) / (2.0 * q)
+        cos = math.cos(w)
+
+        super().__init__(((1 - cos) / 2, 1 - cos, (1 - cos) / 2), (1 + alpha, -2 * cos, 1 - alpha))
+
+
+class Notch(Biquad):
+    """
+    Second order notch (RBJ cookbook), q sets the width of the rejected band (freq_hz / q).
+    """
+
+    def __init__(self, freq_hz: float, rate_hz: float, q: float = 30.0):
+        if not 0 < freq_hz < rate_hz / 2:
+            raise ValueError("Notch frequency must be between 0 and half the sample rate.")
+
+        w = 2.0 * math.pi * freq_hz / rate_hz
+        alpha = math.sin(w) / (2.0 * q)
+        cos = math.cos(w)
+
+        super().__init__((1.0, -2 * cos, 1.0), (1 + alpha, -2 * cos, 1 - alpha))
+
+
+class Kalman:
+    """
+    Scalar Kalman filter of a slowly varying level (random walk model).
+
+    Arguments:
+        q (float): Process noise variance per sample, how fast the level may change.
+        r (float): Measurement noise variance of the sensor.
+    """
+
+    def __init__(self, q: float, r: float):
+        if q <= 0 or r <= 0:
+            raise ValueError("Kalman noise variances must be positive.")
+
+        self.q = q
+        self.r = r
+        self._state = None
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        q, r = self.q, self.r
+
+        if self._state is None:
+            self._state = (float(values[0]), r)
+
+        x, p = self._state
+        output = []
+
+        for z in values.tolist():
+            p += q
+            k = p / (p + r)
+            x += k * (z - x)
+            p *= 1.0 - k
+            output.append(x)
+
+        self._state = (x, p)
+
+        return np.asarray(output)
+
+    def reset(self):
+        self._state = None
+
+
+FILTERS = {
+    'moving_average': MovingAverage,
+    'median': MedianFilter,
+    'lowpass': LowPass,
+    'notch': Notch,
+    'kalman': Kalman,
+}
+
+
+class FilterChain:
+    """
+    Filters of one channel applied in order. NaN samples (channel missing in a sample) are passed
+    through as NaN and do not change the filter state.
+
+    Arguments:
+        specs (list): Filter specifications, dicts with a "type" and the filter's arguments.
+
+    Methods:
+        apply(values): Filter the next batch of samples.
+        reset(): Forget the filter state.
+    """
+
+    def __init__(self, specs: list):
+        self.filters = []
+
+        for spec in specs:
+            options = dict(spec)
+            kind = options.pop('type', None)
+
+            if kind not in FILTERS:
+                raise ValueError(f"Unknown filter type '{kind}', use one of {', '.join(FILTERS)}.")
+
+            try:
+                self.filters.append(FILTERS[kind](**options))
+            except TypeError as e:
+                raise ValueError(f"Invalid arguments for filter '{kind}': {e}")
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        valid = ~np.isnan(values)
+
+        if not valid.any():
+            return values.copy()
+
+        output = np.full(len(values), np.nan)
+        filtered = values[valid]
+
+        for stage in self.filters:
+            filtered = stage.apply(filtered)
+
+        output[valid] = filtered
+
+        return output
+
+    def reset(self):
+        for stage in self.filters:
+            stage.reset()
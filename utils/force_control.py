@@ -0,0 +1,109 @@
+"""
+Building blocks of force-controlled indentation.
+
+The controller output is a velocity along Tool Z in m/s (positive = into the sample), the error
+is the setpoint minus the measured sensor value, so the gains are in m/s per sensor unit.
+"""
+
+import os
+import numpy as np
+
+PROFILES = ['constant', 'ramp', 'trapezoid']
+
+
+class PIController:
+    """
+    Discrete PI controller with output limit and anti-windup by conditional integration:
+    while the output is saturated the integral only changes in the direction that leaves the limit.
+
+    Arguments:
+        kp (float): Proportional gain.
+        ki (float): Integral gain per second.
+        limit (float): Output magnitude limit.
+
+    Attributes:
+        integral (float): Integral term.
+
+    Methods:
+        update(error, dt): New output for an error sample.
+        reset(): Clears the integral.
+    """
+
+    def __init__(self, kp: float, ki: float, limit: float):
+        self.kp = kp
+        self.ki = ki
+        self.limit = limit
+        self.integral = 0.0
+
+    def update(self, error: float, dt: float) -> float:
+        integral = self.integral + self.ki * error * dt
+        output = self.kp * error + integral
+
+        if abs(output) <= self.limit or output * error < 0:
+            self.integral = integral
+
+        return min(max(self.kp * error + self.integral, -self.limit), self.limit)
+
+    def reset(self):
+        self.integral = 0.0
+
+
+class ForceProfile:
+    """
+    Piecewise linear force setpoint over time, held at the last value after the end.
+
+    Arguments:
+        times (np.ndarray): Increasing breakpoint times in seconds, starting at 0.
+        values (np.ndarray): Setpoint at each breakpoint.
+
+    Attributes:
+        duration (float): Time of the last breakpoint.
+        peak (float): Largest setpoint magnitude.
+
+    Methods:
+        value(t): Setpoint at time t.
+    """
+
+    def __init__(self, times, values):
+        self.times = np.asarray(times, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+
+        if len(self.times) == 0 or len(self.times) != len(self.values) or np.any(np.diff(self.times) < 0):
+            raise ValueError("A force profile needs matching, increasing times and values.")
+
+        self.duration = float(self.times[-1])
+        self.peak = float(np.abs(self.values).max())
+
+    def value(self, t: float) -> float:
+        return float(np.interp(t, self.times, self.values))
+
+
+def force_profile(kind: str, target: float, ramp_time: float = 1.0, hold_time: float = 10.0) -> ForceProfile:
+    """
+    Builds a setpoint profile.
+
+    Arguments:
+        kind (str): 'constant' (step to target and hold), 'ramp' (ramp to target and hold, e.g. creep
+                    tests), 'trapezoid' (ramp up, hold, ramp down to zero) or a CSV file of time, setpoint rows.
+        target (float): Setpoint of the hold phase.
+        ramp_time (float): Duration of each ramp in seconds.
+        hold_time (float): Duration of the hold phase in seconds.
+
+    Returns:
+        ForceProfile: The profile.
+    """
+    if kind == 'constant':
+        return ForceProfile([0.0, hold_time], [target, target])
+
+    if kind == 'ramp':
+        return ForceProfile([0.0, ramp_time, ramp_time + hold_time], [0.0, target, target])
+
+    if kind == 'trapezoid':
+        return ForceProfile([0.0, ramp_time, ramp_time + hold_time, 2 * ramp_time + hold_time],
+                            [0.0, target, target, 0.0])
+
+    if os.path.exists(kind):
+        points = np.loadtxt(kind, delimiter=',', ndmin=2)
+        return ForceProfile(points[:, 0], points[:, 1])
+
+    raise ValueError(f"Unknown force profile '{kind}', use one of {', '.join(PROFILES)} or a CSV file.")
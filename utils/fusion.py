@@ -0,0 +1,157 @@
+import math
+import numpy as np
+
+
+def _gap(grid: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+    """
+    Alignment gap in seconds: distance of every grid time to the nearest real sample of a stream.
+    """
+    idx = np.clip(np.searchsorted(timestamps, grid), 1, len(timestamps) - 1)
+
+    return np.minimum(np.abs(grid - timestamps[idx - 1]), np.abs(timestamps[idx] - grid))
+
+
+class StreamFusion:
+    """
+    Aligns a sensor stream and the robot state stream on a uniform time base.
+
+    Both inputs are SampleBuffers timestamped with time.monotonic(). Each poll consumes the new
+    samples of both streams and emits records for every grid time covered by both, so values are
+    always interpolated and never extrapolated. The output rate is independent of how fast the
+    caller polls.
+
+    Arguments:
+        sensor (SampleBuffer): Sensor samples (e.g. ArduinoNode.samples).
+        channel (str): Sensor channel to fuse.
+        robot (SampleBuffer): Robot state history (e.g. RobotStateSampler.history).
+        robot_columns (list): Robot history columns to fuse.
+        rate (float): Output rate in Hz.
+        max_tail (float): Seconds of one stream kept while the other stalls, older samples are
+                          dropped and the time base skips the uncovered interval. Default is 5.
+
+    Attributes:
+        dtype (np.dtype): Structured dtype of the emitted records.
+        lost_samples (int): Input samples overwritten before they were consumed.
+
+    Methods:
+        poll(): Return all records that became available since the previous poll.
+    """
+
+    def __init__(self, sensor, channel: str, robot, robot_columns: list = None, rate: float = 100.0,
+                 max_tail: float = 5.0):
+        self.sensor = sensor
+        self.channel = channel
+        self.robot = robot
+        self.robot_columns = robot_columns or ['tcp_x', 'tcp_y', 'tcp_z']
+        self.period = 1.0 / rate
+        self.max_tail = max_tail
+
+        self.dtype = np.dtype([('timestamp', 'f8')] + [(c, 'f8') for c in self.robot_columns] +
+                              [(channel, 'f8'), ('sensor_gap', 'f8'), ('robot_gap', 'f8')])
+
+        self.lost_samples = 0
+
+        # Start with the samples arriving from now on
+        self._sensor_idx = sensor.count
+        self._robot_idx = robot.count
+
+        self._sensor_tail = None
+        self._robot_tail = None
+        self._next_time = None
+
+    def _consume(self, buffer, index: int, tail, columns: list) -> tuple:
+        """
+        Reads new samples as a (timestamps, values) pair, drops rows without data
+        and prepends the kept tail of the previous poll. A column the buffer does not hold
+        (yet) counts as no data.
+        """
+        new, index, lost = buffer.read_from(index)
+        self.lost_samples += lost
+
+        if len(new) and all(c in new.dtype.names for c in columns):
+            timestamps = new['timestamp']
+            values = np.column_stack([new[c] for c in columns])
+        else:
+            timestamps, values = np.empty(0), np.empty((0, len(columns)))
+
+        keep = ~np.isnan(values).any(axis=1)
+        timestamps, values = timestamps[keep], values[keep]
+
+        if tail is not None:
+            timestamps = np.concatenate((tail[0], timestamps))
+            values = np.concatenate((tail[1], values))
+
+        return (timestamps, values), index
+
+    @staticmethod
+    def _trim(stream: tuple, t: float) -> tuple:
+        """
+        Keeps only what grid time t still needs: the last sample before it and all later ones.
+        """
+        start = max(0, int(np.searchsorted(stream[0], t)) - 1)
+
+        return stream[0][start:], stream[1][start:]
+
+    def _cap(self, stream: tuple) -> tuple:
+        """
+        Keeps only the last max_tail seconds of a stream.
+        """
+        if len(stream[0]) == 0 or stream[0][-1] - stream[0][0] <= self.max_tail:
+            return stream
+
+        start = int(np.searchsorted(stream[0], stream[0][-1] - self.max_tail))
+
+        return stream[0][start:], stream[1][start:]
+
+    def poll(self) -> np.ndarray:
+        """
+        Consumes new input samples and emits aligned records.
+
+        Returns:
+            np.ndarray: Structured array of records (may be empty).
+        """
+        sensor, self._sensor_idx = self._consume(self.sensor, self._sensor_idx, self._sensor_tail, [self.channel])
+        robot, self._robot_idx = self._consume(self.robot, self._robot_idx, self._robot_tail, self.robot_columns)
+
+        # While one stream stalls the other piles up: drop what no grid time can use and cap the rest
+        if len(sensor[0]) and len(robot[0]):
+            start = max(sensor[0][0], robot[0][0])
+            sensor, robot = self._trim(sensor, start), self._trim(robot, start)
+
+        sensor, robot = self._cap(sensor), self._cap(robot)
+
+        self._sensor_tail = sensor
+        self._robot_tail = robot
+
+        if len(sensor[0]) < 2 or len(robot[0]) < 2:
+            return np.empty(0, dtype=self.dtype)
+
+        start = max(sensor[0][0], robot[0][0])
+        horizon = min(sensor[0][-1], robot[0][-1])
+
+        # Grid times before the start of both streams (only after capping) cannot be interpolated
+        first = math.ceil(start / self.period) * self.period
+        self._next_time = first if self._next_time is None else max(self._next_time, first)
+
+        count = int(math.floor((horizon - self._next_time) / self.period)) + 1
+
+        if count <= 0:
+            return np.empty(0, dtype=self.dtype)
+
+        grid = self._next_time + np.arange(count) * self.period
+        self._next_time = grid[-1] + self.period
+
+        records = np.empty(count, dtype=self.dtype)
+        records['timestamp'] = grid
+
+        for i, column in enumerate(self.robot_columns):
+            records[column] = np.interp(grid, robot[0], robot[1][:, i])
+
+        records[self.channel] = np.interp(grid, sensor[0], sensor[1][:, 0])
+        records['robot_gap'] = _gap(grid, robot[0])
+        records['sensor_gap'] = _gap(grid, sensor[0])
+
+        self._sensor_tail = self._trim(sensor, self._next_time)
+        self._robot_tail = self._trim(robot, self._next_time)
+
+        return records
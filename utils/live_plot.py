@@ -1,69 +1,359 @@
+import math
+import queue
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
 import matplotlib.pyplot as plt
 
 
+def _minmax_decimate(x: np.ndarray, y: np.ndarray, bins: int) -> tuple:
+    """
+    Reduces a series to at most 2 * bins points, keeping the min and max of y per bin in index order.
+    The visual envelope of the curve is preserved, unlike plain subsampling.
+
+    Arguments:
+        x (np.ndarray): X data.
+        y (np.ndarray): Y data.
+        bins (int): Number of bins (typically the pixel width of the axes).
+
+    Returns:
+        tuple: Decimated (x, y).
+    """
+    n = len(y)
+
+    if n <= 2 * bins:
+        return x, y
+
+    size = math.ceil(n / bins)
+    full = (n // size) * size
+
+    blocks = y[:full].reshape(-1, size)
+    offsets = np.arange(0, full, size)[:, None]
+
+    imin = blocks.argmin(axis=1)[:, None]
+    imax = blocks.argmax(axis=1)[:, None]
+
+    # Keep both extremes in their original order
+    idx = (offsets + np.sort(np.hstack((imin, imax)), axis=1)).ravel()
+    idx = np.concatenate((idx, np.arange(full, n)))
+
+    return x[idx], y[idx]
+
+
+class _PlotBuffer:
+    """
+    Bounded x/y point store, optionally placed in shared memory for a renderer process.
+
+    Layout: int64 [seq, count] header followed by x[capacity] and y[capacity] as float64.
+    Appending never touches existing points; when full the store is compacted in place with
+    min/max decimation, guarded by an odd sequence number so readers can retry. After a
+    compaction new points are aggregated with the same stride, so old and new data keep an
+    equal resolution.
+    """
+
+    def __init__(self, capacity: int, shared: bool = False, name: str = None):
+        # Compaction keeps capacity // 4 min/max bins, at least two are needed to halve the store
+        if capacity < 8:
+            raise ValueError(f"A live plot needs room for at least 8 points, got max_points={capacity}.")
+
+        self.capacity = capacity
+        size = (2 + 2 * capacity) * 8
+
+        self.shm = None
+
+        if name:
+            self.shm = shared_memory.SharedMemory(name=name)
+        elif shared:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+
+        memory = np.ndarray(2 + 2 * capacity, dtype=np.float64,
+                            buffer=self.shm.buf) if self.shm else np.zeros(2 + 2 * capacity)
+
+        self._header = memory[:2].view(np.int64)
+        self._x = memory[2:2 + capacity]
+        self._y = memory[2 + capacity:]
+
+        if not name:
+            self._header[:] = 0
+
+        # Raw points represented by one min/max pair, 1 = raw points are stored
+        self._stride = 1
+        self._pending_x = np.empty(0)
+        self._pending_y = np.empty(0)
+
+    def push(self, x, y):
+        """
+        Appends one point or an array of points.
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        y = np.atleast_1d(np.asarray(y, dtype=np.float64))
+
+        if self._stride > 1:
+            # Aggregate complete blocks of stride raw points, keep the remainder pending
+            x = np.concatenate((self._pending_x, x))
+            y = np.concatenate((self._pending_y, y))
+            full = (len(x) // self._stride) * self._stride
+
+            self._pending_x, self._pending_y = x[full:], y[full:]
+            x, y = _minmax_decimate(x[:full], y[:full], full // self._stride)
+
+        while len(x):
+            count = int(self._header[1])
+
+            if count >= self.capacity:
+                self._compact()
+                count = int(self._header[1])
+
+            take = min(len(x), self.capacity - count)
+            self._x[count:count + take] = x[:take]
+            self._y[count:count + take] = y[:take]
+            self._header[1] = count + take
+
+            x, y = x[take:], y[take:]
+
+    def _compact(self):
+        """
+        Halves the number of stored points while preserving the min/max envelope.
+        """
+        self._header[0] += 1  # odd: compaction in progress
+
+        count = int(self._header[1])
+        x, y = _minmax_decimate(self._x[:count].copy(), self._y[:count].copy(), count // 4)
+
+        self._x[:len(x)] = x
+        self._y[:len(y)] = y
+        self._header[1] = len(x)
+
+        self._header[0] += 1
+
+        self._stride = 4 if self._stride == 1 else self._stride * 2
+
+    def snapshot(self) -> tuple:
+        """
+        Consistent copy of all stored points.
+        """
+        while True:
+            seq = int(self._header[0])
+
+            if seq % 2:
+                time.sleep(0.001)
+                continue
+
+            count = int(self._header[1])
+            x = self._x[:count].copy()
+            y = self._y[:count].copy()
+
+            if int(self._header[0]) == seq:
+                return x, y
+
+    def close(self, unlink: bool = False):
+        if self.shm:
+            self.shm.close()
+
+            if unlink:
+                self.shm.unlink()
+
+
+class _Renderer:
+    """
+    Matplotlib figure drawing decimated data with blitting.
+    A full redraw only happens when the axis limits have to grow.
+    """
+
+    def __init__(self, title: str, x_label: str, y_label: str, legend_name: str, marker: str):
+        plt.ion()  # Interactive mode on
+        self.fig, self.ax = plt.subplots()
+        self.line, = self.ax.plot([], [], marker, label=legend_name, animated=True)
+
+        self.ax.set_title(title)
+        self.ax.set_xlabel(x_label)
+        self.ax.set_ylabel(y_label)
+        self.ax.legend()
+        self.ax.grid(True)
+
+        self._background = None
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+
+        plt.show(block=False)
+        self.fig.canvas.draw()
+
+    def _on_draw(self, event):
+        # Static parts (axes, grid, labels) are cached, the animated line is drawn on top
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self.ax.draw_artist(self.line)
+
+    def _grow_limits(self, x: np.ndarray, y: np.ndarray) -> bool:
+        """
+        Expands the axis limits with a margin when the data leaves them.
+        """
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        dx0, dx1, dy0, dy1 = x.min(), x.max(), y.min(), y.max()
+
+        if x0 <= dx0 and dx1 <= x1 and y0 <= dy0 and dy1 <= y1:
+            return False
+
+        mx = max(dx1 - dx0, 1e-9) * 0.1
+        my = max(dy1 - dy0, 1e-9) * 0.1
+
+        # Initial default limits are ignored, afterwards the limits only grow
+        if len(self.line.get_xdata()) == 0:
+            x0, x1, y0, y1 = math.inf, -math.inf, math.inf, -math.inf
+
+        self.ax.set_xlim(min(x0, dx0 - mx), max(x1, dx1 + mx))
+        self.ax.set_ylim(min(y0, dy0 - my), max(y1, dy1 + my))
+
+        return True
+
+    def render(self, x: np.ndarray, y: np.ndarray):
+        if len(x):
+            grown = self._grow_limits(x, y)
+            x, y = _minmax_decimate(x, y, max(int(self.ax.bbox.width), 1))
+            self.line.set_data(x, y)
+
+            canvas = self.fig.canvas
+
+            if grown or self._background is None or not getattr(canvas, 'supports_blit', False):
+                canvas.draw()
+            else:
+                canvas.restore_region(self._background)
+                self.ax.draw_artist(self.line)
+                canvas.blit(self.fig.bbox)
+
+        self.fig.canvas.flush_events()
+
+    def save(self, filepath: str):
+        # Animated artists are skipped by savefig
+        self.line.set_animated(False)
+        self.fig.savefig(filepath)
+        self.line.set_animated(True)
+
+    def close(self):
+        plt.close(self.fig)
+
+
+def _render_process(shm_name: str, capacity: int, fps: float, labels: tuple, commands, replies):
+    """
+    Renderer process: redraws from shared memory at a fixed frame rate and handles save/close commands.
+    """
+    buffer = _PlotBuffer(capacity, name=shm_name)
+    renderer = _Renderer(*labels)
+
+    try:
+        while True:
+            try:
+                command = commands.get(timeout=1.0 / fps)
+            except queue.Empty:
+                command = None
+
+            renderer.render(*buffer.snapshot())
+
+            if command and command[0] == 'save':
+                renderer.save(command[1])
+                replies.put(command[1])
+            elif command and command[0] == 'close':
+                break
+    finally:
+        renderer.close()
+        buffer.close()
+
+
 class LivePlotter:
 
-    def __init__(self, title: str, x_label: str, y_label: str, legend_name: str, marker: str = 'r-'):
+    def __init__(self, title: str, x_label: str, y_label: str, legend_name: str, marker: str = 'r-',
+                 fps: float = 20.0, max_points: int = 200000, process: bool = False):
         """
         Initializes a live plotter for real-time data visualization.
 
+        Samples are only buffered by update(); the figure is redrawn at most fps times per second
+        using blitting and min/max decimation to the axes pixel width. Memory is bounded by
+        max_points, older data is compacted (envelope preserving) instead of dropped.
+
         Args:
             title (str): Title of the plot.
             x_label (str): Label for the x-axis.
             y_label (str): Label for the y-axis.
             legend_name (str): Name for the data series in the legend.
             marker (str): Matplotlib marker style for the plot line. Default is 'r-' (red line).
+            fps (float): Maximum redraw rate in frames per second. Default is 20.
+            max_points (int): Maximum number of buffered points, at least 8. Default is 200000.
+            process (bool): Render in a separate process fed through shared memory. Default is False.
         """
-        self.x_data = []
-        self.y_data = []
         self.title = title
+        self.period = 1.0 / fps
+        self.process = None
 
-        plt.ion()  # Interactive mode on
-        self.fig, self.ax = plt.subplots()
-        self.line, = self.ax.plot([], [], marker, label=legend_name)
+        self._buffer = _PlotBuffer(max_points, shared=process)
+        self._next_frame = 0.0
 
-        self.ax.set_title(title)
-        self.ax.set_xlabel(x_label)
-        self.ax.set_ylabel(y_label)
-        self.ax.legend()
-        self.ax.grid(True)
+        labels = (title, x_label, y_label, legend_name, marker)
+
+        if process:
+            ctx = mp.get_context('spawn')
+            self._commands = ctx.Queue()
+            self._replies = ctx.Queue()
+            self.process = ctx.Process(target=_render_process, daemon=True,
+                                       args=(self._buffer.shm.name, max_points, fps, labels,
+                                             self._commands, self._replies))
+            self.process.start()
+            self._renderer = None
+        else:
+            self._renderer = _Renderer(*labels)
 
     def update(self, x: float, y: float):
         """
         Updates the plot with new x and y data points.
+        Only buffers the data; the figure is redrawn when the next frame is due.
 
         Args:
-            x (float): New x data point.
-            y (float): New y data point.
+            x (float | np.ndarray): New x data point(s).
+            y (float | np.ndarray): New y data point(s).
         """
-        self.x_data.append(x)
-        self.y_data.append(y)
+        self._buffer.push(x, y)
 
-        self.line.set_xdata(self.x_data)
-        self.line.set_ydata(self.y_data)
+        if self._renderer is None:
+            return
 
-        self.ax.relim()
-        self.ax.autoscale_view()
+        now = time.monotonic()
 
-        # Short pause for UI update
-        plt.pause(0.001)
+        if now >= self._next_frame:
+            self._next_frame = now + self.period
+            self._renderer.render(*self._buffer.snapshot())
 
     def save(self, filepath: str):
         """
-        Saves the current plot to the specified file path and closes the plot.
+        Saves the current plot to the specified file path.
 
         Args:
             filepath (str): The path where the plot image will be saved.
         """
-        # Disable interaction
-        plt.ioff()
+        if self.process:
+            self._commands.put(('save', filepath))
+
+            try:
+                self._replies.get(timeout=10.0)
+            except queue.Empty:
+                print(f"Plot could not be saved to: {filepath}")
+                return
+        else:
+            # Disable interaction
+            plt.ioff()
+
+            self._renderer.render(*self._buffer.snapshot())
+            self._renderer.save(filepath)
 
-        plt.savefig(filepath)
         print(f"Plot saved to: {filepath}")
 
     def close(self):
         """
         Closes the plot window.
         """
-        plt.close(self.fig)
-        print("Plot closed.")
\ No newline at end of file
+        if self.process:
+            self._commands.put(('close',))
+            self.process.join(timeout=5.0)
+            self._buffer.close(unlink=True)
+        else:
+            self._renderer.close()
+
+        print("Plot closed.")
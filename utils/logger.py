@@ -1,16 +1,33 @@
 import os
 import csv
+import time
+import atexit
+import threading
+from collections import deque
 from datetime import datetime
+from utils.columnar import ColumnarWriter
 
 
 class ExperimentLogger:
 
-    def __init__(self, routine_name: str):
+    def __init__(self, routine_name: str, async_write: bool = False, batch_size: int = 512,
+                 flush_interval: float = 0.5, max_queue: int = 1000000, storage: str = 'csv',
+                 codec: str = 'zlib'):
         """
         Initializes the ExperimentLogger with a routine name.
 
+        In async mode log_data() only appends the row to an in-memory queue. A background thread
+        formats and writes rows in batches (when batch_size rows are queued or every flush_interval
+        seconds), so disk latency never shows up in the measurement loop.
+
         Args:
             routine_name (str): Name of the experiment routine.
+            async_write (bool): Write rows from a background thread. Default is False.
+            batch_size (int): Number of queued rows that triggers a write. Default is 512.
+            flush_interval (float): Maximum time in seconds between writes. Default is 0.5.
+            max_queue (int): Queued rows before new rows are dropped. Default is 1000000.
+            storage (str): 'csv' for data.csv or 'columnar' for a compressed data.col. Default is 'csv'.
+            codec (str): Compression of the columnar backend ('zlib', 'lzma' or 'none'). Default is 'zlib'.
         """
         # Set up naming convention
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -24,40 +41,153 @@ class ExperimentLogger:
             os.makedirs(self.base_dir)
 
         # Set file paths
-        self.csv_path = os.path.join(self.base_dir, "data.csv")
+        self.storage = storage
+        self.codec = codec
+        self.csv_path = os.path.join(self.base_dir, "data.csv" if storage == 'csv' else "data.col")
         self.plot_path = os.path.join(self.base_dir, "plot.png")
         self.file_handle = None
         self.writer = None
 
+        # Async writer state
+        self.async_write = async_write
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+
+        self.queue = deque()
+        self.high_water_mark = 0
+        self.dropped_rows = 0
+        self.written_rows = 0
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
     def init_csv(self, headers: list):
         """
-        Initializes the CSV file with the given headers.
+        Initializes the data file with the given headers.
+        In columnar mode all columns are stored as float64.
 
         Args:
-            headers (list): List of column headers for the CSV file.
+            headers (list): List of column headers for the data file.
         """
-        self.file_handle = open(self.csv_path, 'w', newline='')
-        self.writer = csv.writer(self.file_handle)
-        self.writer.writerow(headers)
+        if self.storage == 'columnar':
+            # The columnar writer provides both the file and the writer interface
+            self.file_handle = ColumnarWriter(self.csv_path, headers, codec=self.codec)
+            self.writer = self.file_handle
+        else:
+            self.file_handle = open(self.csv_path, 'w', newline='')
+            self.writer = csv.writer(self.file_handle)
+            self.writer.writerow(headers)
+
+        if self.async_write:
+            self._thread = threading.Thread(target=self._write_loop, daemon=True)
+            self._thread.start()
+
+            # Flush whatever is queued if the interpreter exits without close()
+            atexit.register(self.close)
+
         return self.csv_path
 
     def log_data(self, row_data: list):
         """
-        Logs a row of data to the CSV file.
+        Logs a row of data to the data file (queued for the background writer in async mode).
 
         Args:
-            row_data (list): List of data values corresponding to the CSV columns.
+            row_data (list): List of data values corresponding to the headers.
         """
-        if self.writer:
+        if not self.writer:
+            return
+
+        if not self.async_write:
             self.writer.writerow(row_data)
+            self.written_rows += 1
+            return
+
+        size = len(self.queue)
+
+        if size >= self.max_queue:
+            self.dropped_rows += 1
+            return
+
+        self.queue.append(row_data)
+
+        if size >= self.high_water_mark:
+            self.high_water_mark = size + 1
+
+        if size + 1 >= self.batch_size:
+            self._wake.set()
+
+    def _write_loop(self):
+        """
+        Background writer: drains the queue in batches.
+        Note: Runs at separate thread!
+        """
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+
+            self._drain()
+
+    def _drain(self):
+        """
+        Writes all queued rows and flushes the file.
+        """
+        batch = []
+
+        try:
+            while True:
+                batch.append(self.queue.popleft())
+
+                if len(batch) >= self.batch_size:
+                    self.writer.writerows(batch)
+                    self.written_rows += len(batch)
+                    batch = []
+        except IndexError:
+            pass
+
+        if batch:
+            self.writer.writerows(batch)
+            self.written_rows += len(batch)
+
+        self.file_handle.flush()
+
+    def get_stats(self) -> dict:
+        """
+        Returns writer statistics: queued, written and dropped rows and the queue high-water mark.
+        """
+        return {
+            'queued': len(self.queue),
+            'written': self.written_rows,
+            'dropped': self.dropped_rows,
+            'high_water_mark': self.high_water_mark,
+        }
 
     def close(self):
         """
-        Closes the CSV file handle.
+        Stops the background writer, writes all queued rows, syncs the data file to disk and closes it.
         """
-        if self.file_handle:
+        if self._thread:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+
+            atexit.unregister(self.close)
+
+        if self.file_handle and not self.file_handle.closed:
+            self._drain()
+
+            # The columnar writer syncs itself once the footer is written
+            if self.storage != 'columnar':
+                os.fsync(self.file_handle.fileno())
+
             self.file_handle.close()
-            print(f"CSV saved to: {self.csv_path}")
+            print(f"Data saved to: {self.csv_path}")
+
+            if self.async_write:
+                print(f"   Rows written: {self.written_rows}, dropped: {self.dropped_rows}, "
+                      f"queue high-water mark: {self.high_water_mark}")
 
     def get_plot_path(self):
         """
@@ -1,4 +1,5 @@
 import math
+from functools import lru_cache
 import numpy as np
 
 
@@ -38,6 +39,67 @@ def _axis_angle_to_matrix(rx, ry, rz):
     ])
 
 
+@lru_cache(maxsize=64)
+def rotation_matrix(rx: float, ry: float, rz: float) -> np.ndarray:
+    """
+    Cached axis-angle to rotation matrix conversion, for orientations that stay constant over many calls.
+    The returned matrix is shared between callers and therefore read-only.
+
+    Attributes:
+        rx (float): Axis-angle representation component.
+        ry (float): Axis-angle representation component.
+        rz (float): Axis-angle representation component.
+
+    Returns:
+        np.ndarray: 3x3 rotation matrix (read-only).
+    """
+    matrix = _axis_angle_to_matrix(rx, ry, rz)
+    matrix.setflags(write=False)
+
+    return matrix
+
+
+def _rotate_scalar(rx: float, ry: float, rz: float, dx: float, dy: float, dz: float) -> tuple:
+    """
+    Rotates one vector by an axis-angle rotation without NumPy (Rodrigues' rotation formula).
+    Intended for single calls inside control loops where array creation dominates the cost.
+
+    Returns:
+        tuple: Rotated vector (x, y, z).
+    """
+    theta = math.sqrt(rx * rx + ry * ry + rz * rz)
+
+    if theta < 1e-6:
+        return dx, dy, dz
+
+    ux, uy, uz = rx / theta, ry / theta, rz / theta
+    c = math.cos(theta)
+    s = math.sin(theta)
+    dot = (ux * dx + uy * dy + uz * dz) * (1 - c)
+
+    # v c + (u x v) s + u (u . v)(1 - c)
+    return (dx * c + (uy * dz - uz * dy) * s + ux * dot,
+            dy * c + (uz * dx - ux * dz) * s + uy * dot,
+            dz * c + (ux * dy - uy * dx) * s + uz * dot)
+
+
+def get_target_pose_along_tool(current_pose, offset_mm) -> list:
+    """
+    Calculates a new pose in Base Frame by moving along an arbitrary Tool Frame offset.
+
+    Attributes:
+        current_pose (list): Current pose as [Px, Py, Pz, Rx, Ry, Rz].
+        offset_mm (list): Offset (dx, dy, dz) in the Tool Frame in millimeters.
+
+    Returns:
+        list: New pose as [Px, Py, Pz, Rx, Ry, Rz].
+    """
+    px, py, pz, rx, ry, rz = current_pose
+    dx, dy, dz = _rotate_scalar(rx, ry, rz, offset_mm[0] / 1000.0, offset_mm[1] / 1000.0, offset_mm[2] / 1000.0)
+
+    return [px + dx, py + dy, pz + dz, rx, ry, rz]
+
+
 def get_target_pose_along_tool_z(current_pose, z_step_mm):
     """
     Calculates a new pose in Base Frame by moving along the Tool Z axis.
@@ -49,18 +111,135 @@ def get_target_pose_along_tool_z(current_pose, z_step_mm):
     Returns:
         list: New pose as [Px, Py, Pz, Rx, Ry, Rz].
     """
-    # Convert mm to meters
-    z_step_m = z_step_mm / 1000.0
+    px, py, pz, rx, ry, rz = current_pose
 
-    # Extract position and rotation
-    P_base = np.array(current_pose[:3])
-    R_base = _axis_angle_to_matrix(*current_pose[3:])
+    # Translation vector (0, 0, z) in Tool Frame, rotated into Base Frame
+    dx, dy, dz = _rotate_scalar(rx, ry, rz, 0.0, 0.0, z_step_mm / 1000.0)
 
-    # Translation vector in Tool Frame (0, 0, z)
-    trans_tool = np.array([0, 0, z_step_m])
+    # Return new pose
+    return [px + dx, py + dy, pz + dz, rx, ry, rz]
 
-    # Calculate new position
-    P_new = P_base + R_base.dot(trans_tool)
 
-    # Return new pose
-    return list(P_new) + list(current_pose[3:])
\ No newline at end of file
+def axis_angles_to_matrices(rotvecs) -> np.ndarray:
+    """
+    Batch axis-angle to rotation matrix conversion.
+
+    Attributes:
+        rotvecs (np.ndarray): (N, 3) axis-angle vectors.
+
+    Returns:
+        np.ndarray: (N, 3, 3) rotation matrices.
+    """
+    rotvecs = np.asarray(rotvecs, dtype=float).reshape(-1, 3)
+    theta = np.linalg.norm(rotvecs, axis=1)
+
+    # Small angles map to the identity, avoid dividing by zero
+    small = theta < 1e-6
+    u = rotvecs / np.where(small, 1.0, theta)[:, None]
+
+    c = np.cos(theta)[:, None, None]
+    s = np.sin(theta)[:, None, None]
+
+    # Cross product matrices K, R = I + s K + (1 - c) K^2
+    k = np.zeros((len(u), 3, 3))
+    k[:, 0, 1], k[:, 0, 2] = -u[:, 2], u[:, 1]
+    k[:, 1, 0], k[:, 1, 2] = u[:, 2], -u[:, 0]
+    k[:, 2, 0], k[:, 2, 1] = -u[:, 1], u[:, 0]
+
+    matrices = np.eye(3) + s * k + (1 - c) * (k @ k)
+    matrices[small] = np.eye(3)
+
+    return matrices
+
+
+def matrices_to_axis_angles(matrices) -> np.ndarray:
+    """
+    Batch rotation matrix to axis-angle conversion (rotation angle in [0, pi]).
+
+    Attributes:
+        matrices (np.ndarray): (N, 3, 3) rotation matrices.
+
+    Returns:
+        np.ndarray: (N, 3) axis-angle vectors.
+    """
+    matrices = np.asarray(matrices, dtype=float).reshape(-1, 3, 3)
+
+    cos_theta = np.clip((np.trace(matrices, axis1=1, axis2=2) - 1.0) / 2.0, -1.0, 1.0)
+    theta = np.arccos(cos_theta)
+
+    # Skew-symmetric part: 2 sin(theta) u
+    skew = np.stack((matrices[:, 2, 1] - matrices[:, 1, 2],
+                     matrices[:, 0, 2] - matrices[:, 2, 0],
+                     matrices[:, 1, 0] - matrices[:, 0, 1]), axis=1)
+
+    sin_theta = np.sin(theta)
+    scale = np.where(sin_theta > 1e-6, theta / np.where(sin_theta > 1e-6, 2.0 * sin_theta, 1.0), 0.5)
+    rotvecs = skew * scale[:, None]
+
+    # Near pi the skew part vanishes: take the axis from the symmetric part instead
+    near_pi = (np.pi - theta) < 1e-3
+
+    if near_pi.any():
+        # u u^T = ((R + R^T) / 2 - cos(theta) I) / (1 - cos(theta)), exact for any angle
+        cos_pi = cos_theta[near_pi][:, None, None]
+        sym = matrices[near_pi]
+        outer = ((sym + sym.transpose(0, 2, 1)) / 2.0 - cos_pi * np.eye(3)) / (1.0 - cos_pi)
+
+        # Row through the largest diagonal element gives the axis up to its sign
+        diag = np.sqrt(np.clip(np.diagonal(outer, axis1=1, axis2=2), 0.0, None))
+        pivot = diag.argmax(axis=1)
+        index = np.arange(len(sym))
+        axis = outer[index, pivot] / diag[index, pivot][:, None]
+        axis /= np.linalg.norm(axis, axis=1)[:, None]
+
+        # Keep the sign consistent with the (small) skew part where it is defined
+        sign = np.where(np.einsum('ij,ij->i', axis, skew[near_pi]) < 0, -1.0, 1.0)
+        rotvecs[near_pi] = axis * (sign * theta[near_pi])[:, None]
+
+    return rotvecs
+
+
+def offset_poses_along_tool(poses, offsets_mm) -> np.ndarray:
+    """
+    Batch version of get_target_pose_along_tool: moves every pose by an offset in its own Tool Frame.
+    When all poses share one orientation the rotation is computed once (cached).
+
+    Attributes:
+        poses (np.ndarray): (N, 6) poses as [Px, Py, Pz, Rx, Ry, Rz].
+        offsets_mm (np.ndarray): (N, 3) or (3,) Tool Frame offsets in millimeters.
+
+    Returns:
+        np.ndarray: (N, 6) new poses, orientations unchanged.
+    """
+    poses = np.asarray(poses, dtype=float).reshape(-1, 6)
+    offsets = np.broadcast_to(np.asarray(offsets_mm, dtype=float) / 1000.0, (len(poses), 3))
+
+    result = poses.copy()
+
+    if len(poses) == 0:
+        return result
+
+    rotvecs = poses[:, 3:]
+
+    if np.all(rotvecs == rotvecs[0]):
+        result[:, :3] += offsets @ rotation_matrix(*rotvecs[0].tolist()).T
+    else:
+        result[:, :3] += np.einsum('nij,nj->ni', axis_angles_to_matrices(rotvecs), offsets)
+
+    return result
+
+
+def distances_from_start(positions, start_pose) -> np.ndarray:
+    """
+    Euclidean distances of TCP positions from a start pose.
+
+    Attributes:
+        positions (np.ndarray): (N, 3) positions or (N, 6) poses in meters.
+        start_pose (list): Start pose as [Px, Py, Pz, ...].
+
+    Returns:
+        np.ndarray: (N,) distances in millimeters.
+    """
+    positions = np.asarray(positions, dtype=float)
+
+    return np.linalg.norm(positions[..., :3] - np.asarray(start_pose[:3], dtype=float), axis=-1) * 1000.0
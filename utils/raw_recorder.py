@@ -0,0 +1,110 @@
+import os
+import threading
+from utils.columnar import ColumnarWriter
+
+
+class RawRecorder(threading.Thread):
+    """
+    Records every sample of a set of SampleBuffers to the session directory at full rate.
+
+    The recorder runs in its own thread and consumes the buffers incrementally (read_from), so the
+    routine loop is never touched. Each source is written to raw_<name>.col in the columnar format
+    with the columns of its samples. When a source gains channels during the run (late JSON keys,
+    filtered channels) the file is closed and recording continues in raw_<name>_1.col, _2, ...
+
+    Arguments:
+        base_dir (str): Session directory.
+        sources (dict): Name to SampleBuffer mapping (Arduino nodes, robot state history).
+        interval (float): Time in seconds between drains.
+        codec (str): Columnar compression codec.
+
+    Attributes:
+        recorded (dict): Samples written per source.
+        lost (dict): Samples per source overwritten in the ring before they could be recorded.
+
+    Methods:
+        run(): Main threaded loop.
+        stop(): Record the remaining samples and close all files.
+    """
+
+    def __init__(self, base_dir: str, sources: dict, interval: float = 0.25, codec: str = 'zlib'):
+        super().__init__(daemon=True)
+
+        self.base_dir = base_dir
+        self.sources = sources
+        self.interval = interval
+        self.codec = codec
+
+        self.recorded = {name: 0 for name in sources}
+        self.lost = {name: 0 for name in sources}
+
+        # Only samples arriving from now on belong to this run
+        self._index = {name: buffer.count for name, buffer in sources.items()}
+        self._writers = {}
+        self._parts = {name: 0 for name in sources}
+        self._stop_event = threading.Event()
+
+    def _writer(self, name: str, columns: list):
+        """
+        Writer of a source for the given columns, rotated to a new file when the columns changed.
+        """
+        writer = self._writers.get(name)
+
+        if writer and writer.headers == columns:
+            return writer
+
+        if writer:
+            writer.close()
+            self._parts[name] += 1
+            print(f"Raw recorder: '{name}' has new channels, continuing in part {self._parts[name]}.")
+
+        suffix = f"_{self._parts[name]}" if self._parts[name] else ""
+        path = os.path.join(self.base_dir, f"raw_{name}{suffix}.col")
+        self._writers[name] = ColumnarWriter(path, columns, codec=self.codec)
+
+        return self._writers[name]
+
+    def _drain(self):
+        """
+        Writes all samples received since the previous drain.
+        """
+        for name, buffer in self.sources.items():
+            samples, self._index[name], lost = buffer.read_from(self._index[name])
+            self.lost[name] += lost
+
+            if len(samples) == 0:
+                continue
+
+            # Columns of the snapshot itself, the buffer may have gained channels since
+            writer = self._writer(name, list(samples.dtype.names))
+            writer.write_columns({column: samples[column] for column in writer.headers})
+            self.recorded[name] += len(samples)
+
+    def run(self):
+        """
+        Main loop: drains all sources at a fixed interval.
+        Note: Runs at separate thread!
+        """
+        while not self._stop_event.wait(self.interval):
+            try:
+                self._drain()
+            except Exception as e:
+                print(f"Raw recorder error: {e}")
+
+    def stop(self):
+        """
+        Stops the thread, records the remaining samples and closes all files.
+        """
+        self._stop_event.set()
+
+        if self.is_alive():
+            self.join()
+
+        self._drain()
+
+        for writer in self._writers.values():
+            writer.close()
+
+        summary = ", ".join(f"{name}: {count}" + (f" ({self.lost[name]} lost)" if self.lost[name] else "")
+                            for name, count in self.recorded.items())
+        print(f"Raw samples recorded to {self.base_dir}: {summary}")
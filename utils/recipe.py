@@ -0,0 +1,347 @@
+"""
+Unattended experiment recipes.
+
+A recipe is a JSON file with a sequence of routine runs, expanded from parameter grids and repeats:
+
+    {
+      "name": "velocity_sweep",
+      "tare": {"arduino": "force", "samples": 20, "wait": 2.0},
+      "zero": {"arduino_name": "force", "var_name": "force", "threshold": 0.05, "step_size_mm": 1,
+               "max_size_mm": 10, "mode": "single"},
+      "sequence": [
+        {"routine": "zero"},
+        {"routine": "indc", "params": {"arduino_name": "force", "var_name": "force", "total_dist_mm": 10},
+         "grid": {"vel": [0.002, 0.005, 0.01, 0.02, 0.05]}, "repeats": 3, "tare": true, "rezero": true}
+      ]
+    }
+
+Sequence entries:
+    routine (str): Routine command name as registered in main.py (zero, indc, indd, orient, ...).
+    params (dict): Routine arguments by name, "zero" entries default to the recipe's "zero" arguments.
+    grid (dict): Argument name to list of values, every combination is run.
+    repeats (int): Runs per grid point. Repeats are the outer loop, so slow drift is spread over all points.
+    tare (bool): Tare the recipe's sensor before every run.
+    rezero (bool): Run the recipe's "zero" routine before every run.
+    pause (float): Seconds to wait after every run.
+
+Progress is checkpointed after every run to <recipe>.progress.json next to the recipe file;
+running the same recipe again resumes after the last completed run.
+"""
+
+import os
+import json
+import time
+import hashlib
+import inspect
+import itertools
+from datetime import datetime, timedelta
+
+
+def load_recipe(path: str) -> dict:
+    """
+    Reads a recipe file.
+
+    Returns:
+        dict: The recipe.
+    """
+    with open(path) as handle:
+        recipe = json.load(handle)
+
+    if not recipe.get('sequence'):
+        raise ValueError(f"Recipe {path} has no sequence.")
+
+    return recipe
+
+
+def expand_runs(recipe: dict) -> list:
+    """
+    Expands the recipe sequence into the flat list of runs.
+
+    Returns:
+        list: One dict per run with routine, params, tare, rezero, pause and label.
+    """
+    runs = []
+
+    for entry in recipe['sequence']:
+        routine = entry['routine']
+        base = dict(recipe.get('zero', {})) if routine == 'zero' else {}
+        base.update(entry.get('params', {}))
+
+        grid = entry.get('grid', {})
+        names = list(grid)
+        points = list(itertools.product(*(grid[name] for name in names)))
+        repeats = int(entry.get('repeats', 1))
+
+        for repeat in range(repeats):
+            for point in points:
+                values = dict(zip(names, point))
+                label = " ".join([routine] + [f"{name}={value}" for name, value in values.items()])
+
+                if repeats > 1:
+                    label += f" #{repeat + 1}"
+
+                runs.append({
+                    'routine': routine,
+                    'params': dict(base, **values),
+                    'tare': bool(entry.get('tare', False)),
+                    'rezero': bool(entry.get('rezero', False)),
+                    'pause': float(entry.get('pause', 0.0)),
+                    'label': label,
+                })
+
+    return runs
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+
+    return f"{hours}h {rest // 60:02d}m" if hours else f"{rest // 60}m {rest % 60:02d}s"
+
+
+class RecipeRunner:
+    """
+    Runs experiment recipes with the registered routines back to back.
+
+    Every run is bound to its routine's run_logic() signature before anything moves, so a typo in
+    a recipe fails at load time and not after hours of measurements. After each completed run the
+    checkpoint is written, an interrupted or failed run stops the recipe and is repeated on resume.
+
+    Arguments:
+        routines (dict): Command name to routine instance, as registered in main.py.
+        arduinos (dict): Sensor nodes, used for taring.
+
+    Methods:
+        plan(path): Load, expand and validate a recipe.
+        estimate(recipe, runs, completed): Estimated duration of the remaining runs.
+        run(path, fresh, estimate_only): Run a recipe, resuming from its checkpoint unless fresh is set.
+    """
+
+    def __init__(self, routines: dict, arduinos: dict):
+        self.routines = routines
+        self.arduinos = arduinos
+
+    def _bind(self, routine: str, params: dict) -> tuple:
+        """
+        Maps named recipe parameters onto the positional arguments of execute().
+        """
+        if routine not in self.routines:
+            raise ValueError(f"Unknown routine '{routine}'.")
+
+        try:
+            bound = inspect.signature(self.routines[routine].run_logic).bind(**params)
+        except TypeError as e:
+            raise ValueError(f"Invalid parameters for '{routine}': {e}")
+
+        # Defaults are filled in so every parameter can be passed positionally
+        bound.apply_defaults()
+
+        if 'arduino_name' in bound.arguments and bound.arguments['arduino_name'] not in self.arduinos:
+            raise ValueError(f"Arduino '{bound.arguments['arduino_name']}' not found.")
+
+        return bound.args
+
+    def plan(self, path: str) -> tuple:
+        """
+        Loads a recipe and validates every run against the routines.
+
+        Returns:
+            tuple: (recipe, runs) with the positional arguments stored per run under 'args'.
+        """
+        recipe = load_recipe(path)
+        runs = expand_runs(recipe)
+
+        tare = recipe.get('tare')
+
+        if tare and tare.get('arduino') not in self.arduinos:
+            raise ValueError(f"Arduino '{tare.get('arduino')}' to tare not found.")
+
+        zero_args = self._bind('zero', recipe['zero']) if 'zero' in recipe else None
+
+        for run in runs:
+            if run['tare'] and not tare:
+                raise ValueError(f"Run '{run['label']}' requests a tare but the recipe has no 'tare' settings.")
+
+            if run['rezero'] and zero_args is None:
+                raise ValueError(f"Run '{run['label']}' requests rezeroing but the recipe has no 'zero' settings.")
+
+            run['args'] = self._bind(run['routine'], run['params'])
+
+        return recipe, runs
+
+    def _estimate_run(self, recipe: dict, run: dict) -> float | None:
+        """
+        Expected duration of one run including taring, rezeroing and the pause.
+        """
+        duration = self.routines[run['routine']].estimate_duration(*run['args'])
+
+        if duration is None:
+            return None
+
+        if run['tare']:
+            duration += recipe['tare'].get('wait', 2.0)
+
+        if run['rezero']:
+            duration += self.routines['zero'].estimate_duration(*self._bind('zero', recipe['zero']))
+
+        return duration + run['pause']
+
+    def estimate(self, recipe: dict, runs: list, completed: list) -> tuple:
+        """
+        Estimates the duration of the runs not completed yet.
+
+        Model estimates are scaled per routine by the measured/estimated ratio of the completed runs;
+        routines without a model use the mean measured duration of their completed runs.
+
+        Returns:
+            tuple: (seconds, number of runs that could not be estimated)
+        """
+        done = {record['index']: record for record in completed}
+        measured = {}
+
+        for record in completed:
+            entry = measured.setdefault(record['routine'], [0.0, 0.0, 0.0, 0])
+            entry[2] += record['duration_s']
+            entry[3] += 1
+
+            if record.get('estimate_s'):
+                entry[0] += record['duration_s']
+                entry[1] += record['estimate_s']
+
+        total = 0.0
+        unknown = 0
+
+        for index, run in enumerate(runs):
+            if index in done:
+                continue
+
+            actual, estimated, duration, count = measured.get(run['routine'], (0.0, 0.0, 0.0, 0))
+            expected = self._estimate_run(recipe, run)
+
+            if expected is not None:
+                total += expected * (actual / estimated if estimated else 1.0)
+            elif count:
+                total += duration / count
+            else:
+                unknown += 1
+
+        return total, unknown
+
+    def _tare(self, recipe: dict):
+        settings = recipe['tare']
+        samples = int(settings.get('samples', 20))
+
+        self.arduinos[settings['arduino']].send_command(f"tare:{samples}")
+        time.sleep(settings.get('wait', 2.0))
+
+    @staticmethod
+    def _load_checkpoint(path: str, digest: str) -> list:
+        if not os.path.exists(path):
+            return []
+
+        with open(path) as handle:
+            checkpoint = json.load(handle)
+
+        if checkpoint.get('digest') != digest:
+            print(f"Checkpoint {path} belongs to a different version of the recipe, starting over.")
+            return []
+
+        return checkpoint['completed']
+
+    @staticmethod
+    def _save_checkpoint(path: str, recipe_path: str, digest: str, completed: list):
+        # Written to a temporary file first, so an interruption never leaves a broken checkpoint
+        temporary = path + ".tmp"
+
+        with open(temporary, 'w') as handle:
+            json.dump({'recipe': recipe_path, 'digest': digest, 'completed': completed}, handle, indent=2)
+
+        os.replace(temporary, path)
+
+    def run(self, path: str, fresh: bool = False, estimate_only: bool = False):
+        """
+        Runs a recipe.
+
+        Arguments:
+            path (str): Recipe file.
+            fresh (bool): Ignore an existing checkpoint and start from the first run.
+            estimate_only (bool): Only print the plan and the estimated duration.
+        """
+        try:
+            recipe, runs = self.plan(path)
+        except (OSError, ValueError, KeyError, json.JSONDecodeError) as e:
+            print(f"Recipe error: {e}")
+            return
+
+        name = recipe.get('name', os.path.splitext(os.path.basename(path))[0])
+        checkpoint_path = os.path.splitext(path)[0] + ".progress.json"
+
+        # Runs are identified by their position, the digest ties the checkpoint to this expansion
+        digest = hashlib.sha1(json.dumps([[run['routine'], run['params'], run['tare'], run['rezero']]
+                                          for run in runs], sort_keys=True).encode()).hexdigest()
+
+        completed = [] if fresh else self._load_checkpoint(checkpoint_path, digest)
+        done = {record['index'] for record in completed}
+
+        total, unknown = self.estimate(recipe, runs, completed)
+        note = f" (+{unknown} runs without estimate)" if unknown else ""
+
+        print(f"Recipe '{name}': {len(runs)} runs, {len(done)} already completed.")
+        print(f"   Estimated duration: {_format_duration(total)}{note}")
+
+        if estimate_only:
+            for index, run in enumerate(runs):
+                print(f"   {'x' if index in done else ' '} {index + 1:3d}. {run['label']}")
+            return
+
+        try:
+            for index, run in enumerate(runs):
+                if index in done:
+                    continue
+
+                print(f"\n=== Run {index + 1}/{len(runs)}: {run['label']} ===")
+
+                expected = self._estimate_run(recipe, run)
+                sessions = set(os.listdir("logs")) if os.path.isdir("logs") else set()
+                started = time.time()
+
+                if run['tare']:
+                    self._tare(recipe)
+
+                if run['rezero'] and not self.routines['zero'].execute(*self._bind('zero', recipe['zero'])):
+                    print("Rezeroing failed, recipe stopped.")
+                    break
+
+                if not self.routines[run['routine']].execute(*run['args']):
+                    print(f"Run '{run['label']}' did not complete, recipe stopped.")
+                    break
+
+                time.sleep(run['pause'])
+
+                new_sessions = set(os.listdir("logs")) - sessions if os.path.isdir("logs") else set()
+
+                completed.append({
+                    'index': index,
+                    'label': run['label'],
+                    'routine': run['routine'],
+                    'params': run['params'],
+                    'started': datetime.fromtimestamp(started).isoformat(timespec='seconds'),
+                    'duration_s': time.time() - started,
+                    'estimate_s': expected,
+                    'sessions': sorted(new_sessions),
+                })
+                self._save_checkpoint(checkpoint_path, path, digest, completed)
+
+                remaining, unknown = self.estimate(recipe, runs, completed)
+                eta = (datetime.now() + timedelta(seconds=remaining)).strftime('%H:%M')
+                print(f"Run done in {completed[-1]['duration_s']:.1f}s. {len(completed)}/{len(runs)} completed, "
+                      f"remaining ~{_format_duration(remaining)} (ETA {eta}).")
+
+        except KeyboardInterrupt:
+            print("\nRecipe interrupted.")
+
+        if len(completed) == len(runs):
+            print(f"Recipe '{name}' complete. Progress saved to {checkpoint_path}")
+        else:
+            print(f"Recipe '{name}' stopped after {len(completed)}/{len(runs)} runs. "
+                  f"Run 'recipe {path}' again to resume.")
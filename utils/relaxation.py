@@ -0,0 +1,244 @@
+"""
+Stress relaxation capture and fitting.
+
+During every hold phase of a stepped indentation the full sensor waveform is appended to
+relaxation.col in the session directory (columns step, time since hold start, value). The fit
+stage models each curve with a Prony series
+
+    F(t) = F_inf + sum_i a_i * exp(-t / tau_i)        (i = 1 .. terms)
+
+for all curves of one or more sessions in a single vectorized batch: the time constants are
+searched on a log-spaced grid, where the amplitudes follow from a linear least squares problem
+solved for every curve and candidate at once. Results go to relaxation_fit.csv next to the data.
+"""
+
+import os
+import sys
+import csv
+import numpy as np
+from itertools import combinations
+from utils.columnar import ColumnarWriter, ColumnarReader
+
+STORE_NAME = "relaxation.col"
+FIT_NAME = "relaxation_fit.csv"
+
+
+class RelaxationStore:
+    """
+    Per step waveform store of one session.
+
+    Arguments:
+        base_dir (str): Session directory.
+
+    Methods:
+        add(step, timestamps, values, t0): Append the hold phase waveform of one step.
+        close(): Finish the file.
+    """
+
+    def __init__(self, base_dir: str):
+        self.path = os.path.join(base_dir, STORE_NAME)
+        self.writer = ColumnarWriter(self.path, ['step', 'time', 'value'], dtypes=['i8', 'f8', 'f8'])
+        self.steps = 0
+
+    def add(self, step: int, timestamps: np.ndarray, values: np.ndarray, t0: float):
+        """
+        Appends one hold phase, samples without a value are skipped.
+
+        Arguments:
+            step (int): Step index.
+            timestamps (np.ndarray): Sample times (monotonic seconds).
+            values (np.ndarray): Sample values.
+            t0 (float): Start of the hold phase (monotonic seconds).
+        """
+        valid = ~np.isnan(values)
+
+        if not valid.any():
+            return
+
+        self.writer.write_columns({
+            'step': np.full(int(valid.sum()), step),
+            'time': timestamps[valid] - t0,
+            'value': values[valid],
+        })
+        self.steps += 1
+
+    def close(self):
+        self.writer.close()
+
+
+def load_curves(path: str) -> list:
+    """
+    Reads all hold phase curves of a relaxation store.
+
+    Returns:
+        list: (step, times, values) per step.
+    """
+    with ColumnarReader(path) as reader:
+        data = reader.read()
+
+    steps, starts = np.unique(data['step'], return_index=True)
+    bounds = list(starts) + [len(data['step'])]
+
+    # Steps are written in order, so every step is one contiguous block
+    return [(int(step), data['time'][bounds[i]:bounds[i + 1]], data['value'][bounds[i]:bounds[i + 1]])
+            for i, step in enumerate(steps)]
+
+
+def _resample(curves: list, points: int) -> tuple:
+    """
+    Puts all curves on one common time grid from 0 to the longest hold, masking times past each curve's end.
+    """
+    duration = max(float(times[-1]) for _, times, _ in curves)
+    grid = np.linspace(0.0, duration, points)
+
+    values = np.zeros((len(curves), points))
+    mask = np.zeros((len(curves), points))
+
+    for idx, (_, times, curve) in enumerate(curves):
+        inside = (grid >= times[0]) & (grid <= times[-1])
+        values[idx, inside] = np.interp(grid[inside], times, curve)
+        mask[idx, inside] = 1.0
+
+    return grid, values, mask
+
+
+def fit_prony(curves: list, terms: int = 2, points: int = 200, taus: np.ndarray = None, block: int = 256) -> list:
+    """
+    Fits a Prony series to every curve in one vectorized pass.
+
+    Arguments:
+        curves (list): (step, times, values) per curve, e.g. from load_curves().
+        terms (int): Number of exponential terms (1 or 2).
+        points (int): Resampled points per curve.
+        taus (np.ndarray): Candidate time constants in seconds, log-spaced over the hold duration when None.
+        block (int): Curves solved per batch, bounds the memory use.
+
+    Returns:
+        list: One dict per curve with step, f_inf, a1, tau1[, a2, tau2], rmse, r2 and samples.
+    """
+    curves = [c for c in curves if len(c[1]) >= terms + 2]
+
+    if not curves:
+        return []
+
+    grid, values, mask = _resample(curves, points)
+
+    if taus is None:
+        dt = grid[1] - grid[0]
+        taus = np.geomspace(max(dt, 1e-3), 5.0 * grid[-1], 48)
+
+    # Candidate time constant sets; Prony terms must be distinct to stay identifiable
+    candidates = np.array([c for c in combinations(taus, terms) if terms == 1 or c[1] / c[0] >= 2.0])
+
+    # Basis per candidate: (candidates, points, terms + 1)
+    basis = np.concatenate((np.ones((len(candidates), points, 1)),
+                            np.exp(-grid[None, :, None] / candidates[:, None, :])), axis=2)
+
+    size = terms + 1
+    ridge = 1e-9 * np.eye(size)
+    results = []
+
+    # Outer products of the basis, so the normal equations of a block are one matrix product
+    outer = np.einsum('pmi,pmj->mpij', basis, basis).reshape(points, -1)
+    flat_basis = basis.transpose(1, 0, 2).reshape(points, -1)
+
+    for start in range(0, len(curves), block):
+        y = values[start:start + block]
+        w = mask[start:start + block]
+
+        # Weighted normal equations of all curves and candidates at once
+        ata = (w @ outer).reshape(len(w), -1, size, size) + ridge
+        aty = ((w * y) @ flat_basis).reshape(len(w), -1, size)
+        coef = np.linalg.solve(ata, aty[..., None])[..., 0]
+
+        # Residual sum of squares of a least squares solution: y'Wy - coef'A'Wy
+        yy = np.einsum('sm,sm->s', w * y, y)
+        sse = np.maximum(yy[:, None] - np.einsum('spi,spi->sp', coef, aty), 0.0)
+
+        best = sse.argmin(axis=1)
+
+        for local, idx in enumerate(best):
+            step, times, _ = curves[start + local]
+            n = w[local].sum()
+            mean = (w[local] * y[local]).sum() / n
+            sst = (w[local] * (y[local] - mean) ** 2).sum()
+
+            result = {'step': step, 'f_inf': float(coef[local, idx, 0])}
+
+            # Terms ordered by time constant (fast first)
+            for term in range(terms):
+                result[f'a{term + 1}'] = float(coef[local, idx, term + 1])
+                result[f'tau{term + 1}'] = float(candidates[idx, term])
+
+            result['rmse'] = float(np.sqrt(sse[local, idx] / n))
+            result['r2'] = float(1.0 - sse[local, idx] / sst) if sst > 0 else 0.0
+            result['samples'] = len(times)
+            results.append(result)
+
+    return results
+
+
+def write_fit(path: str, results: list):
+    """
+    Writes fitted parameters as CSV.
+    """
+    if not results:
+        return
+
+    with open(path, 'w', newline='') as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def fit_sessions(session_dirs: list, terms: int = 2) -> dict:
+    """
+    Fits the relaxation curves of several sessions in one batch and writes relaxation_fit.csv
+    into every session directory.
+
+    Returns:
+        dict: Session directory to list of fit results.
+    """
+    curves, owners = [], []
+
+    for session in session_dirs:
+        path = os.path.join(session, STORE_NAME)
+
+        if not os.path.exists(path):
+            print(f"No relaxation data in: {session}")
+            continue
+
+        for curve in load_curves(path):
+            curves.append(curve)
+            owners.append(session)
+
+    fitted = {}
+
+    # Step numbers are only unique per session, the result order follows the input order
+    results = fit_prony(curves, terms=terms)
+    kept = [owner for owner, curve in zip(owners, curves) if len(curve[1]) >= terms + 2]
+
+    for owner, result in zip(kept, results):
+        fitted.setdefault(owner, []).append(result)
+
+    for session, session_results in fitted.items():
+        write_fit(os.path.join(session, FIT_NAME), session_results)
+        print(f"Relaxation fit saved to: {os.path.join(session, FIT_NAME)}")
+
+    return fitted
+
+
+if __name__ == '__main__':
+    # Usage: python -m utils.relaxation [--terms N] <session_dir> [<session_dir> ...]
+    args = sys.argv[1:]
+    n_terms = 2
+
+    if len(args) >= 2 and args[0] == '--terms':
+        n_terms = int(args[1])
+        args = args[2:]
+
+    if not args:
+        print("Usage: python -m utils.relaxation [--terms N] <session_dir> [<session_dir> ...]")
+        sys.exit(1)
+
+    fit_sessions(args, terms=n_terms)
@@ -0,0 +1,371 @@
+import math
+from multiprocessing import shared_memory
+import numpy as np
+
+
+class SampleBuffer:
+    """
+    Preallocated ring buffer of timestamped samples backed by a structured NumPy array.
+
+    A single writer (the acquisition thread) appends samples; any number of readers take
+    snapshots without locking. Consistency is guaranteed seqlock-style: the writer publishes
+    the slots it is about to overwrite before writing and commits the new count afterwards,
+    readers validate their copy against both counters and retry when it was overwritten.
+
+    Arguments:
+        capacity (int): Number of samples kept in memory.
+        channels (list): Optional channel names known up front, others are added on first use.
+
+    Attributes:
+        capacity (int): Number of samples kept in memory.
+        channels (list): Channel names stored next to the 'timestamp' column.
+        count (int): Total number of samples ever written.
+
+    Methods:
+        append(timestamp, values): Store one sample.
+        extend(timestamps, columns): Store a batch of samples.
+        latest(key): Latest value of a channel.
+        last(n): Snapshot of the last n samples.
+        since(t0): Snapshot of all samples with timestamp >= t0.
+        read_from(index): Snapshot of all samples written since a given count.
+        stats(key, n, t0): Mean/std/min/max over a sample or time window.
+    """
+
+    def __init__(self, capacity: int = 65536, channels: list | None = None):
+        self.capacity = int(capacity)
+        self.channels = []
+
+        self._data = np.zeros(self.capacity, dtype=[('timestamp', 'f8')])
+
+        # Seqlock counters: slots up to _reserved may be in flight, up to _count are committed
+        self._reserved = 0
+        self._count = 0
+        self._last_timestamp = -math.inf
+
+        if channels:
+            self._add_channels(channels)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def _add_channels(self, names):
+        """
+        Adds channel columns by swapping in a widened copy of the storage array.
+        Readers holding a reference to the old array keep a valid (stale) view.
+        """
+        new = [name for name in names if name not in self.channels and name != 'timestamp']
+
+        if not new:
+            return
+
+        dtype = np.dtype(self._data.dtype.descr + [(name, 'f8') for name in new])
+        data = np.full(self.capacity, np.nan, dtype=dtype)
+
+        for name in self._data.dtype.names:
+            data[name] = self._data[name]
+
+        self._data = data
+        self.channels = self.channels + new
+
+    def append(self, timestamp: float, values: dict):
+        """
+        Store a single sample. Missing channels are stored as NaN.
+
+        Arguments:
+            timestamp (float): Monotonic acquisition time in seconds.
+            values (dict): Channel name to value mapping.
+        """
+        if any(key not in self.channels for key in values):
+            self._add_channels(list(values))
+
+        # Keep the timestamp column sorted for binary searches
+        timestamp = max(timestamp, self._last_timestamp)
+        self._last_timestamp = timestamp
+
+        count = self._count
+        self._reserved = count + 1
+
+        self._data[count % self.capacity] = (timestamp, *[values.get(name, math.nan) for name in self.channels])
+
+        self._count = count + 1
+
+    def extend(self, timestamps: np.ndarray, columns: dict):
+        """
+        Store a batch of samples with vectorized slice assignments.
+
+        Arguments:
+            timestamps (np.ndarray): Monotonic acquisition times in seconds.
+            columns (dict): Channel name to array mapping, each with the length of timestamps.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        size = len(timestamps)
+
+        if size == 0:
+            return
+
+        if any(key not in self.channels for key in columns):
+            self._add_channels(list(columns))
+
+        # Only the most recent samples fit when the batch exceeds the capacity
+        skip = max(0, size - self.capacity)
+        timestamps = np.maximum.accumulate(np.maximum(timestamps[skip:], self._last_timestamp))
+        self._last_timestamp = float(timestamps[-1])
+
+        count = self._count + skip
+        size -= skip
+        self._reserved = count + size
+
+        data = self._data
+        start = count % self.capacity
+        first = min(size, self.capacity - start)
+
+        for name in data.dtype.names:
+            if name == 'timestamp':
+                values = timestamps
+            elif name in columns:
+                values = np.asarray(columns[name], dtype=np.float64)[skip:]
+            else:
+                values = np.full(size, np.nan)
+
+            data[name][start:start + first] = values[:first]
+            data[name][:size - first] = values[first:]
+
+        self._count = count + size
+
+    def latest(self, key: str) -> float | None:
+        """
+        Latest value of a channel in O(1).
+
+        Arguments:
+            key (str): Channel name.
+
+        Returns:
+            float | None: Latest value, or None if no sample holds this channel.
+        """
+        count = self._count
+        data = self._data
+
+        if count == 0 or key not in data.dtype.names:
+            return None
+
+        value = float(data[key][(count - 1) % self.capacity])
+
+        return None if math.isnan(value) else value
+
+    def _copy(self, data, field, start: int, end: int) -> np.ndarray:
+        """
+        Copies logical sample indices [start, end) out of the ring.
+        """
+        source = data if field is None else data[field]
+        length = end - start
+        offset = start % self.capacity
+
+        if offset + length <= self.capacity:
+            return source[offset:offset + length].copy()
+
+        return np.concatenate((source[offset:], source[:offset + length - self.capacity]))
+
+    def _search(self, data, t0: float, start: int, end: int) -> int:
+        """
+        Binary search for the first logical index in [start, end) with timestamp >= t0.
+        """
+        timestamps = data['timestamp']
+
+        while start < end:
+            mid = (start + end) // 2
+
+            if timestamps[mid % self.capacity] < t0:
+                start = mid + 1
+            else:
+                end = mid
+
+        return start
+
+    def _snapshot(self, field=None, n: int | None = None, t0: float | None = None,
+                  index: int | None = None) -> tuple:
+        """
+        Consistent copy of a window of the ring, retried if the writer overtook the reader.
+
+        Returns:
+            tuple: (array, start index, end index) of the copied logical range.
+        """
+        while True:
+            end = self._count
+            data = self._data
+            oldest = max(0, end - self.capacity)
+
+            if field is not None and field not in data.dtype.names:
+                return np.empty(0), end, end
+
+            if n is not None:
+                start = max(oldest, end - n)
+            elif t0 is not None:
+                start = self._search(data, t0, oldest, end)
+            elif index is not None:
+                start = min(max(oldest, index), end)
+            else:
+                start = oldest
+
+            snapshot = self._copy(data, field, start, end)
+
+            # Valid only if none of the copied slots was (being) overwritten meanwhile
+            if start >= self._reserved - self.capacity:
+                return snapshot, start, end
+
+    def last(self, n: int) -> np.ndarray:
+        """
+        Snapshot of the last n samples as a structured array (oldest first).
+        """
+        return self._snapshot(n=n)[0]
+
+    def since(self, t0: float) -> np.ndarray:
+        """
+        Snapshot of all samples with timestamp >= t0 as a structured array (oldest first).
+        """
+        return self._snapshot(t0=t0)[0]
+
+    def read_from(self, index: int) -> tuple:
+        """
+        Snapshot of all samples written since a previous count, for incremental consumers.
+
+        Arguments:
+            index (int): Count returned by a previous call (0 to start at the oldest sample).
+
+        Returns:
+            tuple: (structured array, next index, number of samples lost to overwriting).
+        """
+        samples, start, end = self._snapshot(index=index)
+
+        return samples, end, max(0, start - index)
+
+    def stats(self, key: str, n: int | None = None, t0: float | None = None) -> dict | None:
+        """
+        Vectorized statistics of a channel over the last n samples or since t0.
+        NaN entries (samples without this channel) are ignored.
+
+        Arguments:
+            key (str): Channel name.
+            n (int | None): Number of most recent samples.
+            t0 (float | None): Start of the time window (used when n is None).
+
+        Returns:
+            dict | None: mean, std, min, max and count, or None without valid samples.
+        """
+        # Only the requested channel is copied, the time window is searched on the timestamps
+        values = self._snapshot(field=key, n=n, t0=t0)[0]
+        values = values[~np.isnan(values)]
+
+        if len(values) == 0:
+            return None
+
+        return {
+            'mean': float(values.mean()),
+            'std': float(values.std()),
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'count': len(values),
+        }
+
+
+class SharedSampleBuffer(SampleBuffer):
+    """
+    SampleBuffer placed in multiprocessing shared memory, written by one process and read by others.
+
+    The storage array and the seqlock counters live in the shared block, so readers in any process
+    use the normal SampleBuffer API directly on the mapped ring (only the requested window is
+    copied, nothing is sent through pipes). The channels are fixed at creation; values of other
+    channels are ignored.
+
+    Layout: int64 [reserved, count], float64 [last timestamp, heartbeat], structured samples.
+
+    Arguments:
+        capacity (int): Number of samples kept in memory.
+        channels (list): Channel names.
+        name (str): Attach to an existing block instead of creating one.
+
+    Attributes:
+        name (str): Shared memory block name, used to attach from another process.
+        heartbeat (float): Last time.monotonic() at which the writer reported being alive.
+
+    Methods:
+        close(unlink): Detach, and free the block when unlink is set (creator only).
+    """
+
+    HEADER_BYTES = 32
+
+    def __init__(self, capacity: int = 65536, channels: list | None = None, name: str | None = None):
+        self.capacity = int(capacity)
+        self.channels = [c for c in dict.fromkeys(channels or []) if c != 'timestamp']
+        self._ignored = set()
+
+        dtype = np.dtype([('timestamp', 'f8')] + [(name_, 'f8') for name_ in self.channels])
+        size = self.HEADER_BYTES + self.capacity * dtype.itemsize
+
+        self.shm = shared_memory.SharedMemory(name=name) if name else \
+            shared_memory.SharedMemory(create=True, size=size)
+        self.name = self.shm.name
+
+        self._counters = np.ndarray(2, dtype=np.int64, buffer=self.shm.buf)
+        self._times = np.ndarray(2, dtype=np.float64, buffer=self.shm.buf, offset=16)
+        self._data = np.ndarray(self.capacity, dtype=dtype, buffer=self.shm.buf, offset=self.HEADER_BYTES)
+
+        if not name:
+            self._counters[:] = 0
+            self._times[:] = (-math.inf, 0.0)
+            self._data[:] = np.nan
+
+    # Counters are kept in the shared block, the SampleBuffer code uses them as plain attributes
+    @property
+    def _reserved(self) -> int:
+        return int(self._counters[0])
+
+    @_reserved.setter
+    def _reserved(self, value: int):
+        self._counters[0] = value
+
+    @property
+    def _count(self) -> int:
+        return int(self._counters[1])
+
+    @_count.setter
+    def _count(self, value: int):
+        self._counters[1] = value
+
+    @property
+    def _last_timestamp(self) -> float:
+        return float(self._times[0])
+
+    @_last_timestamp.setter
+    def _last_timestamp(self, value: float):
+        self._times[0] = value
+
+    @property
+    def heartbeat(self) -> float:
+        return float(self._times[1])
+
+    @heartbeat.setter
+    def heartbeat(self, value: float):
+        self._times[1] = value
+
+    def _add_channels(self, names):
+        """
+        The shared layout cannot grow: unknown channels are reported once and dropped.
+        """
+        new = [name for name in names if name not in self.channels and name != 'timestamp'
+               and name not in self._ignored]
+
+        if new:
+            self._ignored.update(new)
+            print(f"Shared sample buffer: ignoring undeclared channels {', '.join(new)}")
+
+    def close(self, unlink: bool = False):
+        # Views on the block must be released before it can be closed
+        self._counters = self._times = self._data = None
+        self.shm.close()
+
+        if unlink:
+            self.shm.unlink()
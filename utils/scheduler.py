@@ -0,0 +1,133 @@
+"""
+Fixed-rate timing for control loops.
+
+RTDE initPeriod()/waitPeriod() time every cycle relative to its own start, so a late cycle
+silently shifts all following ones and overruns go unnoticed. PeriodicScheduler keeps absolute
+release times instead and accounts for every cycle that misses its deadline.
+"""
+
+import time
+import numpy as np
+
+
+class PeriodicScheduler:
+    """
+    Fixed-period loop timing on absolute deadlines with deadline-miss accounting.
+
+    Release k is scheduled at start + k * period and the deadline of a cycle is the next release.
+    wait() sleeps until that release, the last part busy-waiting because sleep() overshoots by
+    tens to hundreds of microseconds. A cycle that ends after its deadline counts as a miss; the
+    schedule then restarts from now instead of firing the skipped releases back to back.
+
+    Arguments:
+        period (float): Loop period in seconds.
+        spin (float): Final part of every wait in seconds that is busy-waited. Default is 0.0002.
+        history (int): Number of recent cycles kept for the jitter statistics. Default is 65536.
+
+    Attributes:
+        iterations (int): Completed cycles.
+        misses (int): Cycles that ended after their deadline.
+        skipped (int): Releases skipped after misses.
+        release (float): Actual start (time.monotonic()) of the current cycle.
+        lateness (float): Delay in seconds of the current release after its scheduled time.
+        busy (float): Time in seconds the previous cycle spent before calling wait().
+
+    Methods:
+        start(): Releases the first cycle now.
+        wait(): Ends the current cycle and waits for the next release.
+        remaining(): Time left in the current cycle.
+        stats(): Deadline misses and jitter statistics.
+    """
+
+    def __init__(self, period: float, spin: float = 0.0002, history: int = 65536):
+        self.period = period
+        self.spin = spin
+
+        self.iterations = 0
+        self.misses = 0
+        self.skipped = 0
+        self.release = 0.0
+        self.lateness = 0.0
+        self.busy = 0.0
+
+        # Ring of (lateness, busy) per cycle
+        self._history = np.zeros((int(history), 2))
+        self._next = 0.0
+
+    def start(self) -> float:
+        """
+        Returns:
+            float: Release time of the first cycle.
+        """
+        self.release = time.monotonic()
+        self._next = self.release + self.period
+
+        return self.release
+
+    def wait(self) -> float:
+        """
+        Returns:
+            float: Release time of the next cycle.
+        """
+        now = time.monotonic()
+        scheduled = self._next
+        missed = now > scheduled
+
+        self.busy = now - self.release
+
+        if missed:
+            self.misses += 1
+            self.skipped += int((now - scheduled) / self.period)
+        else:
+            remaining = scheduled - now - self.spin
+
+            if remaining > 0:
+                time.sleep(remaining)
+
+            while time.monotonic() < scheduled:
+                pass
+
+        self.release = time.monotonic()
+        self.lateness = self.release - scheduled
+
+        # After a miss the schedule restarts at this release
+        self._next = (self.release if missed else scheduled) + self.period
+
+        self._history[self.iterations % len(self._history)] = (self.lateness, self.busy)
+        self.iterations += 1
+
+        return self.release
+
+    def remaining(self) -> float:
+        """
+        Returns:
+            float: Seconds until the scheduled next release (negative once the deadline has passed).
+        """
+        return self._next - time.monotonic()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: iterations, misses, miss_rate, skipped and the p50/p99/max release lateness and
+                  cycle busy time in ms over the kept history.
+        """
+        history = self._history[:min(self.iterations, len(self._history))] * 1000.0
+
+        if len(history) == 0:
+            history = np.zeros((1, 2))
+
+        lateness_p50, lateness_p99 = np.percentile(history[:, 0], [50, 99])
+        busy_p50, busy_p99 = np.percentile(history[:, 1], [50, 99])
+
+        return {
+            'iterations': self.iterations,
+            'misses': self.misses,
+            'miss_rate': self.misses / self.iterations if self.iterations else 0.0,
+            'skipped': self.skipped,
+            'lateness_p50_ms': float(lateness_p50),
+            'lateness_p99_ms': float(lateness_p99),
+            'lateness_max_ms': float(history[:, 0].max()),
+            'busy_p50_ms': float(busy_p50),
+            'busy_p99_ms': float(busy_p99),
+            'busy_max_ms': float(history[:, 1].max()),
+        }
@@ -0,0 +1,102 @@
+import time
+import numpy as np
+
+
+def window_fit(timestamps: np.ndarray, values: np.ndarray) -> tuple:
+    """
+    Least squares line through a window of samples.
+
+    Arguments:
+        timestamps (np.ndarray): Sample times in seconds.
+        values (np.ndarray): Sample values.
+
+    Returns:
+        tuple: (slope in units per second, standard deviation of the residuals)
+    """
+    t = timestamps - timestamps.mean()
+    y = values - values.mean()
+
+    denominator = float(np.dot(t, t))
+    slope = float(np.dot(t, y)) / denominator if denominator > 0 else 0.0
+
+    return slope, float(np.std(y - slope * t))
+
+
+class SettleDetector:
+    """
+    Detects when a signal has settled after a motion, from the samples arriving after it.
+
+    The signal is settled once the most recent window of samples is flat (|slope| <= slope_tol)
+    and quiet (residual std <= std_tol). Only samples received after wait() was called count,
+    so the decision never uses data from before the motion ended.
+
+    Arguments:
+        buffer (SampleBuffer): Sample source (e.g. ArduinoNode.samples).
+        key (str): Channel to watch.
+        window (float): Length of the evaluated window in seconds.
+        slope_tol (float): Maximum absolute slope in units per second.
+        std_tol (float): Maximum residual standard deviation in units.
+        min_samples (int): Minimum number of samples in the window.
+        poll_interval (float): Time in seconds between evaluations.
+
+    Methods:
+        wait(timeout): Block until settled or timed out.
+    """
+
+    def __init__(self, buffer, key: str, window: float = 0.3, slope_tol: float = 0.05, std_tol: float = 0.05,
+                 min_samples: int = 8, poll_interval: float = 0.005):
+        self.buffer = buffer
+        self.key = key
+        self.window = window
+        self.slope_tol = slope_tol
+        self.std_tol = std_tol
+        self.min_samples = min_samples
+        self.poll_interval = poll_interval
+
+    def wait(self, timeout: float) -> dict:
+        """
+        Blocks until the signal settles or the timeout expires.
+
+        Arguments:
+            timeout (float): Maximum waiting time in seconds.
+
+        Returns:
+            dict: settled (bool), settle_time (s), slope, std and samples of the last evaluated window.
+        """
+        start = time.monotonic()
+        index = self.buffer.count
+
+        timestamps = np.empty(0)
+        values = np.empty(0)
+        result = {'settled': False, 'settle_time': 0.0, 'slope': None, 'std': None, 'samples': 0}
+
+        while True:
+            new, index, _ = self.buffer.read_from(index)
+
+            valid = ~np.isnan(new[self.key]) if len(new) and self.key in new.dtype.names else None
+
+            # Batches without a value of this channel (e.g. other JSON lines) leave the window as is
+            if valid is not None and valid.any():
+                timestamps = np.concatenate((timestamps, new['timestamp'][valid]))
+                values = np.concatenate((values, new[self.key][valid]))
+
+                # Keep only the evaluated window
+                keep = timestamps >= timestamps[-1] - self.window
+                timestamps, values = timestamps[keep], values[keep]
+
+                # Evaluate once the window is covered by samples taken after the motion
+                covered = timestamps[-1] - start >= self.window
+
+                if covered and len(values) >= self.min_samples:
+                    slope, std = window_fit(timestamps, values)
+                    result.update(slope=slope, std=std, samples=len(values))
+
+                    if abs(slope) <= self.slope_tol and std <= self.std_tol:
+                        result.update(settled=True, settle_time=time.monotonic() - start)
+                        return result
+
+            if time.monotonic() - start >= timeout:
+                result['settle_time'] = time.monotonic() - start
+                return result
+
+            time.sleep(self.poll_interval)
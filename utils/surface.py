@@ -0,0 +1,194 @@
+"""
+Geometry of surface maps.
+
+A map is defined by three taught TCP poses on the sample: the origin corner, the corner at the end
+of the first row (u direction) and the corner at the end of the first column (v direction). Points
+are addressed in millimeters (u, v) in that plane and visited with the orientation of the origin
+corner; indentation is along Tool Z.
+"""
+
+import json
+import numpy as np
+from utils.math_tools import offset_poses_along_tool, rotation_matrix
+
+
+def load_corners(path: str) -> list:
+    """
+    Reads the taught corners (JSON list of three poses [x, y, z, rx, ry, rz]).
+    """
+    with open(path) as handle:
+        corners = json.load(handle)
+
+    if len(corners) != 3 or any(len(pose) != 6 for pose in corners):
+        raise ValueError(f"{path} must hold three poses: origin, end of row (u), end of column (v).")
+
+    return corners
+
+
+def save_corners(path: str, corners: list):
+    with open(path, 'w') as handle:
+        json.dump([list(map(float, pose)) for pose in corners], handle, indent=2)
+
+
+def plane_from_corners(corners: list) -> dict:
+    """
+    Builds the map frame from the taught corners.
+
+    Returns:
+        dict: origin pose, unit vectors u and v spanning the plane (v orthogonal to u),
+              extent of the map in mm along u and v, and the tool axis.
+    """
+    corners = np.asarray(corners, dtype=float)
+    origin = corners[0]
+
+    edge_u = corners[1, :3] - origin[:3]
+    edge_v = corners[2, :3] - origin[:3]
+
+    u = edge_u / np.linalg.norm(edge_u)
+    v = edge_v - np.dot(edge_v, u) * u
+    v /= np.linalg.norm(v)
+
+    return {
+        'origin': origin,
+        'u': u,
+        'v': v,
+        'size_mm': (float(np.linalg.norm(edge_u)) * 1000.0, float(np.dot(edge_v, v)) * 1000.0),
+        'axis': rotation_matrix(*origin[3:])[:, 2].copy(),
+    }
+
+
+def grid_points(size_mm: tuple, rows: int, cols: int) -> np.ndarray:
+    """
+    Regular rows x cols grid covering the map.
+
+    Returns:
+        np.ndarray: (rows * cols, 4) array of row, col, u_mm, v_mm in row-major order.
+    """
+    u = np.linspace(0.0, size_mm[0], cols) if cols > 1 else np.zeros(1)
+    v = np.linspace(0.0, size_mm[1], rows) if rows > 1 else np.zeros(1)
+    row, col = np.divmod(np.arange(rows * cols), cols)
+
+    return np.column_stack((row, col, u[col], v[row]))
+
+
+def plane_poses(plane: dict, uv_mm: np.ndarray, offset_mm=0.0) -> np.ndarray:
+    """
+    TCP poses of plane points, shifted along Tool Z by offset_mm (negative = above the surface).
+
+    Arguments:
+        plane (dict): Frame from plane_from_corners().
+        uv_mm (np.ndarray): (N, 2) plane coordinates in mm.
+        offset_mm (float | np.ndarray): Offset along Tool Z in mm, scalar or one per point.
+
+    Returns:
+        np.ndarray: (N, 6) poses.
+    """
+    uv = np.asarray(uv_mm, dtype=float).reshape(-1, 2) / 1000.0
+
+    poses = np.tile(plane['origin'], (len(uv), 1))
+    poses[:, :3] += uv[:, :1] * plane['u'] + uv[:, 1:] * plane['v']
+
+    offsets = np.zeros((len(uv), 3))
+    offsets[:, 2] = offset_mm
+
+    return offset_poses_along_tool(poses, offsets)
+
+
+def path_length(points: np.ndarray, order: np.ndarray) -> float:
+    """
+    Length of the open path visiting points in the given order.
+    """
+    points = np.asarray(points, dtype=float)[order]
+
+    return float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
+
+
+def visit_order(points: np.ndarray, start: int = 0, max_passes: int = 50) -> np.ndarray:
+    """
+    Short open path through all points: nearest neighbour tour improved by 2-opt.
+    On a regular grid this yields a serpentine raster.
+
+    Arguments:
+        points (np.ndarray): (N, D) point coordinates.
+        start (int): Index of the first point (e.g. the one closest to the robot).
+        max_passes (int): Upper bound on 2-opt passes.
+
+    Returns:
+        np.ndarray: Visit order as indices into points.
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+
+    if n < 3:
+        return np.roll(np.arange(n), -start)
+
+    dist = np.linalg.norm(points[:, None, :] - points[None, :, :], axis=-1)
+
+    # Nearest neighbour construction
+    order = np.empty(n, dtype=int)
+    order[0] = start
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+
+    for idx in range(1, n):
+        candidates = np.where(visited, np.inf, dist[order[idx - 1]])
+        order[idx] = int(np.argmin(candidates))
+        visited[order[idx]] = True
+
+    # 2-opt: reversing order[i + 1 .. j] replaces edges (i, i + 1), (j, j + 1) by (i, j), (i + 1, j + 1)
+    for _ in range(max_passes):
+        improved = False
+
+        for i in range(n - 2):
+            a, b = order[i], order[i + 1]
+            c = order[i + 2:]
+            following = np.append(order[i + 3:], -1)
+            has_next = following >= 0
+
+            gain = dist[a, b] - dist[a, c]
+            gain += np.where(has_next, dist[c, following] - dist[b, following], 0.0)
+
+            best = int(np.argmax(gain))
+
+            if gain[best] > 1e-12:
+                j = i + 2 + best
+                order[i + 1:j + 1] = order[i + 1:j + 1][::-1]
+                improved = True
+
+        if not improved:
+            break
+
+    return order
+
+
+class SurfaceModel:
+    """
+    Least squares plane through the measured surface offsets, predicts where the next contact is.
+
+    Offsets are measured along Tool Z in mm relative to the taught plane. With fewer than three
+    points the last offset (or zero) is used.
+
+    Methods:
+        add(u, v, offset): Add a measured point.
+        predict(u, v): Expected offset at a plane point.
+    """
+
+    def __init__(self):
+        self.points = []
+
+    def add(self, u: float, v: float, offset: float):
+        self.points.append((u, v, offset))
+
+    def predict(self, u: float, v: float) -> float:
+        if len(self.points) < 3:
+            return self.points[-1][2] if self.points else 0.0
+
+        data = np.asarray(self.points)
+        design = np.column_stack((np.ones(len(data)), data[:, 0], data[:, 1]))
+        coef, _, rank, _ = np.linalg.lstsq(design, data[:, 2], rcond=None)
+
+        # Collinear points (first row of a grid) do not define a plane
+        if rank < 3:
+            return float(data[-1, 2])
+
+        return float(coef[0] + coef[1] * u + coef[2] * v)
@@ -0,0 +1,112 @@
+import math
+import numpy as np
+from utils.math_tools import offset_poses_along_tool
+
+
+def plan_tool_z_steps(start_pose, step_mm: float, steps: int) -> np.ndarray:
+    """
+    Plans all targets of a stepped move along the Tool Z axis in one vectorized pass.
+    Targets are absolute offsets from the start pose, so errors do not accumulate over the steps.
+
+    Arguments:
+        start_pose (list): Start pose as [Px, Py, Pz, Rx, Ry, Rz].
+        step_mm (float): Step size along Tool Z in millimeters.
+        steps (int): Number of steps.
+
+    Returns:
+        np.ndarray: (steps, 6) array of target poses, orientation kept constant.
+    """
+    offsets = np.zeros((steps, 3))
+    offsets[:, 2] = np.arange(1, steps + 1) * step_mm
+
+    return offset_poses_along_tool(np.tile(np.asarray(start_pose, dtype=float), (steps, 1)), offsets)
+
+
+def move_duration(length: float, vel: float, acc: float) -> float:
+    """
+    Duration of a straight move with a trapezoidal (or, for short moves, triangular) velocity profile.
+
+    Arguments:
+        length (float): Distance in m.
+        vel (float): Maximum speed in m/s.
+        acc (float): Acceleration in m/s^2.
+
+    Returns:
+        float: Duration in seconds.
+    """
+    length = abs(length)
+
+    if length * acc < vel * vel:
+        return 2.0 * math.sqrt(length / acc)
+
+    return length / vel + vel / acc
+
+
+def trapezoid_samples(start, end, vel: float, acc: float, dt: float) -> np.ndarray:
+    """
+    Samples a straight-line move with a trapezoidal velocity profile at a fixed period.
+
+    Arguments:
+        start (array-like): Start pose [x, y, z, rx, ry, rz].
+        end (array-like): End pose.
+        vel (float): Maximum speed in m/s (rad/s for pure rotations).
+        acc (float): Acceleration in m/s^2.
+        dt (float): Sample period in seconds (the servo period).
+
+    Returns:
+        np.ndarray: (M, 6) poses, one per period; the last one equals end.
+    """
+    start = np.asarray(start, dtype=float)
+    end = np.asarray(end, dtype=float)
+    delta = end - start
+
+    length = float(np.linalg.norm(delta[:3])) or float(np.linalg.norm(delta[3:]))
+
+    if length < 1e-12:
+        return end[None, :]
+
+    peak = min(vel, math.sqrt(acc * length))
+    t_acc = peak / acc
+    t_cruise = (length - peak * t_acc) / peak
+    duration = 2 * t_acc + t_cruise
+
+    t = np.minimum(np.arange(1, math.ceil(duration / dt) + 1) * dt, duration)
+    t_dec = np.clip(t - t_acc - t_cruise, 0.0, None)
+
+    # Distance covered: acceleration, cruise and deceleration phases
+    s = np.where(t < t_acc, 0.5 * acc * t * t, 0.5 * peak * t_acc + peak * (t - t_acc))
+    s -= 0.5 * acc * t_dec * t_dec
+    s[-1] = length
+
+    return start + (s / length)[:, None] * delta
+
+
+def stream_servo(control, poses: np.ndarray, dt: float, lookahead_time: float = 0.05, gain: float = 300,
+                 hold_cycles: int = None, stop: bool = True):
+    """
+    Streams a sampled trajectory with servoL, one pose per control period, and holds the last pose
+    until the servo lag (lookahead) has been caught up.
+
+    Arguments:
+        control (RTDEControlInterface): Control interface.
+        poses (np.ndarray): (M, 6) poses, one per period.
+        dt (float): Control period in seconds.
+        lookahead_time (float): servoL lookahead time in seconds (0.03 - 0.2).
+        gain (float): servoL proportional gain (100 - 2000).
+        hold_cycles (int): Periods the final pose is repeated, lookahead_time / dt when None.
+        stop (bool): End servoing afterwards. False keeps the robot servoing on the last pose, so
+                     a multi-segment path runs as one servo session. Default is True.
+    """
+    if hold_cycles is None:
+        hold_cycles = int(math.ceil(lookahead_time / dt))
+
+    targets = poses.tolist()
+    targets += [targets[-1]] * hold_cycles
+
+    for target in targets:
+        t_start = control.initPeriod()
+        control.servoL(target, 0.0, 0.0, dt, lookahead_time, gain)
+        control.waitPeriod(t_start)
+
+    if stop:
+        control.servoStop()